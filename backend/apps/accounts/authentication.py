@@ -0,0 +1,140 @@
+"""
+JWT authentication classes.
+
+- CachedUserJWTAuthentication: with settings.JWT_STATELESS_USERS on,
+  request.user is built from the token's user claims and kept in a
+  bounded per-process LRU with TTL, so most requests skip the users
+  table.  forget_user() invalidates it on profile update, password
+  change and deactivation; the invalidation time lives on the user row,
+  and the cache only mirrors it (a missing marker means "read the row").
+- MiddlewareJWTAuthentication (DRF default): reuses the JWT already
+  resolved by FlatContextMiddleware, so each request decodes its token
+  and loads its user once.
+"""
+import copy
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+
+class UserCache:
+    """Thread-safe LRU of user objects whose entries expire after `ttl` seconds."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # user_id → (expires_at, user)
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+        # Shallow copy: a request may mutate its user (e.g. set_password)
+        return copy.copy(entry[1])
+
+    def put(self, user_id, user) -> None:
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, user)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, user_id) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+
+user_cache = UserCache(settings.JWT_USER_CACHE_SIZE, settings.JWT_USER_CACHE_TTL)
+
+
+def _stale_key(user_id) -> str:
+    return f"user-claims-stale:{user_id}"
+
+
+def forget_user(user) -> None:
+    """
+    Invalidate a user's cached object and token claims.  The invalidation
+    time is stored on the user row (User.claims_stale_at) and mirrored in
+    the cache: this process drops its LRU entry at once; other processes
+    within JWT_USER_CACHE_TTL, after which tokens whose claims predate the
+    change fall back to the database until the user logs in again.
+    """
+    stale_at = int(time.time())
+    get_user_model().objects.filter(pk=user.pk).update(claims_stale_at=stale_at)
+    user_cache.discard(str(user.pk))
+    cache.set(_stale_key(user.pk), stale_at, timeout=None)
+
+
+class CachedUserJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication whose user lookup is claim-based in stateless mode."""
+
+    def get_user(self, validated_token):
+        if not settings.JWT_STATELESS_USERS:
+            return super().get_user(validated_token)
+
+        user_id = str(validated_token.get(api_settings.USER_ID_CLAIM))
+        user = user_cache.get(user_id)
+        if user is None:
+            user = self._user_from_claims(validated_token)
+            if user is None:
+                user = super().get_user(validated_token)
+                # Re-seed the marker from the row.  Seeded copies expire with
+                # the LRU, so a process whose cache never saw forget_user()
+                # (evicted key, per-process cache) re-reads the row in time.
+                cache.add(_stale_key(user.pk), user.claims_stale_at or 0, settings.JWT_USER_CACHE_TTL)
+            user_cache.put(user_id, user)
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
+
+    @staticmethod
+    def _user_from_claims(validated_token):
+        """
+        A User carrying only id / full_name / is_active (other fields are
+        deferred and load on first access), or None when the token has no
+        claims, they predate the user's last change, or the cache does not
+        know when that was (the caller then reads the row).
+        """
+        claims_at = validated_token.get("claims_at")
+        if claims_at is None:
+            return None
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        stale_at = cache.get(_stale_key(user_id))
+        if stale_at is None or stale_at >= claims_at:
+            return None
+        return get_user_model().from_db(
+            DEFAULT_DB_ALIAS,
+            ["id", "full_name", "is_active"],
+            [uuid.UUID(user_id), validated_token["full_name"], validated_token["is_active"]],
+        )
+
+
+class MiddlewareJWTAuthentication(CachedUserJWTAuthentication):
+    """
+    Returns the (user, token) pair FlatContextMiddleware stored on the
+    underlying Django request.  Falls back to a normal JWT pass when the
+    middleware did not authenticate (no header, or an invalid token – so
+    DRF still answers 401 with SimpleJWT's error body).
+    """
+
+    def authenticate(self, request):
+        resolved = getattr(request._request, "jwt_auth", None)
+        if resolved is not None:
+            return resolved
+        return super().authenticate(request)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='claims_stale_at',
+            field=models.PositiveBigIntegerField(blank=True, editable=False, help_text='Unix time of the last forget_user(); token claims minted before it are not trusted', null=True),
+        ),
+    ]
@@ -38,6 +38,12 @@ class User(AbstractBaseUser, PermissionsMixin, TimeStampedModel):
 
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
+    claims_stale_at = models.PositiveBigIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Unix time of the last forget_user(); token claims minted before it are not trusted",
+    )
 
     objects = UserManager()
 
@@ -2,8 +2,13 @@
 Account serializers – registration, login, profile.
 """
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from apps.flats.models import Flat, FlatMembership
+from .tokens import FLAT_CLAIMS, UserClaimsRefreshToken, scope_token_to_flat
 
 User = get_user_model()
 
@@ -57,3 +62,55 @@ class UserSerializer(serializers.ModelSerializer):
 class ChangePasswordSerializer(serializers.Serializer):
     old_password = serializers.CharField(write_only=True)
     new_password = serializers.CharField(min_length=8, write_only=True)
+
+
+class UserClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Login – issues tokens carrying the minimal user claims; with
+    JWT_FLAT_CLAIMS on they are also scoped to `flat` (default: the
+    user's first active membership).
+    """
+
+    token_class = UserClaimsRefreshToken
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["flat"] = serializers.UUIDField(required=False)
+
+    def validate(self, attrs):
+        self._flat_id = attrs.pop("flat", None)
+        return super().validate(attrs)
+
+    def get_token(self, user):
+        token = super().get_token(user)
+        if settings.JWT_FLAT_CLAIMS:
+            scope_token_to_flat(token, user.pk, self._flat_id)
+        return token
+
+
+class FlatClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Token refresh that re-reads the flat claims of flat-scoped tokens, so
+    a refreshed access token is current again after permission changes.
+    """
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        access = AccessToken(data["access"], verify=False)
+        if "flat" not in access:
+            return data
+        scope_token_to_flat(access, access[api_settings.USER_ID_CLAIM], access["flat"])
+        data["access"] = str(access)
+        if "refresh" in data:  # rotated – keep it in step with the access token
+            refresh = self.token_class(data["refresh"], verify=False)
+            for claim in FLAT_CLAIMS:
+                if claim in access:
+                    refresh[claim] = access[claim]
+                elif claim in refresh:
+                    del refresh[claim]
+            data["refresh"] = str(refresh)
+        return data
+
+
+class SwitchFlatSerializer(serializers.Serializer):
+    flat = serializers.UUIDField()
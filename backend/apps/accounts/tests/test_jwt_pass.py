@@ -0,0 +1,120 @@
+"""
+FlatContextMiddleware and DRF share one JWT pass: every request decodes
+its token once and loads its user at most once.
+
+The timing comparison with a separate DRF pass is opt-in:
+    RUN_BENCHMARKS=1 python manage.py test apps.accounts.tests.test_jwt_pass
+"""
+import os
+import re
+import time
+from contextlib import contextmanager
+from unittest import mock, skipUnless
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from apps.accounts.authentication import CachedUserJWTAuthentication, MiddlewareJWTAuthentication
+from apps.core.tests.utils import api_client, make_flat
+from apps.meals.tests.test_month_reads import populate
+
+URLS = (
+    "/api/v1/meals/grid/?year=2026&month=2",
+    "/api/v1/meals/summary/?year=2026&month=2",
+    "/api/v1/permissions/mine/",
+)
+USER_QUERY = re.compile(r'^SELECT .* FROM "users" WHERE "users"\."id" = ')
+
+
+@contextmanager
+def count_decodes():
+    calls = []
+    real = JWTAuthentication.get_validated_token
+
+    def get_validated_token(self, raw_token):
+        calls.append(raw_token)
+        return real(self, raw_token)
+
+    with mock.patch.object(JWTAuthentication, "get_validated_token", get_validated_token):
+        yield calls
+
+
+def separate_drf_pass():
+    """The pre-sharing behaviour: DRF authenticates the request again."""
+    return mock.patch.object(
+        MiddlewareJWTAuthentication, "authenticate", CachedUserJWTAuthentication.authenticate
+    )
+
+
+class SharedJWTPassTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.flat, memberships = make_flat(members=6)
+        populate(cls.flat, memberships, days=5)
+        cls.client_user = memberships[1].user
+
+    def setUp(self):
+        cache.clear()
+
+    def test_one_decode_and_one_user_query_per_request(self):
+        client = api_client(self.client_user, self.flat)
+        for url in URLS:
+            client.get(url)  # warm the cached flat context
+            with self.subTest(url=url), count_decodes() as decodes, \
+                    CaptureQueriesContext(connection) as queries:
+                response = client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(decodes), 1)
+            self.assertEqual(
+                len([q for q in queries.captured_queries if USER_QUERY.match(q["sql"])]), 1
+            )
+
+    def test_invalid_token_still_gets_simplejwt_401(self):
+        client = api_client(self.client_user, self.flat)
+        client.credentials(HTTP_AUTHORIZATION="Bearer not-a-token", HTTP_X_FLAT_ID=str(self.flat.id))
+        response = client.get(URLS[0])
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.data["errors"]["code"], "token_not_valid")
+
+
+@skipUnless(os.environ.get("RUN_BENCHMARKS"), "set RUN_BENCHMARKS=1 to run")
+class SharedJWTPassBenchmark(TestCase):
+    """Queries, JWT decodes and mean time per request, shared vs. separate DRF pass."""
+
+    repeat = 200
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.flat, memberships = make_flat(members=6)
+        populate(cls.flat, memberships, days=28)
+        cls.client_user = memberships[1].user
+
+    def measure(self, client, url):
+        client.get(url)
+        with count_decodes() as decodes, CaptureQueriesContext(connection) as queries:
+            client.get(url)
+        counts = len(queries), len(decodes)  # before the query log wraps
+        began = time.perf_counter()
+        for _ in range(self.repeat):
+            client.get(url)
+        elapsed = (time.perf_counter() - began) / self.repeat * 1000
+        return (*counts, elapsed)
+
+    def test_shared_pass(self):
+        client = api_client(self.client_user, self.flat)
+        print()
+        for url in URLS:
+            cache.clear()
+            with separate_drf_pass():
+                before = self.measure(client, url)
+            cache.clear()
+            after = self.measure(client, url)
+            print(
+                f"{url:45} queries {before[0]} -> {after[0]}, decodes {before[1]} -> {after[1]}, "
+                f"{before[2]:.2f} ms -> {after[2]:.2f} ms"
+            )
+            self.assertLess(after[1], before[1])
+            self.assertLessEqual(after[0], before[0])
@@ -0,0 +1,77 @@
+"""
+JWT_STATELESS_USERS: request.user comes from token claims until
+forget_user() makes them stale.  The invalidation point is stored on the
+user row, so losing the cache marker (eviction, another process's
+cache) falls back to the database instead of trusting the claims.
+"""
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.accounts.authentication import forget_user, user_cache
+from apps.accounts.tokens import UserClaimsRefreshToken
+from apps.core.tests.utils import make_flat
+
+MINE = "/api/v1/permissions/mine/"
+
+
+@override_settings(JWT_STATELESS_USERS=True)
+class StatelessUserTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.flat, (_, cls.member) = make_flat(members=2)
+        cls.user = cls.member.user
+
+    def setUp(self):
+        cache.clear()
+        user_cache.discard(str(self.user.pk))
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {UserClaimsRefreshToken.for_user(self.user).access_token}",
+            HTTP_X_FLAT_ID=str(self.flat.id),
+        )
+
+    def other_process(self):
+        """A process that never saw this one's LRU entry or cache marker."""
+        user_cache.discard(str(self.user.pk))
+        cache.delete(f"user-claims-stale:{self.user.pk}")
+
+    def deactivate(self):
+        self.user.is_active = False
+        self.user.save(update_fields=["is_active"])
+        forget_user(self.user)
+
+    def test_marker_miss_reads_the_row_once_then_trusts_the_claims(self):
+        with self.assertNumQueries(2):  # user row (seeds the marker) + flat context
+            self.assertEqual(self.client.get(MINE).status_code, 200)
+        self.other_process()
+        cache.set(f"user-claims-stale:{self.user.pk}", 0)
+        with self.assertNumQueries(0):  # user from the claims, flat context cached
+            self.assertEqual(self.client.get(MINE).status_code, 200)
+
+    def test_deactivation_returns_401(self):
+        self.assertEqual(self.client.get(MINE).status_code, 200)
+        self.deactivate()
+        response = self.client.get(MINE)
+        self.assertEqual(response.status_code, 401)
+
+    def test_deactivation_survives_a_lost_marker(self):
+        self.assertEqual(self.client.get(MINE).status_code, 200)
+        self.deactivate()
+        self.other_process()
+        self.assertEqual(self.client.get(MINE).status_code, 401)
+
+    def test_stale_claims_fall_back_to_the_row(self):
+        self.user.full_name = "Renamed"
+        self.user.save(update_fields=["full_name"])
+        forget_user(self.user)
+        self.other_process()
+        self.user.refresh_from_db()
+        self.assertIsNotNone(self.user.claims_stale_at)
+
+        with self.assertNumQueries(2):  # user row + flat context
+            self.assertEqual(self.client.get(MINE).status_code, 200)
+        self.assertEqual(cache.get(f"user-claims-stale:{self.user.pk}"), self.user.claims_stale_at)
+        user_cache.discard(str(self.user.pk))
+        with self.assertNumQueries(1):  # the re-seeded marker still rejects the old claims
+            self.assertEqual(self.client.get(MINE).status_code, 200)
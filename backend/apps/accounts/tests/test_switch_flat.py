@@ -0,0 +1,37 @@
+"""POST /auth/switch-flat/ issues flat-scoped tokens only with JWT_FLAT_CLAIMS."""
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.core.tests.utils import api_client, make_flat
+
+SWITCH = "/api/v1/auth/switch-flat/"
+
+
+class SwitchFlatTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.flat, (cls.owner, _) = make_flat(members=2)
+        cls.other, (cls.stranger, _) = make_flat(members=2)
+
+    def setUp(self):
+        cache.clear()
+
+    @override_settings(JWT_FLAT_CLAIMS=False)
+    def test_disabled_without_flat_claims(self):
+        response = api_client(self.owner.user, self.flat).post(SWITCH, {"flat": str(self.flat.id)}, format="json")
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn("tokens", response.data)
+
+    @override_settings(JWT_FLAT_CLAIMS=True)
+    def test_scopes_tokens_to_the_flat(self):
+        response = api_client(self.owner.user, self.flat).post(SWITCH, {"flat": str(self.flat.id)}, format="json")
+        self.assertEqual(response.status_code, 200)
+        access = AccessToken(response.data["tokens"]["access"])
+        self.assertEqual(access["flat"], str(self.flat.id))
+        self.assertEqual(access["role"], "owner")
+
+    @override_settings(JWT_FLAT_CLAIMS=True)
+    def test_rejects_flats_the_user_is_not_in(self):
+        response = api_client(self.owner.user, self.flat).post(SWITCH, {"flat": str(self.other.id)}, format="json")
+        self.assertEqual(response.status_code, 404)
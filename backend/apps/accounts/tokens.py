@@ -0,0 +1,57 @@
+"""
+JWT token classes – tokens carry the minimal user claims used by the
+stateless user mode (see apps/accounts/authentication.py) and, when
+scoped to a flat, the membership claims FlatContextMiddleware resolves
+the flat context from (settings.JWT_FLAT_CLAIMS).
+"""
+import time
+from rest_framework_simplejwt.tokens import RefreshToken
+
+FLAT_CLAIMS = ("flat", "membership", "role", "perm_mask", "ctx_ver")
+
+
+class UserClaimsRefreshToken(RefreshToken):
+    """
+    Refresh token with `full_name`, `is_active` and `claims_at` (when the
+    claims were read from the user row).  Access tokens created from it,
+    including after rotation, copy these claims unchanged.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token["full_name"] = user.full_name
+        token["is_active"] = user.is_active
+        token["claims_at"] = int(time.time())
+        return token
+
+
+def scope_token_to_flat(token, user_id, flat_id=None):
+    """
+    Embed the user's active membership in `flat_id` (or their first one)
+    into `token`: flat / membership ids, role, permission bitmask and
+    `ctx_ver`, the user's flat-context version at minting.  Any change to
+    the membership or its permissions bumps that version, which makes the
+    claims stale.  Removes the claims when there is no such membership;
+    returns the membership (or None).
+    """
+    from apps.flats.middleware import membership_version
+    from apps.flats.models import FlatMembership
+
+    # Version first: a change committed after this read leaves the claims stale.
+    version = membership_version(user_id)
+    qs = FlatMembership.objects.filter(user_id=user_id, is_active=True)
+    membership = (qs.filter(flat_id=flat_id) if flat_id else qs).first()
+    if membership is None:
+        for claim in FLAT_CLAIMS:
+            if claim in token:
+                del token[claim]
+        return None
+
+    token["flat"] = str(membership.flat_id)
+    token["membership"] = str(membership.pk)
+    token["role"] = membership.role
+    token["perm_mask"] = membership.permission_mask
+    token["ctx_ver"] = version
+    return membership
+
@@ -1,14 +1,18 @@
 """
-Account views – register, profile, change-password.
+Account views – register, profile, change-password, flat switching.
 JWT token obtain/refresh is provided by SimpleJWT directly.
 """
 from rest_framework import generics, status, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from apps.meals.calculation_engine import bump_flat_versions
 
-from .serializers import RegisterSerializer, UserSerializer, ChangePasswordSerializer
+from .authentication import forget_user
+from .serializers import RegisterSerializer, UserSerializer, ChangePasswordSerializer, SwitchFlatSerializer
+from .tokens import UserClaimsRefreshToken, scope_token_to_flat
 
 User = get_user_model()
 
@@ -39,7 +43,17 @@ class ProfileView(generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
 
     def get_object(self):
-        return self.request.user
+        user = self.request.user
+        if user.get_deferred_fields():  # claims-only user (JWT_STATELESS_USERS)
+            user = User.objects.get(pk=user.pk)
+        return user
+
+    def perform_update(self, serializer):
+        user = serializer.save()
+        forget_user(user)
+        # Profile fields are rendered in cached month balances / grid members
+        for flat_id in user.memberships.values_list("flat_id", flat=True):
+            bump_flat_versions(flat_id)
 
 
 class ChangePasswordView(APIView):
@@ -49,6 +63,8 @@ class ChangePasswordView(APIView):
         serializer = ChangePasswordSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = request.user
+        if user.get_deferred_fields():  # claims-only user (JWT_STATELESS_USERS)
+            user = User.objects.get(pk=user.pk)
         if not user.check_password(serializer.validated_data["old_password"]):
             return Response(
                 {"success": False, "errors": {"old_password": "Incorrect password"}},
@@ -56,4 +72,39 @@ class ChangePasswordView(APIView):
             )
         user.set_password(serializer.validated_data["new_password"])
         user.save()
+        forget_user(user)
         return Response({"success": True, "message": "Password changed."})
+
+
+class SwitchFlatView(APIView):
+    """
+    Mint a token pair scoped to another of the user's flats.
+    Only exists with JWT_FLAT_CLAIMS; otherwise clients switch with X-Flat-ID.
+    """
+
+    def post(self, request):
+        if not settings.JWT_FLAT_CLAIMS:
+            return Response(
+                {"success": False, "errors": {"detail": "Not found."}},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        serializer = SwitchFlatSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        refresh = UserClaimsRefreshToken.for_user(request.user)
+        membership = scope_token_to_flat(refresh, request.user.pk, serializer.validated_data["flat"])
+        if membership is None:
+            return Response(
+                {"success": False, "errors": {"flat": "You are not an active member of this flat."}},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return Response(
+            {
+                "success": True,
+                "flat": str(membership.flat_id),
+                "role": membership.role,
+                "tokens": {
+                    "access": str(refresh.access_token),
+                    "refresh": str(refresh),
+                },
+            }
+        )
@@ -0,0 +1,50 @@
+"""
+Management command to build the operator-level analytics report across
+all flats: a columnar .npz (one row per active flat-month) and a CSV
+with per-month cross-flat statistics (see apps/analytics/platform_report.py).
+
+Run: python manage.py platform_report [--from 2025-10] [--to 2026-09] [--output-dir reports/] [--chunk-size 500]
+"""
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from apps.analytics.platform_report import build_platform_report
+
+MONTH_RE = re.compile(r"^(\d{4})-(0[1-9]|1[0-2])$")
+
+
+def _parse_month(value, name):
+    match = MONTH_RE.match(value)
+    if not match:
+        raise CommandError(f"--{name} must look like YYYY-MM")
+    return int(match[1]), int(match[2])
+
+
+class Command(BaseCommand):
+    help = "Write cross-flat monthly analytics to a .npz archive and a CSV summary."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--from", dest="start", help="First month, YYYY-MM (default: 11 months before --to).")
+        parser.add_argument("--to", dest="end", help="Last month, YYYY-MM (default: current month).")
+        parser.add_argument("--output-dir", help="Directory for the files (default PLATFORM_REPORT_DIR).")
+        parser.add_argument("--chunk-size", type=int, help="Flats aggregated per round of queries.")
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        end = _parse_month(options["end"], "to") if options["end"] else (today.year, today.month)
+        if options["start"]:
+            start = _parse_month(options["start"], "from")
+        else:
+            idx = end[0] * 12 + end[1] - 1 - 11
+            start = (idx // 12, idx % 12 + 1)
+        if start > end:
+            raise CommandError("--from must not be after --to")
+
+        result = build_platform_report(
+            *start, *end, output_dir=options["output_dir"], chunk_size=options["chunk_size"]
+        )
+        self.stdout.write(f"{result['flats']} active flat(s), {result['rows']} flat-month row(s)")
+        self.stdout.write(f"  {result['npz']}")
+        self.stdout.write(f"  {result['csv']}")
+        self.stdout.write(self.style.SUCCESS("Done."))
@@ -0,0 +1,297 @@
+"""
+Platform report – cross-flat analytics for operators.
+
+Flats are read in keyset chunks of PLATFORM_REPORT_CHUNK_SIZE.  Each
+chunk costs three grouped queries (MonthlySummary, MealEntry, Expense),
+and the result is one row per (flat, month) with any activity.  Rows are
+appended column by column to temporary files and then streamed into a
+`.npz` archive, so memory grows with the chunk size and the number of
+months, not with the number of flats.
+
+Per-month statistics across flats (active flats, meal-rate distribution,
+expense growth) are accumulated as the chunks go by.  Quantiles are
+estimated from fixed-width histograms and written to a CSV summary.
+
+Entry points: build_platform_report() and the `platform_report`
+management command.
+"""
+import csv
+import tempfile
+import zipfile
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Count, F, Q
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+from apps.expenses.models import Expense
+from apps.flats.models import Flat
+from apps.meals.models import MealEntry, MonthlySummary
+
+# Row columns of the .npz archive.  `flat` indexes into the `flat_ids`
+# array; `period` is year * 12 + month - 1.
+ROW_COLUMNS = {
+    "flat": np.int32,
+    "period": np.int32,
+    "total_meals": np.float64,
+    "total_expense": np.float64,
+    "meal_rate": np.float64,
+    "active_members": np.int32,
+    "meal_days": np.int32,
+    "expense_count": np.int32,
+    "payers": np.int32,
+    "expense_growth": np.float64,  # vs. the flat's previous month, NaN if none
+}
+
+CSV_FIELDS = (
+    "month", "active_flats", "total_meals", "total_expense", "active_members",
+    "meal_rate_mean", "meal_rate_std", "meal_rate_min", "meal_rate_p50",
+    "meal_rate_p90", "meal_rate_max", "growing_flats", "expense_growth_mean",
+    "expense_growth_p50",
+)
+
+
+def _period(year, month):
+    return year * 12 + month - 1
+
+
+def _month_label(period):
+    return f"{period // 12:04d}-{period % 12 + 1:02d}"
+
+
+def _csv_value(value):
+    if not np.isfinite(value):
+        return ""
+    value = round(float(value), 2)
+    return int(value) if value.is_integer() else value
+
+
+class _Distribution:
+    """
+    Streaming per-period summary of one metric: count, sum, sum of
+    squares, min, max, and a fixed-width histogram for quantiles.
+    Values outside [low, high) fall into the edge bins.
+    """
+
+    def __init__(self, periods, low, high, width):
+        self.low, self.width = low, width
+        self.bins = int(np.ceil((high - low) / width))
+        self.count = np.zeros(periods, dtype=np.int64)
+        self.total = np.zeros(periods)
+        self.squares = np.zeros(periods)
+        self.min = np.full(periods, np.inf)
+        self.max = np.full(periods, -np.inf)
+        self.hist = np.zeros((periods, self.bins), dtype=np.int64)
+
+    def add(self, slots, values):
+        keep = ~np.isnan(values)
+        slots, values = slots[keep], values[keep]
+        self.count += np.bincount(slots, minlength=len(self.count))
+        self.total += np.bincount(slots, weights=values, minlength=len(self.total))
+        self.squares += np.bincount(slots, weights=values * values, minlength=len(self.squares))
+        np.minimum.at(self.min, slots, values)
+        np.maximum.at(self.max, slots, values)
+        bins = np.clip(((values - self.low) // self.width).astype(np.int64), 0, self.bins - 1)
+        np.add.at(self.hist, (slots, bins), 1)
+
+    def mean(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.total / self.count
+
+    def std(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = self.total / self.count
+            return np.sqrt(np.maximum(self.squares / self.count - mean * mean, 0))
+
+    def quantile(self, q):
+        """Bin midpoint holding the q-quantile, within [min, max] (NaN for empty periods)."""
+        out = np.full(len(self.count), np.nan)
+        cumulative = np.cumsum(self.hist, axis=1)
+        for slot in np.flatnonzero(self.count):
+            b = np.searchsorted(cumulative[slot], q * self.count[slot])
+            out[slot] = np.clip(self.low + (b + 0.5) * self.width, self.min[slot], self.max[slot])
+        return out
+
+
+class _ColumnSpool:
+    """Appends 1-D column chunks to temporary files, then packs them into a .npz."""
+
+    def __init__(self, directory, columns):
+        self.columns = {name: np.dtype(dtype) for name, dtype in columns.items()}
+        self.length = dict.fromkeys(columns, 0)
+        self.files = {
+            name: open(Path(directory) / f"{name}.bin", "w+b") for name in columns
+        }
+
+    def append(self, name, values):
+        values = np.ascontiguousarray(values, dtype=self.columns[name])
+        self.files[name].write(values.tobytes())
+        self.length[name] += len(values)
+
+    def write_npz(self, path, block_size=1 << 20):
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as zf:
+            for name, dtype in self.columns.items():
+                src = self.files[name]
+                src.seek(0)
+                with zf.open(f"{name}.npy", "w", force_zip64=True) as dst:
+                    np.lib.format.write_array_header_1_0(dst, {
+                        "descr": np.lib.format.dtype_to_descr(dtype),
+                        "fortran_order": False,
+                        "shape": (self.length[name],),
+                    })
+                    while block := src.read(block_size):
+                        dst.write(block)
+
+    def close(self):
+        for fh in self.files.values():
+            fh.close()
+
+
+def _chunk_rows(flat_ids, start, end):
+    """Aggregates of one chunk of flats, keyed by (flat_id, period)."""
+    rows = {}
+
+    def row(flat_id, period):
+        if (flat_id, period) not in rows:
+            rows[(flat_id, period)] = dict.fromkeys(ROW_COLUMNS, 0)
+        return rows[(flat_id, period)]
+
+    summaries = (
+        MonthlySummary.objects.filter(flat_id__in=flat_ids, year__range=(start // 12, end // 12))
+        .alias(idx=F("year") * 12 + F("month") - 1)
+        .filter(idx__range=(start, end))
+        .filter(Q(total_meals__gt=0) | Q(total_expense__gt=0))
+        .values_list("flat_id", "year", "month", "total_meals", "total_expense", "meal_rate")
+    )
+    for flat_id, year, month, meals, expense, rate in summaries:
+        r = row(flat_id, _period(year, month))
+        r["total_meals"], r["total_expense"], r["meal_rate"] = meals, expense, rate
+
+    first_day = date(start // 12, start % 12 + 1, 1)
+    after_last = date((end + 1) // 12, (end + 1) % 12 + 1, 1)
+
+    meals = (
+        MealEntry.objects.filter(
+            flat_id__in=flat_ids, date__gte=first_day, date__lt=after_last, meal_count__gt=0
+        )
+        .annotate(y=ExtractYear("date"), m=ExtractMonth("date"))
+        .values("flat_id", "y", "m")
+        .annotate(members=Count("user_id", distinct=True), days=Count("date", distinct=True))
+        .values_list("flat_id", "y", "m", "members", "days")
+    )
+    for flat_id, year, month, members, days in meals:
+        r = row(flat_id, _period(year, month))
+        r["active_members"], r["meal_days"] = members, days
+
+    expenses = (
+        Expense.objects.filter(flat_id__in=flat_ids, date__gte=first_day, date__lt=after_last)
+        .annotate(y=ExtractYear("date"), m=ExtractMonth("date"))
+        .values("flat_id", "y", "m")
+        .annotate(n=Count("id"), payers=Count("paid_by_id", distinct=True))
+        .values_list("flat_id", "y", "m", "n", "payers")
+    )
+    for flat_id, year, month, n, payers in expenses:
+        r = row(flat_id, _period(year, month))
+        r["expense_count"], r["payers"] = n, payers
+
+    return rows
+
+
+def build_platform_report(start_year, start_month, end_year, end_month, output_dir=None, chunk_size=None):
+    """
+    Write platform-<from>-<to>.npz (one row per active flat-month) and
+    platform-<from>-<to>.csv (one row per month) to `output_dir`.
+    Returns {"npz": path, "csv": path, "flats": n, "rows": n}.
+    """
+    output_dir = Path(output_dir or settings.PLATFORM_REPORT_DIR)
+    chunk_size = chunk_size or settings.PLATFORM_REPORT_CHUNK_SIZE
+    start, end = _period(start_year, start_month), _period(end_year, end_month)
+    periods = end - start + 1
+
+    totals = {key: np.zeros(periods) for key in ("flats", "meals", "expense", "members", "growing")}
+    rates = _Distribution(periods, low=0, high=1000, width=1)
+    growth = _Distribution(periods, low=-100, high=1000, width=1)  # percent
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stem = f"platform-{_month_label(start)}-{_month_label(end)}"
+    flats = rows = 0
+
+    with tempfile.TemporaryDirectory(dir=output_dir) as spool_dir:
+        spool = _ColumnSpool(spool_dir, {**ROW_COLUMNS, "flat_ids": "S32"})
+        try:
+            ids = Flat.objects.order_by("id").values_list("id", flat=True)
+            last = None
+            while True:
+                chunk = list((ids.filter(id__gt=last) if last else ids)[:chunk_size])
+                if not chunk:
+                    break
+                last = chunk[-1]
+                chunk_rows = _chunk_rows(chunk, start, end)
+                if not chunk_rows:
+                    continue
+
+                # Chunk-local columns, sorted by flat then month
+                active = sorted({flat_id for flat_id, _ in chunk_rows})
+                local = {flat_id: flats + i for i, flat_id in enumerate(active)}
+                keys = sorted(chunk_rows, key=lambda k: (local[k[0]], k[1]))
+                cols = {
+                    name: np.array([chunk_rows[k][name] for k in keys], dtype=dtype)
+                    for name, dtype in ROW_COLUMNS.items()
+                    if name not in ("flat", "period", "expense_growth")
+                }
+                cols["flat"] = np.array([local[k[0]] for k in keys], dtype=np.int32)
+                cols["period"] = np.array([k[1] for k in keys], dtype=np.int32)
+
+                # Month-over-month expense growth within each flat
+                growth_pct = np.full(len(keys), np.nan)
+                prev = np.flatnonzero(
+                    (cols["flat"][1:] == cols["flat"][:-1])
+                    & (cols["period"][1:] == cols["period"][:-1] + 1)
+                    & (cols["total_expense"][:-1] > 0)
+                )
+                growth_pct[prev + 1] = (
+                    cols["total_expense"][prev + 1] / cols["total_expense"][prev] - 1
+                ) * 100
+                cols["expense_growth"] = growth_pct
+
+                slots = cols["period"] - start
+                totals["flats"] += np.bincount(slots, minlength=periods)
+                totals["meals"] += np.bincount(slots, weights=cols["total_meals"], minlength=periods)
+                totals["expense"] += np.bincount(slots, weights=cols["total_expense"], minlength=periods)
+                totals["members"] += np.bincount(slots, weights=cols["active_members"], minlength=periods)
+                totals["growing"] += np.bincount(
+                    slots, weights=np.nan_to_num(growth_pct) > 0, minlength=periods
+                )
+                rates.add(slots, np.where(cols["total_meals"] > 0, cols["meal_rate"], np.nan))
+                growth.add(slots, growth_pct)
+
+                for name in ROW_COLUMNS:
+                    spool.append(name, cols[name])
+                spool.append("flat_ids", [flat_id.hex for flat_id in active])
+                flats += len(active)
+                rows += len(keys)
+
+            npz_path = output_dir / f"{stem}.npz"
+            spool.write_npz(npz_path)
+        finally:
+            spool.close()
+
+    csv_path = output_dir / f"{stem}.csv"
+    columns = (
+        totals["flats"], totals["meals"], totals["expense"], totals["members"],
+        rates.mean(), rates.std(), rates.min, rates.quantile(0.5), rates.quantile(0.9), rates.max,
+        totals["growing"], growth.mean(), growth.quantile(0.5),
+    )
+    with open(csv_path, "w", newline="") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(CSV_FIELDS)
+        for slot in range(periods):
+            values = [column[slot] for column in columns]
+            writer.writerow(
+                [_month_label(start + slot)]
+                + [_csv_value(v) for v in values]
+            )
+
+    return {"npz": npz_path, "csv": csv_path, "flats": flats, "rows": rows}
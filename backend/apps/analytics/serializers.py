@@ -0,0 +1,37 @@
+"""
+Analytics query-param serializers.
+"""
+from django.utils import timezone
+from rest_framework import serializers
+
+
+class YearSerializer(serializers.Serializer):
+    """?year= – defaults to the current year."""
+
+    year = serializers.IntegerField(min_value=2020, max_value=2099, required=False)
+
+    def validate(self, attrs):
+        attrs.setdefault("year", timezone.localdate().year)
+        return attrs
+
+
+class TrendsSerializer(serializers.Serializer):
+    """
+    ?months=24&window=3&end=2026-02 – `months` months ending with `end`
+    (default: the current month), rolling averages over `window` months.
+    """
+
+    months = serializers.IntegerField(min_value=1, max_value=120, default=12)
+    window = serializers.IntegerField(min_value=1, max_value=12, default=3)
+    end = serializers.RegexField(r"^\d{4}-(0[1-9]|1[0-2])$", required=False)
+
+    def validate(self, attrs):
+        if "end" in attrs:
+            year, month = (int(part) for part in attrs.pop("end").split("-"))
+        else:
+            today = timezone.localdate()
+            year, month = today.year, today.month
+        if not 2020 <= year <= 2099:
+            raise serializers.ValidationError({"end": "Year must be between 2020 and 2099."})
+        attrs["end_year"], attrs["end_month"] = year, month
+        return attrs
@@ -1,21 +1,36 @@
 """
 Analytics service – aggregated data for charts.
+
+Month charts read the FlatDailyStats rollup (one row per member and
+day, maintained by the calculation engine), so their cost grows with
+days × members rather than with raw meal / expense rows.  Members and
+days whose total is zero are left out.
 """
+from datetime import date
 from decimal import Decimal
-from collections import defaultdict
-from django.db.models import Sum, Value, DecimalField
-from django.db.models.functions import Coalesce, TruncDate
-from apps.meals.models import MealEntry, MonthlySummary
-from apps.expenses.models import Expense
-from apps.flats.models import Flat, FlatMembership
+from collections import defaultdict, deque
+from django.db.models import Count, F, OuterRef, Subquery, Sum, Value, DecimalField
+from django.db.models.functions import Coalesce, ExtractMonth, TruncDate
+from apps.meals.calculation_engine import compute_meal_rate
+from apps.meals.models import FlatDailyStats, MemberMonthBalance, MonthlySummary
+from apps.flats.models import Flat
+
+
+def _month_stats(flat: Flat, year: int, month: int):
+    return FlatDailyStats.objects.for_month(flat, year, month)
+
+
+def _total(field):
+    return Coalesce(Sum(field), Value(Decimal("0")), output_field=DecimalField())
 
 
 def meal_count_per_user(flat: Flat, year: int, month: int):
     """Bar chart data: { user_name: total_meals }"""
     qs = (
-        MealEntry.objects.filter(flat=flat, date__year=year, date__month=month)
+        _month_stats(flat, year, month)
         .values("user__full_name")
-        .annotate(total=Coalesce(Sum("meal_count"), Value(Decimal("0")), output_field=DecimalField()))
+        .annotate(total=_total("meals"))
+        .exclude(total=0)
         .order_by("user__full_name")
     )
     return [{"name": r["user__full_name"], "meals": float(r["total"])} for r in qs]
@@ -24,20 +39,22 @@ def meal_count_per_user(flat: Flat, year: int, month: int):
 def expense_share_per_user(flat: Flat, year: int, month: int):
     """Pie chart data: how much each user paid."""
     qs = (
-        Expense.objects.filter(flat=flat, date__year=year, date__month=month)
-        .values("paid_by__full_name")
-        .annotate(total=Coalesce(Sum("amount"), Value(Decimal("0")), output_field=DecimalField()))
-        .order_by("paid_by__full_name")
+        _month_stats(flat, year, month)
+        .values("user__full_name")
+        .annotate(total=_total("paid"))
+        .exclude(total=0)
+        .order_by("user__full_name")
     )
-    return [{"name": r["paid_by__full_name"], "amount": float(r["total"])} for r in qs]
+    return [{"name": r["user__full_name"], "amount": float(r["total"])} for r in qs]
 
 
 def daily_meal_trend(flat: Flat, year: int, month: int):
     """Line chart data: total meals per day."""
     qs = (
-        MealEntry.objects.filter(flat=flat, date__year=year, date__month=month)
+        _month_stats(flat, year, month)
         .values("date")
-        .annotate(total=Coalesce(Sum("meal_count"), Value(Decimal("0")), output_field=DecimalField()))
+        .annotate(total=_total("meals"))
+        .exclude(total=0)
         .order_by("date")
     )
     return [{"date": str(r["date"]), "meals": float(r["total"])} for r in qs]
@@ -46,15 +63,131 @@ def daily_meal_trend(flat: Flat, year: int, month: int):
 def monthly_comparison(flat: Flat, year: int):
     """
     Compare month-by-month for a given year.
-    Used for the monthly comparison chart.
+    Used for the monthly comparison chart.  Read-only: stored summaries
+    are used as they are, and months without one are built in memory
+    from the FlatDailyStats rollup (one grouped query, skipped when all
+    twelve are stored).  Drift is repaired by `repair_year`, not here.
     """
-    summaries = MonthlySummary.objects.filter(flat=flat, year=year).order_by("month")
+    months = {
+        s["month"]: s
+        for s in MonthlySummary.objects.filter(flat=flat, year=year).values(
+            "month", "total_meals", "total_expense", "meal_rate"
+        )
+    }
+    if len(months) < 12:
+        missing = (
+            FlatDailyStats.objects.filter(
+                flat=flat, date__gte=date(year, 1, 1), date__lt=date(year + 1, 1, 1)
+            )
+            .annotate(month=ExtractMonth("date"))
+            .exclude(month__in=list(months))
+            .values("month")
+            .annotate(total_meals=_total("meals"), total_expense=_total("paid"))
+        )
+        for r in missing:
+            if r["total_meals"] or r["total_expense"]:
+                r["meal_rate"] = compute_meal_rate(r["total_expense"], r["total_meals"])
+                months[r["month"]] = r
+
     return [
         {
-            "month": s.month,
-            "total_meals": float(s.total_meals),
-            "total_expense": float(s.total_expense),
-            "meal_rate": float(s.meal_rate),
+            "month": month,
+            "total_meals": float(months[month]["total_meals"]),
+            "total_expense": float(months[month]["total_expense"]),
+            "meal_rate": float(months[month]["meal_rate"]),
         }
-        for s in summaries
+        for month in sorted(months)
     ]
+
+
+def dashboard(flat: Flat, year: int, month: int):
+    """
+    All four chart series of the analytics page in one pass: a single
+    scan of the month's FlatDailyStats (members × days) yields the meal,
+    expense and daily series; the yearly comparison reads the year's
+    summaries (see monthly_comparison).
+    Same shapes as the single-chart functions above.
+    """
+    rows = (
+        _month_stats(flat, year, month)
+        .values("user__full_name", "date")
+        .annotate(meals=_total("meals"), paid=_total("paid"))
+        .order_by("user__full_name", "date")
+    )
+    meals_by_user = {}  # insertion order = the database's name ordering
+    paid_by_user = {}
+    meals_by_day = defaultdict(Decimal)
+    for r in rows:
+        name = r["user__full_name"]
+        meals_by_user[name] = meals_by_user.get(name, Decimal("0")) + r["meals"]
+        paid_by_user[name] = paid_by_user.get(name, Decimal("0")) + r["paid"]
+        meals_by_day[r["date"]] += r["meals"]
+
+    return {
+        "meal_per_user": [
+            {"name": name, "meals": float(total)} for name, total in meals_by_user.items() if total
+        ],
+        "expense_share": [
+            {"name": name, "amount": float(total)} for name, total in paid_by_user.items() if total
+        ],
+        "daily_meals": [
+            {"date": str(day), "meals": float(meals_by_day[day])}
+            for day in sorted(meals_by_day) if meals_by_day[day]
+        ],
+        "monthly_comparison": monthly_comparison(flat, year),
+    }
+
+
+def monthly_trends(flat: Flat, end_year: int, end_month: int, months: int = 12, window: int = 3):
+    """
+    Trend chart data for `months` consecutive months ending at
+    (end_year, end_month), from one query over MonthlySummary (member
+    counts come from a correlated subquery on MemberMonthBalance).
+    Months without a summary are reported as zero.  Rolling averages of
+    meal rate, expense and meals per member cover the months with data
+    among the trailing `window` calendar months (None if there are none).
+    """
+    last = end_year * 12 + end_month - 1  # month index: year * 12 + (month - 1)
+    first = last - months + 1
+    members = (
+        MemberMonthBalance.objects.filter(
+            flat=OuterRef("flat"), year=OuterRef("year"), month=OuterRef("month"), meals__gt=0
+        )
+        .values("flat")
+        .annotate(n=Count("id"))
+        .values("n")
+    )
+    rows = {
+        (r["year"] * 12 + r["month"] - 1): r
+        for r in MonthlySummary.objects.filter(
+            flat=flat, year__gte=first // 12, year__lte=last // 12
+        )
+        .alias(idx=F("year") * 12 + F("month") - 1)
+        .filter(idx__gte=first, idx__lte=last)
+        .annotate(members=Coalesce(Subquery(members), 0))
+        .values("year", "month", "total_meals", "total_expense", "meal_rate", "members")
+    }
+
+    series = []
+    recent = deque()  # (idx, meal_rate, expense, meals_per_member) of months with data
+    for idx in range(first, last + 1):
+        r = rows.get(idx)
+        point = {
+            "year": idx // 12,
+            "month": idx % 12 + 1,
+            "total_meals": float(r["total_meals"]) if r else 0.0,
+            "total_expense": float(r["total_expense"]) if r else 0.0,
+            "meal_rate": float(r["meal_rate"]) if r else 0.0,
+            "members": r["members"] if r else 0,
+        }
+        point["meals_per_member"] = (
+            round(point["total_meals"] / point["members"], 2) if point["members"] else 0.0
+        )
+        if r:
+            recent.append((idx, point["meal_rate"], point["total_expense"], point["meals_per_member"]))
+        while recent and recent[0][0] <= idx - window:
+            recent.popleft()
+        for i, key in enumerate(("avg_meal_rate", "avg_expense", "avg_meals_per_member"), start=1):
+            point[key] = round(sum(x[i] for x in recent) / len(recent), 2) if recent else None
+        series.append(point)
+    return series
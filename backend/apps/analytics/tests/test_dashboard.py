@@ -0,0 +1,98 @@
+"""
+GET /analytics/dashboard/ replaces four chart requests: it must return
+the same series at a fixed query cost.  The latency comparison with the
+four calls it replaces is opt-in:
+    RUN_BENCHMARKS=1 python manage.py test apps.analytics.tests.test_dashboard
+"""
+import os
+import time
+from unittest import skipUnless
+from datetime import date
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from apps.core.tests.utils import api_client, make_flat
+from apps.expenses.models import Expense
+from apps.meals.calculation_engine import rebuild_daily_stats, recalculate_month
+from apps.meals.models import MealEntry
+
+QUERY = "?year=2026&month=2"
+DASHBOARD = "/api/v1/analytics/dashboard/" + QUERY
+CHARTS = {
+    "meal_per_user": "/api/v1/analytics/meal-per-user/" + QUERY,
+    "expense_share": "/api/v1/analytics/expense-share/" + QUERY,
+    "daily_meals": "/api/v1/analytics/daily-meals/" + QUERY,
+    "monthly_comparison": "/api/v1/analytics/monthly-comparison/?year=2026",
+}
+
+# user (JWT) + flat context + month rollup scan + year summaries
+# + rollup scan of the months without a summary
+DASHBOARD_QUERIES = 5
+
+
+def populate(flat, memberships, days):
+    for month in (1, 2):
+        for membership in memberships:
+            MealEntry.objects.bulk_create(
+                MealEntry(flat=flat, user=membership.user, date=date(2026, month, d), meal_count=Decimal("2"))
+                for d in range(1, days + 1)
+            )
+            Expense.objects.create(
+                flat=flat, paid_by=membership.user, date=date(2026, month, 1), amount=Decimal("150")
+            )
+        recalculate_month(flat, 2026, month)
+        rebuild_daily_stats(flat, 2026, month)
+
+
+class DashboardTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def client_for(self, members, days):
+        flat, memberships = make_flat(members=members)
+        populate(flat, memberships, days)
+        return api_client(memberships[-1].user, flat)
+
+    def test_matches_the_single_chart_endpoints(self):
+        client = self.client_for(members=3, days=5)
+        data = client.get(DASHBOARD).data["data"]
+        for key, url in CHARTS.items():
+            with self.subTest(chart=key):
+                self.assertEqual(data[key], client.get(url).data["data"])
+
+    def test_query_budget_does_not_grow_with_members_or_days(self):
+        for members, days in ((2, 3), (8, 28)):
+            client = self.client_for(members, days)
+            with self.subTest(members=members, days=days), self.assertNumQueries(DASHBOARD_QUERIES):
+                response = client.get(DASHBOARD)
+            self.assertEqual(response.status_code, 200)
+
+
+@skipUnless(os.environ.get("RUN_BENCHMARKS"), "set RUN_BENCHMARKS=1 to run")
+class DashboardBenchmark(TestCase):
+    """Dashboard against the four single-chart calls (best of `repeat`)."""
+
+    repeat = 20
+
+    def setUp(self):
+        cache.clear()
+
+    def timed(self, fetch):
+        timings = []
+        for _ in range(self.repeat):
+            began = time.perf_counter()
+            fetch()
+            timings.append(time.perf_counter() - began)
+        return min(timings) * 1000
+
+    def test_faster_than_the_four_calls(self):
+        flat, memberships = make_flat(members=8)
+        populate(flat, memberships, days=28)
+        client = api_client(memberships[-1].user, flat)
+
+        dashboard = self.timed(lambda: client.get(DASHBOARD))
+        separate = self.timed(lambda: [client.get(url) for url in CHARTS.values()])
+        print(f"\ndashboard {dashboard:.2f} ms, four chart calls {separate:.2f} ms")
+        self.assertLess(dashboard, separate)
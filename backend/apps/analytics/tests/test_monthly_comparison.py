@@ -0,0 +1,71 @@
+"""
+monthly_comparison is a read: stored summaries as they are, missing
+months built from FlatDailyStats, no writes and no row locks.  Repairs
+go through the repair_year command.
+"""
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.analytics.services import monthly_comparison
+from apps.core.tests.utils import make_flat
+from apps.expenses.models import Expense
+from apps.meals.calculation_engine import recalculate_month
+from apps.meals.models import FlatDailyStats, MealEntry, MonthlySummary
+
+
+class MonthlyComparisonTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.flat, memberships = make_flat(members=2)
+        cls.user = memberships[0].user
+        for month in (1, 2):
+            MealEntry.objects.create(flat=cls.flat, user=cls.user, date=date(2026, month, 3), meal_count=Decimal("4"))
+            Expense.objects.create(flat=cls.flat, paid_by=cls.user, date=date(2026, month, 3), amount=Decimal("100"))
+            recalculate_month(cls.flat, 2026, month)
+        # March only exists in the raw rows and the daily rollup
+        MealEntry.objects.create(flat=cls.flat, user=cls.user, date=date(2026, 3, 9), meal_count=Decimal("8"))
+        Expense.objects.create(flat=cls.flat, paid_by=cls.user, date=date(2026, 3, 9), amount=Decimal("100"))
+        FlatDailyStats.objects.create(
+            flat=cls.flat, user=cls.user, date=date(2026, 3, 9), meals=Decimal("8"), paid=Decimal("100")
+        )
+
+    def test_builds_missing_months_without_writing(self):
+        with CaptureQueriesContext(connection) as queries:
+            data = monthly_comparison(self.flat, 2026)
+        self.assertEqual(len(queries), 2)  # summaries + one grouped rollup scan
+        for query in queries:
+            self.assertTrue(query["sql"].startswith("SELECT"), query["sql"])
+            self.assertNotIn("FOR UPDATE", query["sql"])
+        self.assertEqual(
+            data,
+            [
+                {"month": 1, "total_meals": 4.0, "total_expense": 100.0, "meal_rate": 25.0},
+                {"month": 2, "total_meals": 4.0, "total_expense": 100.0, "meal_rate": 25.0},
+                {"month": 3, "total_meals": 8.0, "total_expense": 100.0, "meal_rate": 12.5},
+            ],
+        )
+        self.assertFalse(MonthlySummary.objects.filter(flat=self.flat, year=2026, month=3).exists())
+
+    def test_full_year_of_summaries_is_one_query(self):
+        for month in range(3, 13):
+            recalculate_month(self.flat, 2026, month)
+        with self.assertNumQueries(1):
+            data = monthly_comparison(self.flat, 2026)
+        self.assertEqual(len(data), 12)
+
+    def test_drift_is_left_to_repair_year(self):
+        MonthlySummary.objects.filter(flat=self.flat, year=2026, month=1).update(total_meals=Decimal("99"))
+        self.assertEqual(monthly_comparison(self.flat, 2026)[0]["total_meals"], 99.0)
+
+        out = StringIO()
+        call_command("repair_year", year=2026, stdout=out)
+        self.assertIn("repaired 2 month(s)", out.getvalue())  # drifted January, missing March
+        summary = MonthlySummary.objects.get(flat=self.flat, year=2026, month=1)
+        self.assertEqual(summary.total_meals, Decimal("4"))
+        self.assertTrue(MonthlySummary.objects.filter(flat=self.flat, year=2026, month=3).exists())
@@ -7,5 +7,7 @@ urlpatterns = [
     path("meal-per-user/", views.MealCountPerUserView.as_view(), name="meal_per_user"),
     path("expense-share/", views.ExpenseShareView.as_view(), name="expense_share"),
     path("daily-meals/", views.DailyMealTrendView.as_view(), name="daily_meals"),
+    path("dashboard/", views.DashboardView.as_view(), name="dashboard"),
     path("monthly-comparison/", views.MonthlyComparisonView.as_view(), name="monthly_comparison"),
+    path("trends/", views.TrendsView.as_view(), name="trends"),
 ]
@@ -7,6 +7,7 @@ from rest_framework.views import APIView
 from apps.permissions.guards import flat_permission_required
 from apps.meals.serializers import MonthYearSerializer
 from . import services
+from .serializers import TrendsSerializer, YearSerializer
 
 
 class MealCountPerUserView(APIView):
@@ -61,7 +62,7 @@ class DailyMealTrendView(APIView):
 
 
 class MonthlyComparisonView(APIView):
-    """GET /analytics/monthly-comparison/?year=2026"""
+    """GET /analytics/monthly-comparison/?year=2026 (default: current year)"""
 
     permission_classes = [
         permissions.IsAuthenticated,
@@ -69,6 +70,47 @@ class MonthlyComparisonView(APIView):
     ]
 
     def get(self, request):
-        year = int(request.query_params.get("year", 2026))
-        data = services.monthly_comparison(request.flat, year)
+        p = YearSerializer(data=request.query_params)
+        p.is_valid(raise_exception=True)
+        data = services.monthly_comparison(request.flat, p.validated_data["year"])
+        return Response({"success": True, "data": data})
+
+
+class TrendsView(APIView):
+    """
+    GET /analytics/trends/?months=24&window=3&end=2026-02
+    Month series over any range (default: last 12 months) with rolling
+    averages of meal rate, expense and meals per member.
+    """
+
+    permission_classes = [
+        permissions.IsAuthenticated,
+        flat_permission_required("view_analytics"),
+    ]
+
+    def get(self, request):
+        p = TrendsSerializer(data=request.query_params)
+        p.is_valid(raise_exception=True)
+        data = services.monthly_trends(request.flat, **p.validated_data)
+        return Response({"success": True, "data": data})
+
+
+class DashboardView(APIView):
+    """
+    GET /analytics/dashboard/?year=2026&month=2
+    The four chart series above in one response (one guard pass, one
+    month scan, the year's summaries).
+    """
+
+    permission_classes = [
+        permissions.IsAuthenticated,
+        flat_permission_required("view_analytics"),
+    ]
+
+    def get(self, request):
+        p = MonthYearSerializer(data=request.query_params)
+        p.is_valid(raise_exception=True)
+        data = services.dashboard(
+            request.flat, p.validated_data["year"], p.validated_data["month"]
+        )
         return Response({"success": True, "data": data})
@@ -0,0 +1,126 @@
+"""
+Buffered ActivityLog writer.
+
+ActivityLog.log() hands each record to the buffer once the request's
+transaction commits (records of rolled-back work are dropped, as before).
+A background thread writes them with one bulk_create when
+ACTIVITY_LOG_BATCH_SIZE records are pending or ACTIVITY_LOG_FLUSH_INTERVAL
+seconds have passed, and drains the buffer when the worker exits.
+
+settings.ACTIVITY_LOG_MODE:
+    "sync"     – one INSERT per log call, inside the caller's transaction
+                 (default)
+    "buffered" – the above (opt-in); a worker that crashes or is killed
+                 loses its pending records, up to one interval's worth.
+                 Log reads flush this process's buffer first, so a user
+                 served by the same worker sees their own writes.
+"""
+import atexit
+import logging
+import os
+import threading
+from collections import deque
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityLogBuffer:
+    """
+    In-process queue of unsaved ActivityLog instances.  Bounded: if the
+    database stays unreachable the oldest records are dropped rather than
+    growing without limit.
+    """
+
+    max_pending = 10_000
+
+    def __init__(self, batch_size: int, interval: float):
+        self.batch_size = batch_size
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = deque(maxlen=self.max_pending)
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def add(self, entry) -> None:
+        with self._lock:
+            if len(self._pending) == self.max_pending:
+                logger.warning("Activity log buffer full, dropping oldest record")
+            self._pending.append(entry)
+            full = len(self._pending) >= self.batch_size
+        self._ensure_thread()
+        if full:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        """Write every pending record now; returns how many were written."""
+        with self._flush_lock:
+            with self._lock:
+                batch = list(self._pending)
+                self._pending.clear()
+            if not batch:
+                return 0
+            from .models import ActivityLog
+
+            try:
+                ActivityLog.objects.bulk_create(batch)
+            except Exception:
+                # One bad row (e.g. its flat was deleted meanwhile) must
+                # not take the rest of the batch with it.
+                logger.exception("Activity log batch failed, retrying row by row")
+                written = 0
+                for entry in batch:
+                    try:
+                        entry.save(force_insert=True)
+                        written += 1
+                    except Exception:
+                        logger.exception("Dropping activity log record %s", entry.pk)
+                return written
+            return len(batch)
+
+    def drain(self) -> None:
+        """Flush on worker shutdown (atexit)."""
+        try:
+            self.flush()
+        finally:
+            connections.close_all()
+
+    def _ensure_thread(self) -> None:
+        # Started lazily and again after a fork (pre-forking servers).
+        if self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run, name="activity-log-writer", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            close_old_connections()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Activity log flush failed")
+
+
+activity_buffer = ActivityLogBuffer(
+    settings.ACTIVITY_LOG_BATCH_SIZE, settings.ACTIVITY_LOG_FLUSH_INTERVAL
+)
+atexit.register(activity_buffer.drain)
+
+
+def flush_activity_logs() -> int:
+    """Write buffered records now (e.g. before reading the log back)."""
+    if settings.ACTIVITY_LOG_MODE != "buffered":
+        return 0
+    return activity_buffer.flush()
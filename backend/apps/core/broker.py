@@ -0,0 +1,117 @@
+"""
+Pub/sub brokers for real-time pushes (e.g. the meal grid stream).
+
+`publish()` is synchronous – it is called from request threads after the
+transaction commits.  `subscribe()` is an async iterator consumed by
+streaming (ASGI) views; it yields None once the subscription is live,
+then each message as a string, or None when nothing arrived within
+`timeout` seconds so the caller can send a heartbeat.
+
+The implementation is chosen by settings.REALTIME_BROKER (dotted path):
+    InMemoryBroker – single process (tests, runserver, one ASGI worker)
+    RedisBroker    – Redis pub/sub, fans out across workers and hosts
+"""
+import asyncio
+import threading
+from collections import defaultdict
+from typing import AsyncIterator, Optional
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class BaseBroker:
+    def publish(self, channel: str, message: str) -> None:
+        raise NotImplementedError
+
+    def subscribe(self, channel: str, timeout: float = 15) -> AsyncIterator[Optional[str]]:
+        raise NotImplementedError
+
+
+class InMemoryBroker(BaseBroker):
+    """
+    Fan-out to subscribers of this process only.  Each subscriber owns a
+    bounded queue on its event loop; a slow consumer drops its oldest
+    messages instead of growing without limit.
+    """
+
+    queue_size = 100
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)  # channel → {(loop, queue)}
+
+    def publish(self, channel: str, message: str) -> None:
+        with self._lock:
+            targets = list(self._subscribers.get(channel, ()))
+        for loop, queue in targets:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, message)
+            except RuntimeError:
+                pass  # subscriber's loop already closed
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, message: str) -> None:
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(message)
+
+    async def subscribe(self, channel: str, timeout: float = 15):
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue(maxsize=self.queue_size))
+        with self._lock:
+            self._subscribers[channel].add(subscriber)
+        try:
+            yield None
+            while True:
+                try:
+                    yield await asyncio.wait_for(subscriber[1].get(), timeout)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            with self._lock:
+                self._subscribers[channel].discard(subscriber)
+                if not self._subscribers[channel]:
+                    del self._subscribers[channel]
+
+
+class RedisBroker(BaseBroker):
+    """Redis pub/sub – every worker subscribed to a channel gets the message."""
+
+    def __init__(self, url: str = ""):
+        import redis
+
+        self.url = url or settings.REDIS_URL
+        self._client = redis.Redis.from_url(self.url)
+
+    def publish(self, channel: str, message: str) -> None:
+        self._client.publish(channel, message)
+
+    async def subscribe(self, channel: str, timeout: float = 15):
+        import redis.asyncio as aioredis
+
+        client = aioredis.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(channel)
+        try:
+            yield None
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+                yield message["data"].decode() if message else None
+        finally:
+            await pubsub.unsubscribe(channel)
+            await pubsub.aclose()
+            await client.aclose()
+
+
+_broker: Optional[BaseBroker] = None
+_broker_lock = threading.Lock()
+
+
+def get_broker() -> BaseBroker:
+    """Process-wide broker instance configured by settings.REALTIME_BROKER."""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(settings.REALTIME_BROKER)()
+    return _broker
@@ -0,0 +1,29 @@
+"""
+Management command to move activity / audit log rows past the retention
+window into gzip NDJSON archives, rolling meal edits up into daily rows
+(see apps/core/retention.py).  Run it daily (the docker-compose
+`log-maintenance` service does).
+
+Run: python manage.py archive_logs [--days 90] [--batch-size 1000] [--dry-run]
+"""
+from django.core.management.base import BaseCommand
+from apps.core.retention import archive_old_logs
+
+
+class Command(BaseCommand):
+    help = "Archive and delete activity / audit log rows older than the retention window."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, help="Retention in days (default LOG_RETENTION_DAYS).")
+        parser.add_argument("--batch-size", type=int, help="Rows per delete batch.")
+        parser.add_argument("--dry-run", action="store_true", help="Only count the rows due.")
+
+    def handle(self, *args, **options):
+        result = archive_old_logs(
+            days=options["days"], batch_size=options["batch_size"], dry_run=options["dry_run"]
+        )
+        verb = "due" if options["dry_run"] else "archived"
+        for kind, count in result.items():
+            self.stdout.write(f"{kind}: {count} rows {verb}")
+        if not options["dry_run"]:
+            self.stdout.write(self.style.SUCCESS("Done."))
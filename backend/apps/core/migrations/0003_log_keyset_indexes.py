@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:39
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_activitylog_created_at_default'),
+        ('flats', '0004_flatmembership_permission_mask'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['flat', 'action', '-created_at'], name='activity_lo_flat_id_7c1bfb_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_log_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='activitylog',
+            name='action',
+            field=models.CharField(choices=[('login', 'Logged in'), ('logout', 'Logged out'), ('register', 'Registered'), ('meal_add', 'Added meal entry'), ('meal_update', 'Updated meal entry'), ('meal_rollup', 'Meal edits (daily rollup)'), ('month_lock', 'Locked month'), ('month_unlock', 'Unlocked month'), ('expense_add', 'Added expense'), ('expense_update', 'Updated expense'), ('expense_delete', 'Deleted expense'), ('member_invite', 'Created invite link'), ('member_join', 'Joined flat'), ('member_remove', 'Removed member'), ('member_status', 'Updated member month status'), ('permission_update', 'Updated permissions'), ('flat_update', 'Updated flat details')], max_length=30),
+        ),
+    ]
@@ -3,7 +3,9 @@ Shared base model and utilities used across all apps.
 """
 import uuid
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
+from .querysets import LogQuerySet
 
 
 class TimeStampedModel(models.Model):
@@ -32,6 +34,7 @@ class ActivityLog(models.Model):
         # Meals
         MEAL_ADD = "meal_add", "Added meal entry"
         MEAL_UPDATE = "meal_update", "Updated meal entry"
+        MEAL_ROLLUP = "meal_rollup", "Meal edits (daily rollup)"
         MONTH_LOCK = "month_lock", "Locked month"
         MONTH_UNLOCK = "month_unlock", "Unlocked month"
         # Expenses
@@ -67,7 +70,10 @@ class ActivityLog(models.Model):
     description = models.TextField(blank=True, default="")
     metadata = models.JSONField(default=dict, blank=True)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    # Set at log() time, not insert time – buffered records are written later
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    objects = LogQuerySet.as_manager()
 
     class Meta:
         db_table = "activity_logs"
@@ -76,6 +82,7 @@ class ActivityLog(models.Model):
             models.Index(fields=["user", "-created_at"]),
             models.Index(fields=["flat", "-created_at"]),
             models.Index(fields=["action", "-created_at"]),
+            models.Index(fields=["flat", "action", "-created_at"]),
         ]
 
     def __str__(self):
@@ -84,13 +91,17 @@ class ActivityLog(models.Model):
 
     @classmethod
     def log(cls, user, flat, action, description="", metadata=None, request=None):
-        """Convenience method to create a log entry."""
+        """
+        Convenience method to record an entry.  In buffered mode
+        (ACTIVITY_LOG_MODE) the returned instance is written shortly after
+        the current transaction commits (see apps.core.activity).
+        """
         ip = None
         if request:
             ip = request.META.get("HTTP_X_FORWARDED_FOR", "").split(",")[0].strip()
             if not ip:
                 ip = request.META.get("REMOTE_ADDR")
-        return cls.objects.create(
+        entry = cls(
             user=user,
             flat=flat,
             action=action,
@@ -98,3 +109,10 @@ class ActivityLog(models.Model):
             metadata=metadata or {},
             ip_address=ip,
         )
+        if settings.ACTIVITY_LOG_MODE == "sync":
+            entry.save(force_insert=True)
+        else:
+            from .activity import activity_buffer
+
+            transaction.on_commit(lambda: activity_buffer.add(entry))
+        return entry
@@ -1,7 +1,15 @@
 """
 Reusable pagination classes.
 """
-from rest_framework.pagination import PageNumberPagination
+import base64
+import uuid
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 
 class StandardPagination(PageNumberPagination):
@@ -14,3 +22,107 @@ class SmallPagination(PageNumberPagination):
     page_size = 20
     page_size_query_param = "page_size"
     max_page_size = 100
+
+
+class KeysetPagination(BasePagination):
+    """
+    Newest-first keyset pagination on (created_at, id).
+
+    The `cursor` query param is a position plus a direction: rows older
+    than the last row served (`next`) or newer than the first one
+    (`previous`), so page N costs the same index range scan as page 1 –
+    no OFFSET.  Works on querysets of model instances or `.values()`
+    rows.  The view's `results_key` names the list in the response
+    envelope; views replacing a PageNumberPagination list set
+    `include_count` to keep its `count` field (one COUNT query).
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    cursor_query_param = "cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.results_key = getattr(view, "results_key", "results")
+        self.count = queryset.count() if getattr(view, "include_count", False) else None
+        page_size = self.get_page_size(request)
+
+        position = self.decode_cursor(request.query_params.get(self.cursor_query_param))
+        backwards = position is not None and position[2]
+        if position is None:
+            rows = list(queryset.order_by("-created_at", "-id")[: page_size + 1])
+        elif backwards:
+            created_at, pk, _ = position
+            rows = list(
+                queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk))
+                .order_by("created_at", "id")[: page_size + 1]
+            )
+        else:
+            created_at, pk, _ = position
+            rows = list(
+                queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+                .order_by("-created_at", "-id")[: page_size + 1]
+            )
+        more = len(rows) > page_size
+        rows = rows[:page_size]
+        if backwards:
+            rows.reverse()
+        # Coming from a cursor, rows exist on the side it points away from
+        has_next = more if not backwards else True
+        has_previous = more if backwards else position is not None
+        self.next_cursor = self.encode_cursor(rows[-1]) if rows and has_next else None
+        self.previous_cursor = (
+            self.encode_cursor(rows[0], backwards=True) if rows and has_previous else None
+        )
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def _page_url(self, cursor):
+        if cursor is None:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        body = {"success": True}
+        if self.count is not None:
+            body["count"] = self.count
+        body.update(
+            {
+                "next": self._page_url(self.next_cursor),
+                "previous": self._page_url(self.previous_cursor),
+                "next_cursor": self.next_cursor,
+                "previous_cursor": self.previous_cursor,
+                self.results_key: data,
+            }
+        )
+        return Response(body)
+
+    @staticmethod
+    def encode_cursor(row, backwards=False) -> str:
+        if isinstance(row, dict):
+            created_at, pk = row["created_at"], row["id"]
+        else:
+            created_at, pk = row.created_at, row.pk
+        raw = f"{created_at.isoformat()}|{pk}{'|prev' if backwards else ''}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """(created_at, id, backwards) or None; 400 on anything malformed."""
+        if not cursor:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+            created_at, pk, *direction = raw.split("|")
+            if direction not in ([], ["prev"]):
+                raise ValueError(direction)
+            return datetime.fromisoformat(created_at), uuid.UUID(pk), bool(direction)
+        except (ValueError, UnicodeDecodeError):
+            raise ValidationError({"cursor": "Invalid cursor."})
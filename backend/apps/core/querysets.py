@@ -0,0 +1,53 @@
+"""
+Shared queryset helpers.
+"""
+from datetime import date, datetime, time, timedelta
+from typing import Tuple
+from django.db import models
+from django.utils import timezone
+
+
+def month_bounds(year: int, month: int) -> Tuple[date, date]:
+    """Half-open window [first day of month, first day of next month)."""
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start, end
+
+
+class MonthWindowQuerySet(models.QuerySet):
+    """
+    Per-flat month filtering for models with `flat` + `date` columns.
+
+    Uses plain range predicates (date >= start AND date < end) instead of
+    date__year / date__month, which extract date parts and prevent the
+    (flat, date) index from being used as a range scan.
+    """
+
+    def for_month(self, flat, year: int, month: int):
+        start, end = month_bounds(year, month)
+        return self.filter(flat=flat, date__gte=start, date__lt=end)
+
+
+class LogQuerySet(models.QuerySet):
+    """
+    Filters for log tables indexed on (flat, -created_at) and
+    (flat, action, -created_at).  Date bounds become created_at range
+    predicates on local-midnight datetimes (not created_at__date), so the
+    index range scan is kept.
+    """
+
+    def filtered(self, user_id=None, action=None, date_from=None, date_to=None):
+        qs = self
+        if user_id:
+            qs = qs.filter(user_id=user_id)
+        if action:
+            qs = qs.filter(action=action)
+        if date_from:
+            qs = qs.filter(created_at__gte=local_midnight(date_from))
+        if date_to:
+            qs = qs.filter(created_at__lt=local_midnight(date_to + timedelta(days=1)))
+        return qs
+
+
+def local_midnight(day: date) -> datetime:
+    return timezone.make_aware(datetime.combine(day, time.min))
@@ -0,0 +1,167 @@
+"""
+Log retention – keeps activity_logs / audit_logs small.
+
+Rows older than LOG_RETENTION_DAYS are moved, in batches of
+LOG_ARCHIVE_BATCH_SIZE, into gzip NDJSON files partitioned by flat and
+day:
+
+    <LOG_ARCHIVE_DIR>/<activity|audit>/<flat id>/<YYYY>/<MM>/<YYYY-MM-DD>.ndjson.gz
+
+Each batch appends one gzip member per file and is deleted only after
+the files are written, so a crash re-archives at most one batch
+(readers de-duplicate by id).  Meal edit events are additionally folded
+into one MEAL_ROLLUP activity row per (flat, user, day), updated in the
+same transaction as the delete; rollup rows stay in the table.
+
+Entry points: archive_old_logs() (scheduler hook) and the
+`archive_logs` management command.
+"""
+import gzip
+import json
+import os
+from collections import defaultdict
+from datetime import date, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ActivityLog
+from .querysets import local_midnight
+
+MEAL_EDIT_ACTIONS = (ActivityLog.ActionType.MEAL_ADD, ActivityLog.ActionType.MEAL_UPDATE)
+
+ARCHIVE_KINDS = ("activity", "audit")
+_NO_FLAT = "_none"
+
+
+def _log_model(kind):
+    if kind == "activity":
+        return ActivityLog
+    from apps.expenses.models import AuditLog
+
+    return AuditLog
+
+
+def _row_fields(kind):
+    if kind == "activity":
+        return ("id", "user_id", "flat_id", "action", "description", "metadata", "ip_address", "created_at")
+    return ("id", "user_id", "flat_id", "action", "entity_type", "entity_id", "details", "created_at")
+
+
+def archive_path(kind, flat_id, day: date) -> Path:
+    return (
+        Path(settings.LOG_ARCHIVE_DIR) / kind / str(flat_id or _NO_FLAT)
+        / f"{day:%Y}" / f"{day:%m}" / f"{day:%Y-%m-%d}.ndjson.gz"
+    )
+
+
+def archive_old_logs(days=None, batch_size=None, dry_run=False):
+    """
+    Archive and delete log rows older than `days` (LOG_RETENTION_DAYS).
+    Returns {kind: rows archived} – with dry_run, the rows that would be.
+    """
+    days = settings.LOG_RETENTION_DAYS if days is None else days
+    batch_size = batch_size or settings.LOG_ARCHIVE_BATCH_SIZE
+    cutoff = local_midnight(timezone.localdate() - timedelta(days=days))
+
+    result = {}
+    for kind in ARCHIVE_KINDS:
+        qs = _log_model(kind).objects.filter(created_at__lt=cutoff)
+        if kind == "activity":
+            qs = qs.exclude(action=ActivityLog.ActionType.MEAL_ROLLUP)
+        if dry_run:
+            result[kind] = qs.count()
+            continue
+        archived = 0
+        while True:
+            moved = _archive_batch(kind, qs, batch_size)
+            if not moved:
+                break
+            archived += moved
+        result[kind] = archived
+    return result
+
+
+def _archive_batch(kind, qs, batch_size) -> int:
+    with transaction.atomic():
+        rows = list(qs.order_by("created_at", "id").values(*_row_fields(kind))[:batch_size])
+        if not rows:
+            return 0
+        _write_archive(kind, rows)
+        if kind == "activity":
+            _roll_up_meal_edits(rows)
+        _log_model(kind).objects.filter(id__in=[row["id"] for row in rows]).delete()
+    return len(rows)
+
+
+def _write_archive(kind, rows) -> None:
+    partitions = defaultdict(list)
+    for row in rows:
+        day = timezone.localtime(row["created_at"]).date()
+        partitions[archive_path(kind, row["flat_id"], day)].append(row)
+    for path, part in partitions.items():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = "".join(json.dumps(row, cls=DjangoJSONEncoder) + "\n" for row in part)
+        # Append a new gzip member; a file of several members reads as one stream.
+        with open(path, "ab") as fh:
+            fh.write(gzip.compress(payload.encode()))
+            fh.flush()
+            os.fsync(fh.fileno())
+
+
+def _roll_up_meal_edits(rows) -> None:
+    """Fold the batch's meal edits into per-(flat, user, day) rollup rows."""
+    counts = defaultdict(lambda: defaultdict(int))
+    for row in rows:
+        if row["action"] in MEAL_EDIT_ACTIONS and row["flat_id"]:
+            day = timezone.localtime(row["created_at"]).date()
+            counts[(row["flat_id"], row["user_id"], day)][row["action"]] += 1
+
+    for (flat_id, user_id, day), by_action in counts.items():
+        created_at = local_midnight(day)
+        rollup = (
+            ActivityLog.objects.select_for_update()
+            .filter(
+                flat_id=flat_id, user_id=user_id, created_at=created_at,
+                action=ActivityLog.ActionType.MEAL_ROLLUP,
+            )
+            .first()
+        )
+        if rollup is None:
+            rollup = ActivityLog(
+                flat_id=flat_id, user_id=user_id, created_at=created_at,
+                action=ActivityLog.ActionType.MEAL_ROLLUP,
+                metadata={"date": str(day), "events": 0},
+            )
+        for action, n in by_action.items():
+            rollup.metadata[action] = rollup.metadata.get(action, 0) + n
+            rollup.metadata["events"] += n
+        rollup.description = f"{rollup.metadata['events']} meal edits on {day}"
+        rollup.save()
+
+
+def iter_archived_rows(kind, flat_id, date_from: date, date_to: date):
+    """Archived rows of a flat for days in [date_from, date_to], oldest day first."""
+    day = date_from
+    while day <= date_to:
+        path = archive_path(kind, flat_id, day)
+        if path.exists():
+            seen = set()
+            with gzip.open(path, "rt") as fh:
+                for line in fh:
+                    row = json.loads(line)
+                    if row["id"] not in seen:
+                        seen.add(row["id"])
+                        yield row
+        day += timedelta(days=1)
+
+
+def iter_live_rows(kind, flat_id, date_from: date, date_to: date, chunk_size=2000):
+    """Rows still in the table for the same range, oldest first."""
+    qs = _log_model(kind).objects.filter(flat_id=flat_id).filtered(
+        date_from=date_from, date_to=date_to
+    )
+    yield from qs.order_by("created_at", "id").values(*_row_fields(kind)).iterator(chunk_size=chunk_size)
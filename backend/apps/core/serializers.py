@@ -5,14 +5,56 @@ from rest_framework import serializers
 from .models import ActivityLog
 
 
-class ActivityLogSerializer(serializers.ModelSerializer):
-    user_name = serializers.CharField(source="user.full_name", read_only=True, default="System")
-    action_label = serializers.CharField(source="get_action_display", read_only=True)
-
-    class Meta:
-        model = ActivityLog
-        fields = [
-            "id", "user", "user_name", "flat", "action", "action_label",
-            "description", "metadata", "created_at",
-        ]
-        read_only_fields = fields
+class ActivityLogSerializer(serializers.Serializer):
+    """Renders `.values()` rows of ActivityLog (see ActivityLogListView.row_fields)."""
+
+    id = serializers.UUIDField()
+    user = serializers.UUIDField(source="user_id", allow_null=True)
+    user_name = serializers.SerializerMethodField()
+    flat = serializers.UUIDField(source="flat_id", allow_null=True)
+    action = serializers.CharField()
+    action_label = serializers.SerializerMethodField()
+    description = serializers.CharField()
+    metadata = serializers.JSONField()
+    created_at = serializers.DateTimeField()
+
+    def get_user_name(self, row):
+        return row["user_name"] or "System"
+
+    def get_action_label(self, row):
+        try:
+            return ActivityLog.ActionType(row["action"]).label
+        except ValueError:
+            return row["action"]
+
+
+class LogFilterSerializer(serializers.Serializer):
+    """Query params shared by the activity and audit log lists."""
+
+    user_id = serializers.UUIDField(required=False)
+    action = serializers.CharField(required=False, max_length=50)
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        if attrs.get("date_from") and attrs.get("date_to") and attrs["date_from"] > attrs["date_to"]:
+            raise serializers.ValidationError({"date_to": "Must not be before date_from."})
+        return attrs
+
+
+class LogExportSerializer(serializers.Serializer):
+    """Query params of the log export (archived + live rows)."""
+
+    MAX_DAYS = 366
+
+    kind = serializers.ChoiceField(choices=["activity", "audit"], default="activity")
+    date_from = serializers.DateField()
+    date_to = serializers.DateField()
+
+    def validate(self, attrs):
+        span = (attrs["date_to"] - attrs["date_from"]).days
+        if span < 0:
+            raise serializers.ValidationError({"date_to": "Must not be before date_from."})
+        if span >= self.MAX_DAYS:
+            raise serializers.ValidationError({"date_to": f"At most {self.MAX_DAYS} days per export."})
+        return attrs
@@ -0,0 +1,82 @@
+"""
+ActivityLog writers: "sync" (default) inserts inside the caller's
+transaction; opt-in "buffered" hands records over on commit, flushes
+before log reads and drains at exit.  The writer thread is not started
+here – flushes run on the test's own connection.
+"""
+from unittest import mock
+
+from django.db import transaction
+from django.test import TestCase, override_settings
+
+from apps.core.activity import ActivityLogBuffer, activity_buffer
+from apps.core.models import ActivityLog
+from apps.core.tests.utils import api_client, make_flat
+
+LOGS = "/api/v1/core/activity-logs/"
+
+
+def log(membership, description="test"):
+    return ActivityLog.log(
+        user=membership.user,
+        flat=membership.flat,
+        action=ActivityLog.ActionType.MEAL_ADD,
+        description=description,
+    )
+
+
+class SyncModeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.flat, (cls.owner,) = make_flat(members=1)
+
+    def test_written_in_the_callers_transaction(self):
+        entry = log(self.owner)
+        self.assertTrue(ActivityLog.objects.filter(pk=entry.pk).exists())
+
+
+@override_settings(ACTIVITY_LOG_MODE="buffered")
+@mock.patch.object(ActivityLogBuffer, "_ensure_thread")
+class BufferedModeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.flat, (cls.owner,) = make_flat(members=1)
+
+    def setUp(self):
+        activity_buffer._pending.clear()
+
+    def test_handed_over_on_commit(self, _):
+        with self.captureOnCommitCallbacks(execute=True):
+            entry = log(self.owner)
+            self.assertEqual(len(activity_buffer._pending), 0)
+        self.assertEqual(list(activity_buffer._pending), [entry])
+        self.assertFalse(ActivityLog.objects.filter(pk=entry.pk).exists())
+
+        self.assertEqual(activity_buffer.flush(), 1)
+        self.assertTrue(ActivityLog.objects.filter(pk=entry.pk).exists())
+
+    def test_rolled_back_records_are_dropped(self, _):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    log(self.owner)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertEqual(len(activity_buffer._pending), 0)
+
+    def test_list_view_reads_its_own_writes(self, _):
+        with self.captureOnCommitCallbacks(execute=True):
+            entry = log(self.owner, "just now")
+        response = api_client(self.owner.user, self.flat).get(LOGS)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(str(entry.pk), [str(row["id"]) for row in response.data["logs"]])
+
+    def test_drained_at_exit(self, _):
+        """drain() is the atexit hook: flush, then close the connections."""
+        with self.captureOnCommitCallbacks(execute=True):
+            entry = log(self.owner)
+        with mock.patch("apps.core.activity.connections") as connections:
+            activity_buffer.drain()
+        connections.close_all.assert_called_once()
+        self.assertTrue(ActivityLog.objects.filter(pk=entry.pk).exists())
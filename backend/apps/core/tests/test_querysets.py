@@ -0,0 +1,138 @@
+"""
+MonthWindowQuerySet / LogQuerySet: the month and log filters must stay
+range predicates on the (flat, date) / (flat, action, -created_at)
+indexes.  Plans are checked with EXPLAIN on SQLite and PostgreSQL.
+
+The large-dataset benchmark is opt-in:
+    RUN_BENCHMARKS=1 [BENCHMARK_ROWS=200000] python manage.py test apps.core.tests.test_querysets
+"""
+import os
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+
+from apps.core.models import ActivityLog
+from apps.core.querysets import month_bounds
+from apps.expenses.models import Expense
+from apps.flats.models import Flat
+from apps.meals.models import MealEntry
+
+from .utils import make_flat, make_user
+
+
+def index_name(model, fields):
+    return next(index.name for index in model._meta.indexes if index.fields == fields)
+
+
+class ExplainMixin:
+    def assertIndexRangeScan(self, queryset, index, column):
+        """The plan reads `index` with a bounded range on `column`."""
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")  # tiny tables
+            plan = queryset.explain()
+            self.assertIn(index, plan)
+            self.assertRegex(plan, rf"Index Cond: .*{column} >= ")
+        elif connection.vendor == "sqlite":
+            plan = queryset.explain()
+            self.assertIn(f"USING INDEX {index}", plan)
+            self.assertRegex(plan, rf"{column}>\?")
+        else:
+            self.skipTest(f"no plan assertions for {connection.vendor}")
+
+
+class MonthBoundsTests(TestCase):
+    def test_half_open_window(self):
+        self.assertEqual(month_bounds(2026, 2), (date(2026, 2, 1), date(2026, 3, 1)))
+        self.assertEqual(month_bounds(2026, 12), (date(2026, 12, 1), date(2027, 1, 1)))
+
+    def test_for_month_keeps_edges(self):
+        flat, (owner, *_) = make_flat(members=1)
+        for day in (date(2026, 1, 31), date(2026, 2, 1), date(2026, 2, 28), date(2026, 3, 1)):
+            MealEntry.objects.create(flat=flat, user=owner.user, date=day, meal_count=Decimal("1"))
+        self.assertEqual(
+            list(MealEntry.objects.for_month(flat, 2026, 2).order_by("date").values_list("date", flat=True)),
+            [date(2026, 2, 1), date(2026, 2, 28)],
+        )
+
+
+class IndexUsageTests(ExplainMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.flat, _ = make_flat(members=1)
+
+    def test_meal_month_uses_flat_date_index(self):
+        self.assertIndexRangeScan(
+            MealEntry.objects.for_month(self.flat, 2026, 2),
+            index_name(MealEntry, ["flat", "date"]),
+            "date",
+        )
+
+    def test_expense_month_uses_flat_date_index(self):
+        self.assertIndexRangeScan(
+            Expense.objects.for_month(self.flat, 2026, 2),
+            index_name(Expense, ["flat", "date"]),
+            "date",
+        )
+
+    def test_log_filter_uses_flat_action_index(self):
+        qs = ActivityLog.objects.filter(flat=self.flat).filtered(
+            action=ActivityLog.ActionType.MEAL_ADD, date_from=date(2026, 1, 1), date_to=date(2026, 1, 31)
+        )
+        self.assertIndexRangeScan(
+            qs, index_name(ActivityLog, ["flat", "action", "-created_at"]), "created_at"
+        )
+
+
+@skipUnless(os.environ.get("RUN_BENCHMARKS"), "set RUN_BENCHMARKS=1 to run")
+class MonthWindowBenchmark(ExplainMixin, TestCase):
+    """for_month() against the date__year / date__month lookups it replaced."""
+
+    repeat = 50
+
+    @classmethod
+    def setUpTestData(cls):
+        rows = int(os.environ.get("BENCHMARK_ROWS", 200_000))
+        users = [make_user() for _ in range(10)]
+        flats = Flat.objects.bulk_create(
+            [Flat(name=f"Flat {i}", owner=users[0]) for i in range(max(rows // 2000, 1))]
+        )
+        cls.flat = flats[0]
+        days = max(rows // (len(flats) * len(users)), 1)
+        start = date(2026, 1, 1) - timedelta(days=days // 2)
+        MealEntry.objects.bulk_create(
+            (
+                MealEntry(flat=flat, user=user, date=start + timedelta(days=d), meal_count=Decimal("1"))
+                for flat in flats
+                for user in users
+                for d in range(days)
+            ),
+            batch_size=5000,
+        )
+        cls.rows = len(flats) * len(users) * days
+
+    def timed(self, make_queryset):
+        began = time.perf_counter()
+        for _ in range(self.repeat):
+            list(make_queryset().values_list("meal_count", flat=True))
+        return (time.perf_counter() - began) / self.repeat * 1000
+
+    def test_month_window(self):
+        self.assertIndexRangeScan(
+            MealEntry.objects.for_month(self.flat, 2026, 1),
+            index_name(MealEntry, ["flat", "date"]),
+            "date",
+        )
+        ranged = self.timed(lambda: MealEntry.objects.for_month(self.flat, 2026, 1))
+        extracted = self.timed(
+            lambda: MealEntry.objects.filter(flat=self.flat, date__year=2026, date__month=1)
+        )
+        print(
+            f"\n{self.rows} meal_entries rows: for_month {ranged:.2f} ms, "
+            f"date__year/date__month {extracted:.2f} ms per month query"
+        )
+        self.assertLess(ranged, extracted)
@@ -0,0 +1,47 @@
+"""
+Shared fixtures for the test suites: a seeded flat with members and an
+authenticated API client for it.
+"""
+import uuid
+
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.accounts.models import User
+from apps.flats.models import Flat, FlatMembership
+from apps.permissions.services import assign_all_permissions, seed_permissions, set_permissions
+
+MEMBER_PERMISSIONS = ["view_meals", "add_meal", "view_expenses", "add_expense", "view_analytics"]
+
+
+def make_user(full_name="Member"):
+    return User.objects.create_user(
+        email=f"{uuid.uuid4().hex[:12]}@example.com", password="pw123456!", full_name=full_name
+    )
+
+
+def make_flat(members=2, permissions=MEMBER_PERMISSIONS):
+    """
+    A flat with an owner plus `members - 1` members holding `permissions`.
+    Returns (flat, [owner membership, member memberships…]).
+    """
+    seed_permissions()
+    owner = make_user("Owner")
+    flat = Flat.objects.create(name="Test flat", owner=owner)
+    owner_membership = FlatMembership.objects.create(user=owner, flat=flat, role="owner")
+    assign_all_permissions(owner_membership)
+    memberships = [owner_membership]
+    for i in range(members - 1):
+        membership = FlatMembership.objects.create(user=make_user(f"Member {i}"), flat=flat)
+        set_permissions(membership, permissions)
+        memberships.append(membership)
+    return flat, memberships
+
+
+def api_client(user, flat):
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}",
+        HTTP_X_FLAT_ID=str(flat.id),
+    )
+    return client
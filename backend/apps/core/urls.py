@@ -5,4 +5,5 @@ app_name = "core"
 
 urlpatterns = [
     path("activity-logs/", views.ActivityLogListView.as_view(), name="activity_logs"),
+    path("logs/export/", views.LogExportView.as_view(), name="log_export"),
 ]
@@ -1,38 +1,75 @@
 """
-Core views – Activity Log.
+Core views – Activity Log, log export.
 """
+import json
+from itertools import chain
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+from django.http import StreamingHttpResponse
 from rest_framework import generics, permissions
-from rest_framework.response import Response
+from rest_framework.views import APIView
+from apps.permissions.guards import flat_permission_required
+from .activity import flush_activity_logs
 from .models import ActivityLog
-from .serializers import ActivityLogSerializer
+from .pagination import KeysetPagination
+from .retention import iter_archived_rows, iter_live_rows
+from .serializers import ActivityLogSerializer, LogExportSerializer, LogFilterSerializer
 
 
 class ActivityLogListView(generics.ListAPIView):
-    """List activity logs for the current flat."""
+    """
+    GET /core/activity-logs/?user_id=&action=&date_from=&date_to=&cursor=&page_size=
+    Newest first, keyset-paginated (follow `next_cursor`).
+    """
 
     serializer_class = ActivityLogSerializer
+    pagination_class = KeysetPagination
+    results_key = "logs"
+    row_fields = ("id", "user_id", "flat_id", "action", "description", "metadata", "created_at")
 
     def get_queryset(self):
+        params = LogFilterSerializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        flush_activity_logs()  # buffered mode: show this worker's pending writes
+
         flat = getattr(self.request, "flat", None)
-        qs = ActivityLog.objects.select_related("user")
         if flat:
-            qs = qs.filter(flat=flat)
+            qs = ActivityLog.objects.filter(flat=flat)
         else:
-            qs = qs.filter(user=self.request.user)
+            qs = ActivityLog.objects.filter(user=self.request.user)
+        return qs.filtered(**params.validated_data).values(
+            *self.row_fields, user_name=F("user__full_name")
+        )
 
-        # Optional filter by user
-        user_id = self.request.query_params.get("user_id")
-        if user_id:
-            qs = qs.filter(user_id=user_id)
 
-        # Optional filter by action type
-        action = self.request.query_params.get("action")
-        if action:
-            qs = qs.filter(action=action)
+class LogExportView(APIView):
+    """
+    GET /core/logs/export/?kind=activity|audit&date_from=YYYY-MM-DD&date_to=YYYY-MM-DD
+    Streams the flat's log rows for the range as NDJSON, oldest first –
+    archived days (see apps/core/retention.py) followed by rows still in
+    the table.
+    """
 
-        return qs[:100]  # Limit to last 100 entries
+    permission_classes = [permissions.IsAuthenticated, flat_permission_required("export_report")]
 
-    def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return Response({"success": True, "logs": serializer.data})
+    def get(self, request):
+        params = LogExportSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        kind, date_from, date_to = (
+            params.validated_data[k] for k in ("kind", "date_from", "date_to")
+        )
+        if kind == "activity":
+            flush_activity_logs()
+        rows = chain(
+            iter_archived_rows(kind, request.flat.id, date_from, date_to),
+            iter_live_rows(kind, request.flat.id, date_from, date_to),
+        )
+        response = StreamingHttpResponse(
+            (json.dumps(row, cls=DjangoJSONEncoder) + "\n" for row in rows),
+            content_type="application/x-ndjson",
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{kind}-log-{date_from}-{date_to}.ndjson"'
+        )
+        return response
@@ -7,6 +7,18 @@ class ExpenseAdmin(admin.ModelAdmin):
     list_display = ("paid_by", "flat", "amount", "date", "description")
     list_filter = ("flat", "date")
 
+    # Read-only: writes must go through the API, which keeps MonthlySummary,
+    # MemberMonthBalance and FlatDailyStats in step (delta bookkeeping,
+    # month locks, sync tombstones, audit / activity logs).
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
 
 @admin.register(AuditLog)
 class AuditLogAdmin(admin.ModelAdmin):
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:39
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0001_initial'),
+        ('flats', '0004_flatmembership_permission_mask'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['flat', '-created_at'], name='audit_logs_flat_id_a3cda0_idx'),
+        ),
+    ]
@@ -4,6 +4,7 @@ Expense (Bazar) model.
 from django.conf import settings
 from django.db import models
 from apps.core.models import TimeStampedModel
+from apps.core.querysets import LogQuerySet, MonthWindowQuerySet
 
 
 class Expense(TimeStampedModel):
@@ -23,6 +24,8 @@ class Expense(TimeStampedModel):
     description = models.CharField(max_length=500, blank=True, default="")
     date = models.DateField(db_index=True)
 
+    objects = MonthWindowQuerySet.as_manager()
+
     class Meta:
         db_table = "expenses"
         indexes = [
@@ -54,11 +57,14 @@ class AuditLog(TimeStampedModel):
     entity_id = models.CharField(max_length=50, blank=True)
     details = models.JSONField(default=dict)
 
+    objects = LogQuerySet.as_manager()
+
     class Meta:
         db_table = "audit_logs"
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["flat", "action"]),
+            models.Index(fields=["flat", "-created_at"]),
         ]
 
     def __str__(self):
@@ -2,7 +2,7 @@
 Expense serializers.
 """
 from rest_framework import serializers
-from .models import Expense, AuditLog
+from .models import Expense
 
 
 class ExpenseSerializer(serializers.ModelSerializer):
@@ -23,9 +23,14 @@ class ExpenseCreateSerializer(serializers.ModelSerializer):
         fields = ["paid_by", "amount", "description", "date"]
 
 
-class AuditLogSerializer(serializers.ModelSerializer):
-    user_name = serializers.CharField(source="user.full_name", read_only=True)
+class AuditLogSerializer(serializers.Serializer):
+    """Renders `.values()` rows of AuditLog (see AuditLogListView)."""
 
-    class Meta:
-        model = AuditLog
-        fields = ["id", "user", "user_name", "action", "entity_type", "entity_id", "details", "created_at"]
+    id = serializers.UUIDField()
+    user = serializers.UUIDField(source="user_id", allow_null=True)
+    user_name = serializers.CharField(allow_null=True)
+    action = serializers.CharField()
+    entity_type = serializers.CharField()
+    entity_id = serializers.CharField()
+    details = serializers.JSONField()
+    created_at = serializers.DateTimeField()
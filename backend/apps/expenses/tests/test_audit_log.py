@@ -0,0 +1,70 @@
+"""
+The audit log list keeps the page-number contract it replaced
+(count / next / previous / results) on top of keyset cursors.
+"""
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.core.tests.utils import api_client, make_flat
+from apps.expenses.models import AuditLog
+
+AUDIT = "/api/v1/expenses/audit/"
+
+
+class AuditLogPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.flat, (cls.owner,) = make_flat(members=1)
+        now = timezone.now()
+        for i in range(7):
+            entry = AuditLog.objects.create(
+                flat=cls.flat, user=cls.owner.user, action="expense_create", entity_type="expense"
+            )
+            # Pairs share a timestamp so the id tie-break is exercised
+            AuditLog.objects.filter(pk=entry.pk).update(created_at=now - timedelta(minutes=i // 2))
+
+    def setUp(self):
+        self.client = api_client(self.owner.user, self.flat)
+
+    def page(self, cursor=None):
+        params = {"page_size": 3}
+        if cursor:
+            params["cursor"] = cursor
+        response = self.client.get(AUDIT, params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_first_page_keeps_the_page_number_fields(self):
+        data = self.page()
+        self.assertEqual(data["count"], 7)
+        self.assertIsNone(data["previous"])
+        self.assertIn("cursor=", data["next"])
+        self.assertEqual(len(data["results"]), 3)
+
+    def test_cursor_round_trip(self):
+        expected = list(
+            AuditLog.objects.filter(flat=self.flat).order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+        expected = [str(pk) for pk in expected]
+        pages = [self.page()]
+        while pages[-1]["next_cursor"]:
+            pages.append(self.page(pages[-1]["next_cursor"]))
+        self.assertEqual([len(p["results"]) for p in pages], [3, 3, 1])
+        self.assertEqual([row["id"] for p in pages for row in p["results"]], expected)
+        self.assertIsNone(pages[-1]["next"])
+
+        for before, after in zip(pages, pages[1:]):
+            back = self.page(after["previous_cursor"])
+            self.assertEqual(back["results"], before["results"])
+            self.assertEqual(back["next_cursor"], before["next_cursor"])
+        self.assertIsNone(self.page(pages[1]["previous_cursor"])["previous"])
+
+    def test_bad_cursor_is_a_400(self):
+        for cursor in ("garbage", "bm90fGF8Y3Vyc29y"):  # "not|a|cursor"
+            with self.subTest(cursor=cursor):
+                response = self.client.get(AUDIT, {"cursor": cursor})
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.data["success"])
+                self.assertIn("cursor", response.data["errors"])
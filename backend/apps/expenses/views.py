@@ -1,15 +1,31 @@
 """
 Expense views – CRUD + auto-recalculation.
 """
+from collections import defaultdict
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import F
 from rest_framework import generics, status, permissions
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
 from apps.permissions.guards import flat_permission_required
 from apps.core.models import ActivityLog
-from apps.meals.calculation_engine import recalculate_month, is_month_locked
+from apps.core.pagination import KeysetPagination
+from apps.core.serializers import LogFilterSerializer
+from apps.meals.calculation_engine import apply_daily_deltas, apply_month_delta, is_month_locked
+from apps.meals.realtime import publish_month_change
+from apps.meals.serializers import MonthYearSerializer
 from .models import Expense, AuditLog
 from .serializers import ExpenseSerializer, ExpenseCreateSerializer, AuditLogSerializer
 
 
+def _ensure_unlocked(flat, *dates):
+    """Locked months are frozen – reject expense writes that would touch them."""
+    for d in dates:
+        if is_month_locked(flat, d.year, d.month):
+            raise PermissionDenied("Month is locked.")
+
+
 class ExpenseListCreateView(generics.ListCreateAPIView):
     """
     GET   /expenses/?year=2026&month=2   – list expenses
@@ -27,17 +43,31 @@ class ExpenseListCreateView(generics.ListCreateAPIView):
         return [permissions.IsAuthenticated(), flat_permission_required("view_expenses")()]
 
     def get_queryset(self):
-        qs = Expense.objects.filter(flat=self.request.flat).select_related("paid_by")
         year = self.request.query_params.get("year")
         month = self.request.query_params.get("month")
         if year and month:
-            qs = qs.filter(date__year=int(year), date__month=int(month))
-        return qs
+            params = MonthYearSerializer(data={"year": year, "month": month})
+            params.is_valid(raise_exception=True)
+            qs = Expense.objects.for_month(
+                self.request.flat, params.validated_data["year"], params.validated_data["month"]
+            )
+        else:
+            qs = Expense.objects.filter(flat=self.request.flat)
+        return qs.select_related("paid_by")
 
     def perform_create(self, serializer):
-        expense = serializer.save(flat=self.request.flat)
-        # Recalculate the affected month
-        recalculate_month(self.request.flat, expense.date.year, expense.date.month)
+        _ensure_unlocked(self.request.flat, serializer.validated_data["date"])
+        with transaction.atomic():
+            expense = serializer.save(flat=self.request.flat)
+            # Apply the new amount to the affected month
+            apply_month_delta(
+                self.request.flat, expense.date.year, expense.date.month,
+                paid_deltas={expense.paid_by_id: expense.amount},
+            )
+            apply_daily_deltas(
+                self.request.flat, paid_deltas={(expense.paid_by_id, expense.date): expense.amount}
+            )
+        publish_month_change(self.request.flat, expense.date.year, expense.date.month)
         # Audit
         AuditLog.objects.create(
             flat=self.request.flat,
@@ -75,8 +105,29 @@ class ExpenseDetailView(generics.RetrieveUpdateDestroyAPIView):
         return Expense.objects.filter(flat=self.request.flat).select_related("paid_by")
 
     def perform_update(self, serializer):
-        expense = serializer.save()
-        recalculate_month(self.request.flat, expense.date.year, expense.date.month)
+        with transaction.atomic():
+            # Deltas are taken from the row as locked here, so concurrent
+            # edits of the same expense cannot subtract the same old amount twice.
+            old = generics.get_object_or_404(
+                Expense.objects.select_for_update(), pk=serializer.instance.pk, flat=self.request.flat
+            )
+            old_date, old_amount, old_paid_by_id = old.date, old.amount, old.paid_by_id
+            _ensure_unlocked(self.request.flat, old_date, serializer.validated_data.get("date", old_date))
+            serializer.instance = old
+            expense = serializer.save()
+            # Take the old amount out and put the new one in – the expense may
+            # have moved to another payer and/or another month.
+            deltas = defaultdict(lambda: defaultdict(Decimal))
+            deltas[(old_date.year, old_date.month)][old_paid_by_id] -= old_amount
+            deltas[(expense.date.year, expense.date.month)][expense.paid_by_id] += expense.amount
+            for (year, month), paid_deltas in deltas.items():
+                apply_month_delta(self.request.flat, year, month, paid_deltas=paid_deltas)
+            day_deltas = defaultdict(Decimal)
+            day_deltas[(old_paid_by_id, old_date)] -= old_amount
+            day_deltas[(expense.paid_by_id, expense.date)] += expense.amount
+            apply_daily_deltas(self.request.flat, paid_deltas=day_deltas)
+        for year, month in deltas:
+            publish_month_change(self.request.flat, year, month)
         ActivityLog.log(
             user=self.request.user,
             flat=self.request.flat,
@@ -87,10 +138,25 @@ class ExpenseDetailView(generics.RetrieveUpdateDestroyAPIView):
         )
 
     def perform_destroy(self, instance):
-        year, month = instance.date.year, instance.date.month
-        expense_id = str(instance.id)
-        expense_amount = str(instance.amount)
-        expense_date = str(instance.date)
+        with transaction.atomic():
+            expense = Expense.objects.select_for_update().filter(pk=instance.pk).first()
+            if expense is None:
+                return  # deleted concurrently – its delta is already applied
+            _ensure_unlocked(self.request.flat, expense.date)
+            deleted, _ = Expense.objects.filter(pk=expense.pk).delete()
+            if not deleted:
+                return
+            year, month = expense.date.year, expense.date.month
+            apply_month_delta(
+                self.request.flat, year, month,
+                paid_deltas={expense.paid_by_id: -expense.amount},
+            )
+            apply_daily_deltas(
+                self.request.flat, paid_deltas={(expense.paid_by_id, expense.date): -expense.amount}
+            )
+        expense_id = str(expense.id)
+        expense_amount = str(expense.amount)
+        expense_date = str(expense.date)
         AuditLog.objects.create(
             flat=self.request.flat,
             user=self.request.user,
@@ -99,8 +165,7 @@ class ExpenseDetailView(generics.RetrieveUpdateDestroyAPIView):
             entity_id=expense_id,
             details={"amount": expense_amount, "date": expense_date},
         )
-        instance.delete()
-        recalculate_month(self.request.flat, year, month)
+        publish_month_change(self.request.flat, year, month)
         ActivityLog.log(
             user=self.request.user,
             flat=self.request.flat,
@@ -112,9 +177,25 @@ class ExpenseDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 
 class AuditLogListView(generics.ListAPIView):
-    """GET /expenses/audit/ – audit trail for the flat."""
+    """
+    GET /expenses/audit/?user_id=&action=&date_from=&date_to=&cursor=&page_size=
+    Audit trail for the flat, newest first, keyset-paginated.  Keeps the
+    page-number contract it replaced: count / next / previous / results
+    (next and previous are cursor URLs).
+    """
 
     serializer_class = AuditLogSerializer
+    pagination_class = KeysetPagination
+    include_count = True
 
     def get_queryset(self):
-        return AuditLog.objects.filter(flat=self.request.flat).select_related("user")[:200]
+        params = LogFilterSerializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        return (
+            AuditLog.objects.filter(flat=self.request.flat)
+            .filtered(**params.validated_data)
+            .values(
+                "id", "user_id", "action", "entity_type", "entity_id", "details", "created_at",
+                user_name=F("user__full_name"),
+            )
+        )
@@ -13,6 +13,12 @@ class FlatMembershipAdmin(admin.ModelAdmin):
     list_display = ("user", "flat", "role", "is_active")
     list_filter = ("role", "is_active")
 
+    def save_model(self, request, obj, form, change):
+        from apps.permissions.services import bump_permission_version
+
+        super().save_model(request, obj, form, change)
+        bump_permission_version(obj)  # cached context and flat-scoped tokens hold the role
+
 
 @admin.register(InviteToken)
 class InviteTokenAdmin(admin.ModelAdmin):
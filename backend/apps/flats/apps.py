@@ -5,3 +5,6 @@ class FlatsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.flats"
     verbose_name = "Flats"
+
+    def ready(self):
+        from . import checks  # noqa: F401
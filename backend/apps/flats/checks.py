@@ -0,0 +1,32 @@
+"""
+System checks for the flat context.
+"""
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+# Backends whose entries only the writing process can see
+_PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register(Tags.security)
+def check_flat_claims_cache(app_configs, **kwargs):
+    """
+    JWT_FLAT_CLAIMS trusts a token while its `ctx_ver` equals the user's
+    flat-context version in the cache; a process-local cache never sees
+    the bumps other processes make on removals and permission changes.
+    """
+    if not settings.JWT_FLAT_CLAIMS:
+        return []
+    if settings.CACHES["default"]["BACKEND"] not in _PROCESS_LOCAL_CACHES:
+        return []
+    return [
+        Error(
+            "JWT_FLAT_CLAIMS requires a cache shared by all processes (set REDIS_URL).",
+            hint="Membership removals and permission changes are revoked through "
+            "version keys in the default cache.",
+            id="flats.E001",
+        )
+    ]
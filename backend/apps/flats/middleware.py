@@ -3,10 +3,22 @@ Flat-context middleware – injects current flat into request
 based on X-Flat-ID header or user's active membership.
 
 Works with JWT authentication by parsing the token in the middleware
-since DRF auth runs after Django middleware.
+since DRF auth runs after Django middleware.  The resolved (user, token)
+is kept on the request for MiddlewareJWTAuthentication, and the
+membership lookup is cached per (user, X-Flat-ID).  With JWT_FLAT_CLAIMS
+on, a flat-scoped token whose version claim is still current supplies
+the membership itself.
 """
+import uuid
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
 from django.utils.deprecation import MiddlewareMixin
-from apps.flats.models import FlatMembership
+from apps.accounts.authentication import CachedUserJWTAuthentication
+from apps.flats.models import Flat, FlatMembership
+
+MEMBERSHIP_CACHE_TIMEOUT = 60 * 10
+_NO_MEMBERSHIP = "none"
 
 
 class FlatContextMiddleware(MiddlewareMixin):
@@ -16,25 +28,27 @@ class FlatContextMiddleware(MiddlewareMixin):
     Falls back to user's first active membership.
 
     Since DRF's JWT authentication runs AFTER Django middleware,
-    we manually parse the JWT token here to get the user.
+    we manually parse the JWT token here to get the user, and store the
+    result as `request.jwt_auth` so DRF does not repeat the work.
     """
 
     def process_request(self, request):
         request.flat = None
         request.membership = None
+        request.jwt_auth = None
 
         user = getattr(request, "user", None)
+        token = None
 
         # If user is not yet authenticated (JWT auth hasn't run yet),
         # try to parse the JWT token manually.
         if not user or not user.is_authenticated:
             try:
-                from rest_framework_simplejwt.authentication import JWTAuthentication
-                jwt_auth = JWTAuthentication()
-                result = jwt_auth.authenticate(request)
+                result = CachedUserJWTAuthentication().authenticate(request)
                 if result:
-                    user, _token = result
+                    user, token = result
                     request.user = user
+                    request.jwt_auth = result
             except Exception:
                 return
 
@@ -42,15 +56,86 @@ class FlatContextMiddleware(MiddlewareMixin):
             return
 
         flat_id = request.headers.get("X-Flat-ID")
-        qs = FlatMembership.objects.select_related("flat").filter(
-            user=user, is_active=True
-        )
-
-        if flat_id:
-            membership = qs.filter(flat_id=flat_id).first()
-        else:
-            membership = qs.first()
-
+        membership = None
+        if token is not None and settings.JWT_FLAT_CLAIMS:
+            membership = membership_from_claims(user, token, flat_id)
+            # A stale flat-scoped token stays scoped to its flat
+            flat_id = flat_id or token.get("flat")
+        if membership is None:
+            membership = get_active_membership(user, flat_id)
         if membership:
             request.flat = membership.flat
             request.membership = membership
+
+
+def get_active_membership(user, flat_id=None):
+    """
+    The user's active membership in `flat_id` (or their first one),
+    with its flat.  Cached under the user's membership version token, so
+    most requests skip the query; see bump_membership_version().
+    """
+    if flat_id:
+        try:
+            flat_id = uuid.UUID(flat_id)
+        except ValueError:
+            return None
+
+    key = f"flat-ctx:{user.pk}:{flat_id or '-'}:{membership_version(user.pk)}"
+    membership = cache.get(key)
+    if membership is None:
+        qs = FlatMembership.objects.select_related("flat").filter(user=user, is_active=True)
+        membership = (qs.filter(flat_id=flat_id) if flat_id else qs).first()
+        cache.set(key, membership or _NO_MEMBERSHIP, MEMBERSHIP_CACHE_TIMEOUT)
+    return None if membership == _NO_MEMBERSHIP else membership
+
+
+def membership_from_claims(user, token, flat_id=None):
+    """
+    The membership described by a flat-scoped token (see
+    apps.accounts.tokens.scope_token_to_flat), or None when the token is
+    not scoped to `flat_id` or its `ctx_ver` is no longer the user's
+    version (or that version is not in the cache) – the caller then
+    falls back to get_active_membership().
+    Costs one cache read; the flat and membership carry only their ids
+    and the claimed fields, anything else loads on access.
+    """
+    claimed_flat = token.get("flat")
+    if claimed_flat is None or (flat_id and flat_id != claimed_flat):
+        return None
+    # A missing version key (evicted, never set) is stale, never re-seeded
+    # here: only the database knows whether the claims still hold.
+    current = cache.get(f"flat-ctx-version:{user.pk}")
+    if current is None or token.get("ctx_ver") != current:
+        return None
+    flat = Flat.from_db(DEFAULT_DB_ALIAS, ["id"], [uuid.UUID(claimed_flat)])
+    membership = FlatMembership.from_db(
+        DEFAULT_DB_ALIAS,
+        ["id", "user_id", "flat_id", "role", "is_active", "permission_mask"],
+        [uuid.UUID(token["membership"]), user.pk, flat.pk, token["role"], True, token["perm_mask"]],
+    )
+    membership.flat = flat
+    membership.user = user
+    return membership
+
+
+def membership_version(user_id) -> str:
+    key = f"flat-ctx-version:{user_id}"
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_membership_version(*user_ids) -> None:
+    """
+    Drop the cached flat context of these users (after commit): on joins,
+    removals, permission / mask changes and flat edits.
+    """
+    def _bump():
+        cache.set_many(
+            {f"flat-ctx-version:{user_id}": uuid.uuid4().hex for user_id in user_ids},
+            timeout=None,
+        )
+
+    transaction.on_commit(_bump)
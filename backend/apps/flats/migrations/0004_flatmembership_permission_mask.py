@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:29
+
+from django.db import migrations, models
+
+
+def backfill_masks(apps, schema_editor):
+    FlatMembership = apps.get_model("flats", "FlatMembership")
+    MemberPermission = apps.get_model("permissions", "MemberPermission")
+    masks = {}
+    for membership_id, bit in MemberPermission.objects.values_list(
+        "membership_id", "permission__bit"
+    ):
+        masks[membership_id] = masks.get(membership_id, 0) | (1 << bit)
+    for membership in FlatMembership.objects.only("id"):
+        membership.permission_mask = masks.get(membership.id, 0)
+        membership.save(update_fields=["permission_mask"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('flats', '0003_add_granted_permissions_to_invite'),
+        ('permissions', '0002_apppermission_bit'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='flatmembership',
+            name='permission_mask',
+            field=models.BigIntegerField(blank=True, help_text='OR of 1 << AppPermission.bit over MemberPermission rows (null = not computed)', null=True),
+        ),
+        migrations.RunPython(backfill_masks, migrations.RunPython.noop),
+    ]
@@ -47,6 +47,11 @@ class FlatMembership(TimeStampedModel):
     flat = models.ForeignKey(Flat, on_delete=models.CASCADE, related_name="memberships")
     role = models.CharField(max_length=10, choices=Role.choices, default=Role.MEMBER)
     is_active = models.BooleanField(default=True)
+    permission_mask = models.BigIntegerField(
+        null=True,
+        blank=True,
+        help_text="OR of 1 << AppPermission.bit over MemberPermission rows (null = not computed)",
+    )
 
     class Meta:
         db_table = "flat_memberships"
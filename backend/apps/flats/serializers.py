@@ -104,6 +104,7 @@ class JoinFlatSerializer(serializers.Serializer):
 
     def create(self, validated_data):
         from apps.permissions.models import MemberPermission
+        from apps.permissions.services import bump_permission_version
 
         user = self.context["request"].user
         invite = self._invite
@@ -124,6 +125,7 @@ class JoinFlatSerializer(serializers.Serializer):
                 permission=perm,
                 defaults={"granted_by": invite.created_by},
             )
+        bump_permission_version(membership)
 
         invite.times_used += 1
         if invite.times_used >= invite.max_uses:
@@ -160,6 +162,7 @@ class RegisterAndJoinSerializer(serializers.Serializer):
 
     def create(self, validated_data):
         from apps.permissions.models import MemberPermission
+        from apps.permissions.services import bump_permission_version
 
         invite = self._invite
         full_name = validated_data.get("full_name") or validated_data["email"].split("@")[0]
@@ -184,6 +187,7 @@ class RegisterAndJoinSerializer(serializers.Serializer):
                 permission=perm,
                 defaults={"granted_by": invite.created_by},
             )
+        bump_permission_version(membership)
 
         invite.times_used += 1
         if invite.times_used >= invite.max_uses:
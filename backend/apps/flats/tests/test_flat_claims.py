@@ -0,0 +1,91 @@
+"""
+JWT_FLAT_CLAIMS: a flat-scoped token supplies the membership only while
+its `ctx_ver` is the user's current flat-context version.  Removals and
+permission changes bump that version; a missing version is stale.
+"""
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.core.tests.utils import api_client, make_flat
+from apps.flats import middleware
+from apps.permissions.services import set_permissions
+
+SWITCH = "/api/v1/auth/switch-flat/"
+EXPENSES = "/api/v1/expenses/"
+
+
+@override_settings(JWT_FLAT_CLAIMS=True)
+class FlatClaimsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.flat, (cls.owner, cls.member) = make_flat(members=2)
+        cls.other_flat, _ = make_flat(members=1)
+
+    def setUp(self):
+        cache.clear()
+        response = api_client(self.member.user, self.flat).post(SWITCH, {"flat": str(self.flat.id)}, format="json")
+        self.scoped = APIClient()
+        self.scoped.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['tokens']['access']}")
+
+    def claims_used(self):
+        """Spy on membership_from_claims: records whether it supplied the membership."""
+        results = []
+        real = middleware.membership_from_claims
+
+        def spy(*args, **kwargs):
+            membership = real(*args, **kwargs)
+            results.append(membership is not None)
+            return membership
+
+        return results, mock.patch.object(middleware, "membership_from_claims", spy)
+
+    def test_current_claims_supply_the_membership(self):
+        results, spy = self.claims_used()
+        with spy:
+            self.assertEqual(self.scoped.get(EXPENSES).status_code, 200)
+        self.assertEqual(results, [True])
+
+    def test_removed_member_is_rejected(self):
+        owner = api_client(self.owner.user, self.flat)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = owner.post(f"/api/v1/flats/members/{self.member.id}/remove/")
+        self.assertEqual(response.status_code, 200)
+        results, spy = self.claims_used()
+        with spy:
+            self.assertEqual(self.scoped.get(EXPENSES).status_code, 403)
+        self.assertEqual(results, [False])
+
+    def test_mask_change_falls_back_to_the_database(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            set_permissions(self.member, ["view_meals"])
+        results, spy = self.claims_used()
+        with spy:
+            self.assertEqual(self.scoped.get(EXPENSES).status_code, 403)  # view_expenses revoked
+            self.assertEqual(self.scoped.get("/api/v1/meals/summary/?year=2026&month=2").status_code, 200)
+        self.assertEqual(results, [False, False])
+
+    def test_header_for_another_flat_is_not_served_from_the_claims(self):
+        self.scoped.credentials(
+            HTTP_AUTHORIZATION=self.scoped._credentials["HTTP_AUTHORIZATION"],
+            HTTP_X_FLAT_ID=str(self.other_flat.id),
+        )
+        results, spy = self.claims_used()
+        with spy:
+            self.assertEqual(self.scoped.get(EXPENSES).status_code, 403)  # not a member there
+        self.assertEqual(results, [False])
+
+    def test_missing_version_key_is_stale_and_not_reseeded(self):
+        key = f"flat-ctx-version:{self.member.user_id}"
+        token = mock.Mock(get={"flat": str(self.flat.id), "ctx_ver": cache.get(key)}.get)
+        cache.delete(key)
+        self.assertIsNone(middleware.membership_from_claims(self.member.user, token))
+        self.assertIsNone(cache.get(key))
+
+        results, spy = self.claims_used()
+        with spy:
+            self.assertEqual(self.scoped.get(EXPENSES).status_code, 200)  # from the database
+        self.assertEqual(results, [False])
+        self.assertNotEqual(cache.get(key), token.get("ctx_ver"))
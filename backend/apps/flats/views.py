@@ -4,7 +4,8 @@ Flat views – CRUD, invite, join, member month status.
 from rest_framework import generics, status, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
+from apps.accounts.tokens import UserClaimsRefreshToken
+from .middleware import bump_membership_version
 from .models import Flat, FlatMembership, InviteToken, MemberMonthStatus
 from .serializers import (
     FlatSerializer,
@@ -16,7 +17,9 @@ from .serializers import (
     MemberMonthStatusSerializer,
 )
 from apps.permissions.guards import IsOwner, HasFlatPermission
+from apps.permissions.services import bump_permission_version
 from apps.core.models import ActivityLog
+from apps.meals.calculation_engine import bump_flat_versions, bump_month_version
 
 
 class FlatDetailView(generics.RetrieveUpdateAPIView):
@@ -25,7 +28,15 @@ class FlatDetailView(generics.RetrieveUpdateAPIView):
     serializer_class = FlatSerializer
 
     def get_object(self):
-        return self.request.flat
+        flat = self.request.flat
+        if flat is not None and flat.get_deferred_fields():  # from token claims (JWT_FLAT_CLAIMS)
+            flat = Flat.objects.get(pk=flat.pk)
+        return flat
+
+    def perform_update(self, serializer):
+        flat = serializer.save()
+        # request.flat is served from the cached flat context of every member
+        bump_membership_version(*flat.memberships.values_list("user_id", flat=True))
 
 
 class FlatMemberListView(generics.ListAPIView):
@@ -77,6 +88,8 @@ class JoinFlatView(APIView):
         serializer = JoinFlatSerializer(data=request.data, context={"request": request})
         serializer.is_valid(raise_exception=True)
         membership = serializer.save()
+        # Grid columns of open months change
+        bump_flat_versions(membership.flat)
         ActivityLog.log(
             user=request.user,
             flat=membership.flat,
@@ -117,6 +130,8 @@ class RemoveMemberView(APIView):
             )
         membership.is_active = False
         membership.save(update_fields=["is_active"])
+        bump_flat_versions(request.flat)
+        bump_permission_version(membership)
         ActivityLog.log(
             user=request.user,
             flat=request.flat,
@@ -197,6 +212,7 @@ class MemberMonthStatusUpdateView(APIView):
                 "note": request.data.get("note", ""),
             },
         )
+        bump_month_version(request.flat, int(year), int(month))
 
         ActivityLog.log(
             user=request.user,
@@ -243,6 +259,7 @@ class RegisterAndJoinView(APIView):
         result = serializer.save()
         user = result["user"]
         membership = result["membership"]
+        bump_flat_versions(membership.flat)
 
         ActivityLog.log(
             user=user,
@@ -254,7 +271,7 @@ class RegisterAndJoinView(APIView):
         )
 
         # Generate JWT tokens for auto-login
-        refresh = RefreshToken.for_user(user)
+        refresh = UserClaimsRefreshToken.for_user(user)
         return Response(
             {
                 "success": True,
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import MealEntry, MonthlySummary
+from .models import MealEntry, MonthlySummary, MemberMonthBalance
 
 
 @admin.register(MealEntry)
@@ -7,8 +7,25 @@ class MealEntryAdmin(admin.ModelAdmin):
     list_display = ("user", "flat", "date", "meal_count")
     list_filter = ("flat", "date")
 
+    # Read-only: cells are saved through the grid API, which applies their
+    # deltas to the month rollups and records sync tombstones.
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
 
 @admin.register(MonthlySummary)
 class MonthlySummaryAdmin(admin.ModelAdmin):
     list_display = ("flat", "year", "month", "total_meals", "total_expense", "meal_rate", "is_locked")
     list_filter = ("flat", "is_locked")
+
+
+@admin.register(MemberMonthBalance)
+class MemberMonthBalanceAdmin(admin.ModelAdmin):
+    list_display = ("user", "flat", "year", "month", "meals", "paid", "cost", "balance")
+    list_filter = ("flat", "year", "month")
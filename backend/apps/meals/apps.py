@@ -5,3 +5,6 @@ class MealsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.meals"
     verbose_name = "Meals"
+
+    def ready(self):
+        from . import signals  # noqa: F401
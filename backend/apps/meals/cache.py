@@ -0,0 +1,71 @@
+"""
+Versioned read-through cache for month read models (balances, grid
+members) on top of settings.CACHES.
+
+Keys embed the flat-month version (MonthlySummary.version), which every
+mutation bumps in the same transaction as the data it changes.  Writes
+therefore never delete or scan keys – the next read simply asks for a
+new key and entries of old versions expire unread.
+
+Hit / miss counters live in the cache too, so they add up across
+workers:  python manage.py month_cache_stats [--reset]
+"""
+from typing import Callable, Dict
+
+from django.core.cache import cache
+from django.db import connection
+
+from .models import MonthlySummary
+
+MONTH_CACHE_TIMEOUT = 60 * 60  # seconds; superseded versions age out
+_STATS_KEYS = {"hits": "month-cache:hits", "misses": "month-cache:misses"}
+_MISSING = object()
+
+
+def month_cache_key(kind: str, summary: MonthlySummary) -> str:
+    return f"month:{kind}:{summary.flat_id}:{summary.year}-{summary.month:02d}:v{summary.version}"
+
+
+def cached_month_read(kind: str, summary: MonthlySummary, build: Callable):
+    """
+    Return `build()` for this flat-month version, computing it at most
+    once per version.  Bypassed inside transactions: a rolled-back
+    version number is reused by the next commit and must never have
+    been cached.
+    """
+    if connection.in_atomic_block:
+        return build()
+    key = month_cache_key(kind, summary)
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        _count("hits")
+        return value
+    _count("misses")
+    value = build()
+    cache.set(key, value, MONTH_CACHE_TIMEOUT)
+    return value
+
+
+def _count(name: str) -> None:
+    key = _STATS_KEYS[name]
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+def cache_stats() -> Dict:
+    values = cache.get_many(list(_STATS_KEYS.values()))
+    hits = values.get(_STATS_KEYS["hits"], 0)
+    misses = values.get(_STATS_KEYS["misses"], 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / total, 4) if total else None,
+    }
+
+
+def reset_cache_stats() -> None:
+    cache.delete_many(list(_STATS_KEYS.values()))
@@ -16,127 +16,778 @@ Formulas:
         balance < 0  →  user must pay
 
 Optimisation:
-    - Only recalculates the AFFECTED month (via flat + year + month).
+    - Writes apply signed deltas to MonthlySummary with F() expressions
+      (O(1) per cell / expense save, no re-aggregation).
+    - Full re-aggregation (recalculate_month) only runs when a summary
+      row does not exist yet, on lock, or on demand via the
+      `recalculate_summaries` management command (periodic verification);
+      recalculate_year() (`repair_year` command) verifies / repairs a
+      whole year in bulk.
     - Uses aggregation queries – no Python-level loops over rows.
-    - Results are persisted in MonthlySummary (cache table).
+    - Results are persisted in MonthlySummary, MemberMonthBalance and
+      FlatDailyStats (cache tables), so reads never re-aggregate raw rows.
+    - Rendered balances / grid members are cached per summary version
+      (apps.meals.cache); writes invalidate by bumping the version.
 =================================================================
 """
+import calendar
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone as dt_timezone
 from decimal import Decimal
-from typing import Dict, List, Optional
+from functools import cached_property
+from typing import Dict, List, Optional, Tuple
 
-from django.db.models import Sum, F, Value, DecimalField
-from django.db.models.functions import Coalesce
+from django.db import IntegrityError, transaction
+from django.db.models import Sum, F, Q, Value, DecimalField
+from django.db.models.functions import Coalesce, ExtractMonth
 from django.utils import timezone
+from rest_framework.exceptions import PermissionDenied
 
-from apps.meals.models import MealEntry, MonthlySummary
+from apps.meals.cache import cached_month_read
+from apps.meals.models import (
+    FlatDailyStats, MealEntry, MealEntryTombstone, MonthlySummary, MemberMonthBalance,
+)
 from apps.expenses.models import Expense
 from apps.flats.models import Flat, FlatMembership
 
 
+class MonthLocked(PermissionDenied):
+    """A write reached a month that is locked (403, like the views' own check)."""
+
+    default_detail = "Month is locked."
+
+
 # -------------------------------------------------------------------
-#  Core recalculation  (called after every meal / expense mutation)
+#  Full recalculation  (fallback / verification path)
 # -------------------------------------------------------------------
 
+def compute_meal_rate(total_expense: Decimal, total_meals: Decimal) -> Decimal:
+    rate = (total_expense / total_meals) if total_meals > 0 else Decimal("0")
+    return rate.quantize(Decimal("0.01"))
+
+
+def aggregate_month(flat: Flat, year: int, month: int) -> Tuple[Dict, Dict]:
+    """
+    Re-aggregate a flat-month from raw rows.
+    Returns ({user_id: meals}, {user_id: paid}).
+    """
+    user_meals = dict(
+        MealEntry.objects.for_month(flat, year, month)
+        .values("user_id")
+        .annotate(total=Coalesce(Sum("meal_count"), Value(Decimal("0")), output_field=DecimalField()))
+        .values_list("user_id", "total")
+    )
+    user_paid = dict(
+        Expense.objects.for_month(flat, year, month)
+        .values("paid_by_id")
+        .annotate(total=Coalesce(Sum("amount"), Value(Decimal("0")), output_field=DecimalField()))
+        .values_list("paid_by_id", "total")
+    )
+    return user_meals, user_paid
+
+
+def _price_balance(row: MemberMonthBalance, meal_rate: Decimal) -> None:
+    row.cost = (row.meals * meal_rate).quantize(Decimal("0.01"))
+    row.balance = (row.paid - row.cost).quantize(Decimal("0.01"))
+
+
+def _month_rows(flat: Flat, year: int, month: int):
+    """Totals and unsaved MemberMonthBalance rows of a flat-month, from raw rows."""
+    user_meals, user_paid = aggregate_month(flat, year, month)
+    total_meals = sum(user_meals.values(), Decimal("0"))
+    total_expense = sum(user_paid.values(), Decimal("0"))
+    meal_rate = compute_meal_rate(total_expense, total_meals)
+
+    rows = []
+    for user_id in set(user_meals) | set(user_paid):
+        row = MemberMonthBalance(
+            flat=flat,
+            user_id=user_id,
+            year=year,
+            month=month,
+            meals=user_meals.get(user_id, Decimal("0")),
+            paid=user_paid.get(user_id, Decimal("0")),
+        )
+        _price_balance(row, meal_rate)
+        rows.append(row)
+    totals = {"total_meals": total_meals, "total_expense": total_expense, "meal_rate": meal_rate}
+    return totals, rows
+
+
 def recalculate_month(flat: Flat, year: int, month: int) -> MonthlySummary:
     """
-    Recalculate totals for a single flat-month.
-    Creates / updates the MonthlySummary row.
+    Recalculate totals for a single flat-month from scratch.
+    Creates / updates the MonthlySummary row and rebuilds the
+    month's MemberMonthBalance rows.
     Returns the updated summary.
+
+    The summary row is locked before the raw rows are aggregated, so a
+    concurrent apply_month_delta() either commits before the aggregate
+    sees it or adds its delta on top of the rebuilt totals afterwards.
+    """
+    with transaction.atomic():
+        summary = (
+            MonthlySummary.objects.select_for_update()
+            .filter(flat=flat, year=year, month=month)
+            .first()
+        )
+        if summary is None:
+            summary = _insert_month_summary(flat, year, month)
+            if summary is not None:
+                return summary
+            summary = MonthlySummary.objects.select_for_update().get(flat=flat, year=year, month=month)
+
+        totals, rows = _month_rows(flat, year, month)
+        for field, value in totals.items():
+            setattr(summary, field, value)
+        summary.version += 1
+        summary.save(update_fields=[*totals, "version", "updated_at"])
+        MemberMonthBalance.objects.filter(flat=flat, year=year, month=month).delete()
+        MemberMonthBalance.objects.bulk_create(rows)
+    return summary
+
+
+def _insert_month_summary(flat: Flat, year: int, month: int) -> Optional[MonthlySummary]:
+    """
+    Create a missing flat-month summary (and its balances) from raw rows.
+    Returns None if a concurrent writer inserted it first – that insert
+    was aggregated without this transaction's uncommitted rows, so it
+    must not be overwritten; the caller reads it / applies its delta.
     """
-    total_meals = (
-        MealEntry.objects.filter(flat=flat, date__year=year, date__month=month)
-        .aggregate(
-            total=Coalesce(Sum("meal_count"), Value(Decimal("0")), output_field=DecimalField())
-        )["total"]
+    totals, rows = _month_rows(flat, year, month)
+    try:
+        with transaction.atomic():
+            summary = MonthlySummary.objects.create(flat=flat, year=year, month=month, **totals)
+            MemberMonthBalance.objects.bulk_create(rows)
+    except IntegrityError:
+        return None
+    return summary
+
+
+def recalculate_year(flat: Flat, year: int) -> List[int]:
+    """
+    Verify a flat's whole year against raw rows in a fixed number of
+    queries and repair it in bulk: two grouped scans (meals, expenses)
+    bucketed by month and member; months whose summary is missing or
+    drifted get their summary upserted, version bumped and
+    MemberMonthBalance rows rebuilt.  Locked months are left untouched
+    (their snapshot is authoritative).  Returns the repaired months.
+    Repair tool (`repair_year` command), not a read path.
+
+    Summary rows are locked first, so a concurrent apply_month_delta()
+    either commits before the scans see it or adds its delta on top of
+    the repaired totals afterwards.
+    """
+    start, end = date(year, 1, 1), date(year + 1, 1, 1)
+    with transaction.atomic():
+        stored = {
+            s.month: s
+            for s in MonthlySummary.objects.select_for_update()
+            .defer("snapshot")
+            .filter(flat=flat, year=year)
+        }
+        meals = defaultdict(dict)  # month → {user_id: meals}
+        for month, user_id, total in (
+            MealEntry.objects.filter(flat=flat, date__gte=start, date__lt=end)
+            .annotate(month=ExtractMonth("date"))
+            .values("month", "user_id")
+            .annotate(total=Coalesce(Sum("meal_count"), Value(Decimal("0")), output_field=DecimalField()))
+            .values_list("month", "user_id", "total")
+        ):
+            meals[month][user_id] = total
+        paid = defaultdict(dict)  # month → {user_id: paid}
+        for month, user_id, total in (
+            Expense.objects.filter(flat=flat, date__gte=start, date__lt=end)
+            .annotate(month=ExtractMonth("date"))
+            .values("month", "paid_by_id")
+            .annotate(total=Coalesce(Sum("amount"), Value(Decimal("0")), output_field=DecimalField()))
+            .values_list("month", "paid_by_id", "total")
+        ):
+            paid[month][user_id] = total
+
+        now = timezone.now()
+        to_create, to_update, balances = [], [], []
+        for month in sorted(set(meals) | set(paid) | set(stored)):
+            summary = stored.get(month)
+            if summary is not None and summary.is_locked:
+                continue
+            user_meals, user_paid = meals.get(month, {}), paid.get(month, {})
+            total_meals = sum(user_meals.values(), Decimal("0"))
+            total_expense = sum(user_paid.values(), Decimal("0"))
+            meal_rate = compute_meal_rate(total_expense, total_meals)
+            if summary is None:
+                summary = stored[month] = MonthlySummary(flat=flat, year=year, month=month)
+                to_create.append(summary)
+            elif (summary.total_meals, summary.total_expense, summary.meal_rate) == (
+                total_meals, total_expense, meal_rate
+            ):
+                continue
+            else:
+                summary.version += 1
+                summary.updated_at = now
+                to_update.append(summary)
+            summary.total_meals, summary.total_expense = total_meals, total_expense
+            summary.meal_rate = meal_rate
+            for user_id in set(user_meals) | set(user_paid):
+                row = MemberMonthBalance(
+                    flat=flat, user_id=user_id, year=year, month=month,
+                    meals=user_meals.get(user_id, Decimal("0")),
+                    paid=user_paid.get(user_id, Decimal("0")),
+                )
+                _price_balance(row, meal_rate)
+                balances.append(row)
+
+        repaired = [s.month for s in to_create + to_update]
+        if repaired:
+            MonthlySummary.objects.bulk_create(to_create)
+            MonthlySummary.objects.bulk_update(
+                to_update, ["total_meals", "total_expense", "meal_rate", "version", "updated_at"]
+            )
+            MemberMonthBalance.objects.filter(flat=flat, year=year, month__in=repaired).delete()
+            MemberMonthBalance.objects.bulk_create(balances)
+    return sorted(repaired)
+
+
+def get_or_build_summary(flat: Flat, year: int, month: int) -> MonthlySummary:
+    """Return the stored summary, building it once if it does not exist yet."""
+    summary = MonthlySummary.objects.filter(flat=flat, year=year, month=month).first()
+    if summary is None:
+        summary = _insert_month_summary(flat, year, month) or MonthlySummary.objects.get(
+            flat=flat, year=year, month=month
+        )
+    return summary
+
+
+# -------------------------------------------------------------------
+#  Versioning  (ETag / cache invalidation)
+# -------------------------------------------------------------------
+
+def month_version(flat: Flat, year: int, month: int) -> Optional[int]:
+    """Current version of a flat-month, or None if it has no summary yet."""
+    return (
+        MonthlySummary.objects.filter(flat=flat, year=year, month=month)
+        .values_list("version", flat=True)
+        .first()
     )
 
-    total_expense = (
-        Expense.objects.filter(flat=flat, date__year=year, date__month=month)
-        .aggregate(
-            total=Coalesce(Sum("amount"), Value(Decimal("0")), output_field=DecimalField())
-        )["total"]
+
+def bump_month_version(flat: Flat, year: int, month: int) -> None:
+    """Mark a flat-month as changed without touching its totals."""
+    MonthlySummary.objects.filter(flat=flat, year=year, month=month).update(
+        version=F("version") + 1, updated_at=timezone.now()
     )
 
-    meal_rate = (total_expense / total_meals) if total_meals > 0 else Decimal("0")
-
-    summary, _ = MonthlySummary.objects.update_or_create(
-        flat=flat,
-        year=year,
-        month=month,
-        defaults={
-            "total_meals": total_meals,
-            "total_expense": total_expense,
-            "meal_rate": meal_rate.quantize(Decimal("0.01")),
-        },
+
+def bump_flat_versions(flat: Flat) -> None:
+    """Mark every open month of a flat as changed (e.g. membership changes)."""
+    MonthlySummary.objects.filter(flat=flat, is_locked=False).update(
+        version=F("version") + 1, updated_at=timezone.now()
     )
-    return summary
 
 
 # -------------------------------------------------------------------
-#  Per-user breakdown for a month
+#  Delta sync  (GET /meals/grid/changes/)
 # -------------------------------------------------------------------
 
-def get_user_balances(flat: Flat, year: int, month: int) -> List[Dict]:
+# Rows whose transaction committed after a poll but stamped updated_at
+# before it would otherwise be missed; re-send this much history.
+SYNC_CURSOR_OVERLAP = timedelta(seconds=5)
+# Tombstones older than this are pruned; older cursors get a full reset.
+SYNC_TOMBSTONE_RETENTION = timedelta(days=7)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def encode_sync_cursor(version: int, at: datetime) -> str:
+    """Opaque cursor: '<month version>.<microseconds since epoch>'."""
+    return f"{version}.{(at - _EPOCH) // timedelta(microseconds=1)}"
+
+
+def decode_sync_cursor(cursor: str) -> Tuple[int, datetime]:
+    """Inverse of encode_sync_cursor. Raises ValueError on garbage."""
+    version, _, micros = cursor.partition(".")
+    return int(version), _EPOCH + timedelta(microseconds=int(micros))
+
+
+def get_month_changes(flat: Flat, year: int, month: int, since: Optional[str] = None) -> Dict:
     """
-    Returns a list of dicts – one per flat member:
-    {
-        "user_id": uuid,
-        "full_name": str,
-        "total_meals": Decimal,
-        "total_paid": Decimal,
-        "individual_cost": Decimal,
-        "balance": Decimal,      # positive = receives, negative = owes
+    Grid changes of a flat-month since a cursor.
+
+    - Unchanged month version → {"changed": False}, one summary read.
+    - Otherwise the MealEntry rows updated since the cursor, the cells
+      deleted since then (`deleted`: apply before `entries`), the fresh
+      summary / balances / members and a new cursor.
+    - No cursor, or one older than the tombstone retention → every entry
+      of the month with `reset: True` (client replaces its grid).
+    """
+    from apps.meals.serializers import MealEntrySerializer
+
+    now = timezone.now()
+    summary = get_or_build_summary(flat, year, month)
+    cursor = encode_sync_cursor(summary.version, now)
+
+    since_version, since_at = decode_sync_cursor(since) if since else (None, None)
+    if since_version == summary.version:
+        return {"changed": False, "summary": _summary_data(summary), "cursor": since}
+
+    reset = since_at is None or now - since_at > SYNC_TOMBSTONE_RETENTION
+    entries = MealEntry.objects.for_month(flat, year, month).select_related("user")
+    deleted = []
+    if not reset:
+        cutoff = since_at - SYNC_CURSOR_OVERLAP
+        entries = entries.filter(updated_at__gt=cutoff)
+        deleted = [
+            {"user_id": str(user_id), "date": str(day)}
+            for user_id, day in MealEntryTombstone.objects.for_month(flat, year, month)
+            .filter(created_at__gt=cutoff)
+            .values_list("user_id", "date")
+        ]
+
+    snapshot = MonthSnapshot(flat, year, month, summary=summary)
+    return {
+        "changed": True,
+        "reset": reset,
+        "entries": MealEntrySerializer(entries.order_by("date"), many=True).data,
+        "deleted": deleted,
+        "summary": snapshot.summary_data(),
+        "balances": snapshot.balances(),
+        "members": snapshot.member_data(),
+        "cursor": cursor,
     }
+
+
+def prune_tombstones() -> int:
+    """Drop tombstones past the sync retention window. Returns the count."""
+    cutoff = timezone.now() - SYNC_TOMBSTONE_RETENTION
+    deleted, _ = MealEntryTombstone.objects.filter(created_at__lt=cutoff).delete()
+    return deleted
+
+
+# -------------------------------------------------------------------
+#  Incremental maintenance  (called after every meal / expense mutation)
+# -------------------------------------------------------------------
+
+def apply_month_delta(
+    flat: Flat,
+    year: int,
+    month: int,
+    meal_deltas: Optional[Dict] = None,
+    paid_deltas: Optional[Dict] = None,
+) -> MonthlySummary:
     """
-    summary = recalculate_month(flat, year, month)
-    meal_rate = summary.meal_rate
+    Apply signed per-user deltas (new − old) to a flat-month:
+        meal_deltas = {user_id: Δmeals},  paid_deltas = {user_id: Δpaid}
+
+    Call it inside the transaction that wrote the meal / expense row:
+    the summary row is locked first, so concurrent writers
+    are serialised and meal_rate is always derived from committed totals.
+    The month's MemberMonthBalance rows are then updated and re-priced
+    under that same lock (one read + at most two bulk writes).
+    If the summary row does not exist yet, it is inserted from raw rows
+    (which already include the caller's write); if a concurrent writer
+    inserts it first, the delta is applied on top of that row instead.
+    Raises MonthLocked if the month is locked by the time the row lock
+    is held, so the caller's transaction (and its raw write) rolls back.
+    """
+    meal_deltas = {u: d for u, d in (meal_deltas or {}).items() if d}
+    paid_deltas = {u: d for u, d in (paid_deltas or {}).items() if d}
+    if not meal_deltas and not paid_deltas:
+        return get_or_build_summary(flat, year, month)
+
+    with transaction.atomic():
+        summary = (
+            MonthlySummary.objects.select_for_update()
+            .defer("snapshot")
+            .filter(flat=flat, year=year, month=month)
+            .first()
+        )
+        if summary is None:
+            inserted = _insert_month_summary(flat, year, month)
+            if inserted is not None:
+                return inserted
+            summary = (
+                MonthlySummary.objects.select_for_update()
+                .defer("snapshot")
+                .get(flat=flat, year=year, month=month)
+            )
+        # The caller's lock check ran before this transaction; lock_month()
+        # may have committed since.
+        if summary.is_locked:
+            raise MonthLocked()
+
+        meals_delta = sum(meal_deltas.values(), Decimal("0"))
+        paid_delta = sum(paid_deltas.values(), Decimal("0"))
+        summary.total_meals += meals_delta
+        summary.total_expense += paid_delta
+        summary.meal_rate = compute_meal_rate(summary.total_expense, summary.total_meals)
+        summary.version += 1
+        summary.updated_at = timezone.now()
+        if not MonthlySummary.objects.filter(pk=summary.pk, is_locked=False).update(
+            total_meals=F("total_meals") + meals_delta,
+            total_expense=F("total_expense") + paid_delta,
+            meal_rate=summary.meal_rate,
+            version=F("version") + 1,
+            updated_at=summary.updated_at,
+        ):
+            raise MonthLocked()
+
+        _update_member_balances(flat, year, month, summary.meal_rate, meal_deltas, paid_deltas)
+    return summary
 
-    members = get_grid_members(flat, year, month)
 
-    # Aggregate meals per user
-    user_meals = dict(
-        MealEntry.objects.filter(flat=flat, date__year=year, date__month=month)
-        .values("user_id")
-        .annotate(total=Coalesce(Sum("meal_count"), Value(Decimal("0")), output_field=DecimalField()))
-        .values_list("user_id", "total")
+def _update_member_balances(flat, year, month, meal_rate, meal_deltas, paid_deltas) -> None:
+    rows = {
+        b.user_id: b
+        for b in MemberMonthBalance.objects.filter(flat=flat, year=year, month=month)
+    }
+    touched = set(meal_deltas) | set(paid_deltas)
+    to_create = []
+    for user_id in touched:
+        row = rows.get(user_id)
+        if row is None:
+            row = rows[user_id] = MemberMonthBalance(
+                flat=flat, user_id=user_id, year=year, month=month
+            )
+            to_create.append(row)
+        row.meals += meal_deltas.get(user_id, Decimal("0"))
+        row.paid += paid_deltas.get(user_id, Decimal("0"))
+
+    # meal_rate moves with almost every write, so every member is re-priced
+    now = timezone.now()
+    to_update = []
+    for row in rows.values():
+        before = (row.cost, row.balance)
+        _price_balance(row, meal_rate)
+        if row._state.adding:
+            continue
+        if row.user_id in touched or (row.cost, row.balance) != before:
+            row.updated_at = now
+            to_update.append(row)
+
+    MemberMonthBalance.objects.bulk_create(to_create)
+    MemberMonthBalance.objects.bulk_update(
+        to_update, ["meals", "paid", "cost", "balance", "updated_at"]
     )
 
-    # Aggregate amount paid per user
-    user_paid = dict(
-        Expense.objects.filter(flat=flat, date__year=year, date__month=month)
-        .values("paid_by_id")
+
+# -------------------------------------------------------------------
+#  Daily stats  (analytics rollup)
+# -------------------------------------------------------------------
+
+def apply_daily_deltas(
+    flat: Flat,
+    meal_deltas: Optional[Dict] = None,
+    paid_deltas: Optional[Dict] = None,
+) -> None:
+    """
+    Apply signed per-member, per-day deltas to FlatDailyStats:
+        meal_deltas = {(user_id, date): Δmeals},  paid_deltas = {(user_id, date): Δpaid}
+
+    Call it in the same transaction, after apply_month_delta() for the
+    affected months: the summary row locks taken there serialise
+    concurrent writers of these days.
+    """
+    meal_deltas = {k: d for k, d in (meal_deltas or {}).items() if d}
+    paid_deltas = {k: d for k, d in (paid_deltas or {}).items() if d}
+    touched = set(meal_deltas) | set(paid_deltas)
+    if not touched:
+        return
+
+    rows = {
+        (row.user_id, row.date): row
+        for row in FlatDailyStats.objects.filter(
+            flat=flat,
+            user_id__in={user_id for user_id, _ in touched},
+            date__in={day for _, day in touched},
+        )
+    }
+    now = timezone.now()
+    to_create, to_update = [], []
+    for key in touched:
+        row = rows.get(key)
+        if row is None:
+            row = FlatDailyStats(flat=flat, user_id=key[0], date=key[1])
+            to_create.append(row)
+        else:
+            row.updated_at = now
+            to_update.append(row)
+        row.meals += meal_deltas.get(key, Decimal("0"))
+        row.paid += paid_deltas.get(key, Decimal("0"))
+
+    FlatDailyStats.objects.bulk_create(to_create)
+    FlatDailyStats.objects.bulk_update(to_update, ["meals", "paid", "updated_at"])
+
+
+def rebuild_daily_stats(flat: Flat, year: int, month: int) -> int:
+    """Rebuild a flat-month's FlatDailyStats from raw rows; returns the row count."""
+    totals = defaultdict(lambda: [Decimal("0"), Decimal("0")])
+    for user_id, day, meals in (
+        MealEntry.objects.for_month(flat, year, month)
+        .values("user_id", "date")
+        .annotate(total=Coalesce(Sum("meal_count"), Value(Decimal("0")), output_field=DecimalField()))
+        .values_list("user_id", "date", "total")
+    ):
+        totals[(user_id, day)][0] = meals
+    for user_id, day, paid in (
+        Expense.objects.for_month(flat, year, month)
+        .values("paid_by_id", "date")
         .annotate(total=Coalesce(Sum("amount"), Value(Decimal("0")), output_field=DecimalField()))
-        .values_list("paid_by_id", "total")
-    )
+        .values_list("paid_by_id", "date", "total")
+    ):
+        totals[(user_id, day)][1] = paid
+
+    with transaction.atomic():
+        FlatDailyStats.objects.for_month(flat, year, month).delete()
+        FlatDailyStats.objects.bulk_create(
+            [
+                FlatDailyStats(flat=flat, user_id=user_id, date=day, meals=meals, paid=paid)
+                for (user_id, day), (meals, paid) in totals.items()
+            ]
+        )
+    return len(totals)
+
+
+# -------------------------------------------------------------------
+#  Fused month snapshot  (grid / summary / cell responses)
+# -------------------------------------------------------------------
+
+class MonthSnapshot:
+    """
+    Everything a month view needs, loaded in a fixed number of queries
+    regardless of how many members or days the month has:
 
-    results = []
-    for m in members:
-        meals = user_meals.get(m.user_id, Decimal("0"))
-        paid = user_paid.get(m.user_id, Decimal("0"))
-        cost = (meals * meal_rate).quantize(Decimal("0.01"))
-        balance = (paid - cost).quantize(Decimal("0.01"))
-        results.append(
-            {
-                "user_id": str(m.user_id),
-                "full_name": m.user.full_name,
-                "total_meals": meals,
-                "total_paid": paid,
-                "individual_cost": cost,
-                "balance": balance,
-            }
+        1. MonthlySummary row          (skipped when `summary` is passed in)
+        2. MemberMonthBalance rows     (one indexed range scan)
+        3. grid members                (active + inactive with data)
+        4. meal entries                (only when with_entries=True)
+
+    2 and 3 are loaded lazily, and balances / members are served from the
+    versioned month cache (apps.meals.cache), so they only hit the
+    database once per summary version.
+    """
+
+    def __init__(
+        self,
+        flat: Flat,
+        year: int,
+        month: int,
+        with_entries: bool = False,
+        summary: Optional[MonthlySummary] = None,
+    ):
+        self.flat = flat
+        self.year = year
+        self.month = month
+        self.summary = summary or get_or_build_summary(flat, year, month)
+        self.entries: Optional[List[MealEntry]] = None
+        if with_entries:
+            self.entries = list(
+                MealEntry.objects.for_month(flat, year, month)
+                .select_related("user")
+                .order_by("date", "user__full_name")
+            )
+
+    @cached_property
+    def member_balances(self) -> Dict[object, MemberMonthBalance]:
+        return {
+            b.user_id: b
+            for b in MemberMonthBalance.objects.filter(flat=self.flat, year=self.year, month=self.month)
+        }
+
+    @cached_property
+    def members(self) -> List[FlatMembership]:
+        return _load_grid_members(self.flat, set(self.member_balances))
+
+    def member_data(self) -> List[Dict]:
+        """Grid members as serialized by FlatMembershipSerializer (cached)."""
+        from apps.flats.serializers import FlatMembershipSerializer
+
+        return cached_month_read(
+            "members", self.summary,
+            lambda: list(FlatMembershipSerializer(self.members, many=True).data),
+        )
+
+    @classmethod
+    def load(cls, flat: Flat, year: int, month: int, with_entries: bool = False):
+        """
+        Snapshot for a read endpoint: locked months are served from their
+        frozen payload (zero aggregation, zero writes), others are live.
+        """
+        summary = get_or_build_summary(flat, year, month)
+        if summary.is_locked and summary.snapshot is not None:
+            return FrozenMonthSnapshot(summary)
+        return cls(flat, year, month, with_entries=with_entries, summary=summary)
+
+    def matrix_payload(self) -> Dict:
+        """Grid response body in the dense matrix layout (see _build_matrix)."""
+        members = _matrix_members(self.member_data())
+        cells = MealEntry.objects.for_month(self.flat, self.year, self.month).values_list(
+            "user_id", "date", "meal_count"
         )
-    return results
+        return {
+            **_build_matrix(self.year, self.month, members, cells),
+            "summary": self.summary_data(),
+            "balances": self.balances(),
+        }
+
+    def grid_payload(self) -> Dict:
+        """Grid response body: entries, summary, balances and members."""
+        from apps.meals.serializers import MealEntrySerializer
+
+        return {
+            "entries": MealEntrySerializer(self.entries, many=True).data,
+            "summary": self.summary_data(),
+            "balances": self.balances(),
+            "members": self.member_data(),
+        }
+
+    def summary_data(self) -> Dict:
+        return _summary_data(self.summary)
+
+    def balances(self) -> List[Dict]:
+        """
+        Returns a list of dicts – one per grid member:
+        {
+            "user_id": uuid,
+            "full_name": str,
+            "total_meals": Decimal,
+            "total_paid": Decimal,
+            "individual_cost": Decimal,
+            "balance": Decimal,      # positive = receives, negative = owes
+        }
+        """
+        return cached_month_read("balances", self.summary, self._build_balances)
+
+    def _build_balances(self) -> List[Dict]:
+        zero = Decimal("0")
+        empty = MemberMonthBalance(meals=zero, paid=zero, cost=zero, balance=zero)
+        results = []
+        for m in self.members:
+            row = self.member_balances.get(m.user_id, empty)
+            results.append(
+                {
+                    "user_id": str(m.user_id),
+                    "full_name": m.user.full_name,
+                    "total_meals": row.meals,
+                    "total_paid": row.paid,
+                    "individual_cost": row.cost,
+                    "balance": row.balance,
+                }
+            )
+        return results
+
+
+def _matrix_members(member_data: List[Dict]) -> List[Dict]:
+    """Matrix column headers from serialized grid members."""
+    return [
+        {
+            "membership_id": str(m["id"]),
+            "user_id": str(m["user"]["id"]),
+            "full_name": m["user"]["full_name"],
+            "role": m["role"],
+            "is_active": m["is_active"],
+        }
+        for m in member_data
+    ]
+
+
+def _build_matrix(year: int, month: int, members: List[Dict], cells) -> Dict:
+    """
+    Dense grid layout: a member axis, a day axis and one flat array of
+    meal counts, row-major by day –  meal_counts[(day - 1) * len(members) + i]
+    is member i's count on that day, or None for an empty cell.
+    `cells` yields (user_id, date, meal_count) tuples.
+    """
+    days = calendar.monthrange(year, month)[1]
+    column = {str(m["user_id"]): i for i, m in enumerate(members)}
+    counts: List[Optional[float]] = [None] * (days * len(members))
+    for user_id, day, meal_count in cells:
+        i = column.get(str(user_id))
+        if i is not None:
+            counts[(day.day - 1) * len(members) + i] = float(meal_count)
+    return {
+        "members": members,
+        "days": [date(year, month, d).isoformat() for d in range(1, days + 1)],
+        "meal_counts": counts,
+    }
+
+
+class FrozenMonthSnapshot:
+    """
+    Read-only MonthSnapshot over the payload frozen on a locked month.
+    Rendered output is identical to the live snapshot it was built from.
+    """
+
+    def __init__(self, summary: MonthlySummary):
+        self.summary = summary
+        self._payload = summary.snapshot
+
+    def summary_data(self) -> Dict:
+        return self._payload["summary"]
+
+    def balances(self) -> List[Dict]:
+        return self._payload["balances"]
+
+    def grid_payload(self) -> Dict:
+        return self._payload
+
+    def matrix_payload(self) -> Dict:
+        members = _matrix_members(self._payload["members"])
+        cells = (
+            (e["user"], date.fromisoformat(e["date"]), e["meal_count"])
+            for e in self._payload["entries"]
+        )
+        return {
+            **_build_matrix(self.summary.year, self.summary.month, members, cells),
+            "summary": self.summary_data(),
+            "balances": self.balances(),
+        }
+
+
+def _freeze(payload: Dict) -> Dict:
+    """Round-trip through the API's JSON encoder so stored == rendered."""
+    import json
+    from rest_framework.utils.encoders import JSONEncoder
+
+    return json.loads(json.dumps(payload, cls=JSONEncoder))
+
+
+# -------------------------------------------------------------------
+#  Per-user breakdown for a month
+# -------------------------------------------------------------------
+
+def get_user_balances(flat: Flat, year: int, month: int) -> List[Dict]:
+    """Per-member meals / paid / cost / balance – see MonthSnapshot.balances."""
+    return MonthSnapshot(flat, year, month).balances()
+
+
+def get_member_history(flat: Flat, user_id, limit: int = 12) -> List[Dict]:
+    """A member's monthly balances across months, newest first."""
+    rows = (
+        MemberMonthBalance.objects.filter(flat=flat, user_id=user_id)
+        .order_by("-year", "-month")
+        .values("year", "month", "meals", "paid", "cost", "balance")[:limit]
+    )
+    return [
+        {
+            "year": r["year"],
+            "month": r["month"],
+            "total_meals": r["meals"],
+            "total_paid": r["paid"],
+            "individual_cost": r["cost"],
+            "balance": r["balance"],
+        }
+        for r in rows
+    ]
 
 
 # -------------------------------------------------------------------
 #  Quick summary for dashboard header
 # -------------------------------------------------------------------
 
-def get_month_summary(flat: Flat, year: int, month: int) -> Dict:
-    summary = recalculate_month(flat, year, month)
+def _summary_data(summary: MonthlySummary) -> Dict:
     return {
-        "year": year,
-        "month": month,
+        "year": summary.year,
+        "month": summary.month,
         "total_meals": summary.total_meals,
         "total_expense": summary.total_expense,
         "meal_rate": summary.meal_rate,
@@ -144,16 +795,35 @@ def get_month_summary(flat: Flat, year: int, month: int) -> Dict:
     }
 
 
+def get_month_summary(flat: Flat, year: int, month: int) -> Dict:
+    return _summary_data(get_or_build_summary(flat, year, month))
+
+
 # -------------------------------------------------------------------
 #  Lock / Unlock month
 # -------------------------------------------------------------------
 
 def lock_month(flat: Flat, year: int, month: int, user) -> MonthlySummary:
-    summary = recalculate_month(flat, year, month)
-    summary.is_locked = True
-    summary.locked_by = user
-    summary.locked_at = timezone.now()
-    summary.save(update_fields=["is_locked", "locked_by", "locked_at", "updated_at"])
+    """
+    Lock a month and freeze its full grid (entries, summary, balances,
+    members) into `summary.snapshot`; later reads are served from it.
+    recalculate_month() takes the summary row lock before aggregating and
+    it is held until the flag and snapshot commit: writers that got the
+    row first are in the snapshot, writers blocked on it then find the
+    month locked (MonthLocked) and roll back.
+    """
+    with transaction.atomic():
+        summary = recalculate_month(flat, year, month)
+        summary.is_locked = True
+        summary.locked_by = user
+        summary.locked_at = timezone.now()
+        snapshot = MonthSnapshot(flat, year, month, with_entries=True, summary=summary)
+        summary.snapshot = _freeze(snapshot.grid_payload())
+        summary.version = F("version") + 1
+        summary.save(
+            update_fields=["is_locked", "locked_by", "locked_at", "snapshot", "version", "updated_at"]
+        )
+        summary.refresh_from_db(fields=["version"])
     return summary
 
 
@@ -164,51 +834,40 @@ def unlock_month(flat: Flat, year: int, month: int) -> MonthlySummary:
     summary.is_locked = False
     summary.locked_by = None
     summary.locked_at = None
-    summary.save(update_fields=["is_locked", "locked_by", "locked_at", "updated_at"])
+    summary.snapshot = None
+    summary.version = F("version") + 1
+    summary.save(
+        update_fields=["is_locked", "locked_by", "locked_at", "snapshot", "version", "updated_at"]
+    )
+    summary.refresh_from_db(fields=["version"])
     return summary
 
 
-def get_grid_members(flat: Flat, year: int, month: int):
+def _load_grid_members(flat: Flat, users_with_data) -> List[FlatMembership]:
     """
-    Return memberships to display as columns for the given month.
-    Includes all active members PLUS any inactive members who have
-    meal entries or expenses in that month.
+    All active members PLUS any inactive members in `users_with_data`,
+    fetched in a single query.
     """
-    active = FlatMembership.objects.filter(
-        flat=flat, is_active=True
-    ).select_related("user")
-
-    # User IDs that have meal entries this month
-    users_with_meals = set(
-        MealEntry.objects.filter(
-            flat=flat, date__year=year, date__month=month
-        ).values_list("user_id", flat=True)
-    )
-    # User IDs that have expenses this month
-    users_with_expenses = set(
-        Expense.objects.filter(
-            flat=flat, date__year=year, date__month=month
-        ).values_list("paid_by_id", flat=True)
+    members = list(
+        FlatMembership.objects.filter(flat=flat)
+        .filter(Q(is_active=True) | Q(user_id__in=users_with_data))
+        .select_related("user")
     )
-    users_with_data = users_with_meals | users_with_expenses
+    if any(not m.is_active for m in members):
+        members.sort(key=lambda m: m.user.full_name)
+    return members
 
-    active_user_ids = set(active.values_list("user_id", flat=True))
-    inactive_with_data_ids = users_with_data - active_user_ids
 
-    if not inactive_with_data_ids:
-        return active
-
-    inactive_with_data = FlatMembership.objects.filter(
-        flat=flat, user_id__in=inactive_with_data_ids
-    ).select_related("user")
-
-    # Combine querysets
-    combined_ids = [m.id for m in active] + [m.id for m in inactive_with_data]
-    return FlatMembership.objects.filter(id__in=combined_ids).select_related("user").order_by("user__full_name")
+def get_grid_members(flat: Flat, year: int, month: int) -> List[FlatMembership]:
+    """
+    Return memberships to display as columns for the given month.
+    Includes all active members PLUS any inactive members who have
+    meal entries or expenses in that month.
+    """
+    return MonthSnapshot(flat, year, month).members
 
 
 def is_month_locked(flat: Flat, year: int, month: int) -> bool:
-    try:
-        return MonthlySummary.objects.get(flat=flat, year=year, month=month).is_locked
-    except MonthlySummary.DoesNotExist:
-        return False
+    return MonthlySummary.objects.filter(
+        flat=flat, year=year, month=month, is_locked=True
+    ).exists()
@@ -0,0 +1,23 @@
+"""
+Management command to report the month read-model cache hit rate
+(see apps/meals/cache.py).  Counters are shared by all workers.
+
+Run: python manage.py month_cache_stats [--reset]
+"""
+from django.core.management.base import BaseCommand
+from apps.meals.cache import cache_stats, reset_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Show (and optionally reset) month cache hit / miss counters."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Zero the counters afterwards.")
+
+    def handle(self, *args, **options):
+        stats = cache_stats()
+        rate = "n/a" if stats["hit_rate"] is None else f"{stats['hit_rate']:.1%}"
+        self.stdout.write(f"hits: {stats['hits']}  misses: {stats['misses']}  hit rate: {rate}")
+        if options["reset"]:
+            reset_cache_stats()
+            self.stdout.write(self.style.SUCCESS("Counters reset."))
@@ -0,0 +1,38 @@
+"""
+Management command to rebuild the FlatDailyStats analytics rollup from
+raw meal entries and expenses.  The rollup is maintained incrementally
+on every write; run this to backfill or to repair drift.
+
+Run: python manage.py rebuild_daily_stats [--flat <uuid>] [--year 2026 [--month 2]]
+"""
+from django.core.management.base import BaseCommand, CommandError
+from apps.meals.models import MonthlySummary
+from apps.meals.calculation_engine import rebuild_daily_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild per-member daily meal / payment totals used by analytics."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--flat", help="Only this flat (UUID).")
+        parser.add_argument("--year", type=int)
+        parser.add_argument("--month", type=int)
+
+    def handle(self, *args, **options):
+        if options["month"] and not options["year"]:
+            raise CommandError("--month requires --year")
+
+        # Every month that has ever been written has a summary row
+        qs = MonthlySummary.objects.select_related("flat").order_by("flat_id", "year", "month")
+        if options["flat"]:
+            qs = qs.filter(flat_id=options["flat"])
+        if options["year"]:
+            qs = qs.filter(year=options["year"])
+        if options["month"]:
+            qs = qs.filter(month=options["month"])
+
+        months = rows = 0
+        for summary in qs.iterator():
+            rows += rebuild_daily_stats(summary.flat, summary.year, summary.month)
+            months += 1
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {months} month(s), {rows} daily row(s)."))
@@ -0,0 +1,82 @@
+"""
+Management command to verify / rebuild MonthlySummary and MemberMonthBalance
+rows from raw data. Both are maintained incrementally on every write; run this
+periodically (e.g. nightly cron) or on demand to detect and repair drift.
+Locked months are skipped: reads are served from their frozen snapshot, which
+rewritten live totals would contradict (unlock, repair and re-lock to refreeze).
+Unless --verify is given, it also prunes delta-sync tombstones past their
+retention window.
+
+Run: python manage.py recalculate_summaries [--flat <uuid>] [--year 2026 --month 2] [--verify]
+"""
+from django.core.management.base import BaseCommand, CommandError
+from decimal import Decimal
+from apps.meals.models import MonthlySummary, MemberMonthBalance
+from apps.meals.calculation_engine import (
+    aggregate_month, is_month_locked, prune_tombstones, recalculate_month,
+)
+
+
+class Command(BaseCommand):
+    help = "Verify or rebuild monthly summaries and member balances by full re-aggregation."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--flat", help="Only this flat (UUID).")
+        parser.add_argument("--year", type=int)
+        parser.add_argument("--month", type=int)
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Only report drifted summaries, do not rewrite them.",
+        )
+
+    def handle(self, *args, **options):
+        if options["month"] and not options["year"]:
+            raise CommandError("--month requires --year")
+
+        qs = MonthlySummary.objects.select_related("flat").order_by("flat_id", "year", "month")
+        if options["flat"]:
+            qs = qs.filter(flat_id=options["flat"])
+        if options["year"]:
+            qs = qs.filter(year=options["year"])
+        if options["month"]:
+            qs = qs.filter(month=options["month"])
+
+        locked = qs.filter(is_locked=True).count()
+        checked = drifted = 0
+        for summary in qs.filter(is_locked=False).iterator():
+            checked += 1
+            user_meals, user_paid = aggregate_month(summary.flat, summary.year, summary.month)
+            total_meals = sum(user_meals.values(), Decimal("0"))
+            total_expense = sum(user_paid.values(), Decimal("0"))
+            stored = {
+                user_id: (meals, paid)
+                for user_id, meals, paid in MemberMonthBalance.objects.filter(
+                    flat_id=summary.flat_id, year=summary.year, month=summary.month
+                ).values_list("user_id", "meals", "paid")
+            }
+            expected = {
+                user_id: (user_meals.get(user_id, Decimal("0")), user_paid.get(user_id, Decimal("0")))
+                for user_id in set(user_meals) | set(user_paid) | set(stored)
+            }
+            stored = {u: stored.get(u, (Decimal("0"), Decimal("0"))) for u in expected}
+            if (total_meals, total_expense) == (summary.total_meals, summary.total_expense) and stored == expected:
+                continue
+            drifted += 1
+            self.stdout.write(
+                f"{summary.flat_id} {summary.year}-{summary.month:02d}: "
+                f"meals {summary.total_meals} → {total_meals}, "
+                f"expense {summary.total_expense} → {total_expense}, "
+                f"{sum(stored[u] != expected[u] for u in expected)} member balance(s) drifted"
+            )
+            if not options["verify"] and not is_month_locked(summary.flat, summary.year, summary.month):
+                recalculate_month(summary.flat, summary.year, summary.month)
+
+        action = "found" if options["verify"] else "repaired"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Checked {checked} summaries, {action} {drifted} drifted, skipped {locked} locked."
+            )
+        )
+        if not options["verify"]:
+            self.stdout.write(f"Pruned {prune_tombstones()} expired meal tombstones.")
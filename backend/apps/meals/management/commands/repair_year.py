@@ -0,0 +1,38 @@
+"""
+Management command to verify / repair a whole year of MonthlySummary and
+MemberMonthBalance rows per flat in bulk (recalculate_year): two grouped
+scans of raw rows per flat, then missing or drifted months are rebuilt
+under row locks.  Locked months are skipped.  Reads never do this; run it
+after imports / restores or periodically alongside recalculate_summaries.
+
+Run: python manage.py repair_year --year 2026 [--flat <uuid>]
+"""
+from django.core.management.base import BaseCommand
+from apps.flats.models import Flat
+from apps.meals.calculation_engine import recalculate_year
+
+
+class Command(BaseCommand):
+    help = "Verify and rebuild a year of monthly summaries and member balances per flat."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--year", type=int, required=True)
+        parser.add_argument("--flat", help="Only this flat (UUID).")
+
+    def handle(self, *args, **options):
+        flats = Flat.objects.order_by("id")
+        if options["flat"]:
+            flats = flats.filter(id=options["flat"])
+
+        checked = repaired = 0
+        for flat in flats.iterator():
+            checked += 1
+            months = recalculate_year(flat, options["year"])
+            if months:
+                repaired += len(months)
+                self.stdout.write(
+                    f"{flat.id} {options['year']}: repaired month(s) {', '.join(map(str, months))}"
+                )
+        self.stdout.write(
+            self.style.SUCCESS(f"Checked {checked} flat(s), repaired {repaired} month(s).")
+        )
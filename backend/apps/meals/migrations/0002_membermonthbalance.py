@@ -0,0 +1,90 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:15
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Sum
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+
+def backfill_member_balances(apps, schema_editor):
+    """
+    Balances are read only from this table, so build the rows of every
+    month that already has a summary (months without one are built on
+    first use, balances included).
+    """
+    MealEntry = apps.get_model("meals", "MealEntry")
+    Expense = apps.get_model("expenses", "Expense")
+    MonthlySummary = apps.get_model("meals", "MonthlySummary")
+    MemberMonthBalance = apps.get_model("meals", "MemberMonthBalance")
+
+    months = set(MonthlySummary.objects.values_list("flat_id", "year", "month"))
+    totals = {}  # (flat_id, year, month) → {user_id: [meals, paid]}
+    for row in (
+        MealEntry.objects.annotate(y=ExtractYear("date"), m=ExtractMonth("date"))
+        .values("flat_id", "y", "m", "user_id")
+        .annotate(total=Sum("meal_count"))
+    ):
+        month = totals.setdefault((row["flat_id"], row["y"], row["m"]), {})
+        month.setdefault(row["user_id"], [Decimal("0"), Decimal("0")])[0] = row["total"] or Decimal("0")
+    for row in (
+        Expense.objects.annotate(y=ExtractYear("date"), m=ExtractMonth("date"))
+        .values("flat_id", "y", "m", "paid_by_id")
+        .annotate(total=Sum("amount"))
+    ):
+        month = totals.setdefault((row["flat_id"], row["y"], row["m"]), {})
+        month.setdefault(row["paid_by_id"], [Decimal("0"), Decimal("0")])[1] = row["total"] or Decimal("0")
+
+    rows = []
+    for (flat_id, year, month), members in totals.items():
+        if (flat_id, year, month) not in months:
+            continue
+        total_meals = sum((meals for meals, _ in members.values()), Decimal("0"))
+        total_paid = sum((paid for _, paid in members.values()), Decimal("0"))
+        rate = (total_paid / total_meals).quantize(Decimal("0.01")) if total_meals > 0 else Decimal("0")
+        for user_id, (meals, paid) in members.items():
+            cost = (meals * rate).quantize(Decimal("0.01"))
+            rows.append(
+                MemberMonthBalance(
+                    flat_id=flat_id, user_id=user_id, year=year, month=month,
+                    meals=meals, paid=paid, cost=cost, balance=(paid - cost).quantize(Decimal("0.01")),
+                )
+            )
+    MemberMonthBalance.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0001_initial'),
+        ('flats', '0003_add_granted_permissions_to_invite'),
+        ('meals', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MemberMonthBalance',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('year', models.PositiveIntegerField()),
+                ('month', models.PositiveIntegerField()),
+                ('meals', models.DecimalField(decimal_places=1, default=0, max_digits=10)),
+                ('paid', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('cost', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('balance', models.DecimalField(decimal_places=2, default=0, help_text='paid − cost: positive = receives, negative = owes', max_digits=12)),
+                ('flat', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='member_balances', to='flats.flat')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='month_balances', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'member_month_balances',
+                'indexes': [models.Index(fields=['flat', 'year', 'month'], name='member_mont_flat_id_729dbf_idx')],
+                'unique_together': {('flat', 'user', 'year', 'month')},
+            },
+        ),
+        migrations.RunPython(backfill_member_balances, migrations.RunPython.noop),
+    ]
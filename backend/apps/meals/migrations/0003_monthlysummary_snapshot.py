@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meals', '0002_membermonthbalance'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='monthlysummary',
+            name='snapshot',
+            field=models.JSONField(blank=True, help_text='Frozen grid payload (entries, summary, balances, members) of a locked month', null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meals', '0003_monthlysummary_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='monthlysummary',
+            name='version',
+            field=models.PositiveIntegerField(default=0, help_text='Bumped by every meal, expense, member-status and lock mutation (ETag)'),
+        ),
+    ]
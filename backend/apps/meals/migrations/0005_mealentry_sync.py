@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:22
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('flats', '0003_add_granted_permissions_to_invite'),
+        ('meals', '0004_monthlysummary_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MealEntryTombstone',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user_id', models.UUIDField()),
+                ('date', models.DateField()),
+            ],
+            options={
+                'db_table': 'meal_entry_tombstones',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='mealentry',
+            index=models.Index(fields=['flat', 'updated_at'], name='meal_entrie_flat_id_c144aa_idx'),
+        ),
+        migrations.AddField(
+            model_name='mealentrytombstone',
+            name='flat',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='flats.flat'),
+        ),
+        migrations.AddIndex(
+            model_name='mealentrytombstone',
+            index=models.Index(fields=['flat', 'created_at'], name='meal_entry__flat_id_aa7f35_idx'),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:43
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_daily_stats(apps, schema_editor):
+    MealEntry = apps.get_model("meals", "MealEntry")
+    Expense = apps.get_model("expenses", "Expense")
+    FlatDailyStats = apps.get_model("meals", "FlatDailyStats")
+    totals = {}
+    for row in MealEntry.objects.values("flat_id", "user_id", "date").annotate(total=Sum("meal_count")):
+        key = (row["flat_id"], row["user_id"], row["date"])
+        totals[key] = [row["total"] or Decimal("0"), Decimal("0")]
+    for row in Expense.objects.values("flat_id", "paid_by_id", "date").annotate(total=Sum("amount")):
+        key = (row["flat_id"], row["paid_by_id"], row["date"])
+        totals.setdefault(key, [Decimal("0"), Decimal("0")])[1] = row["total"] or Decimal("0")
+    FlatDailyStats.objects.bulk_create(
+        [
+            FlatDailyStats(flat_id=flat_id, user_id=user_id, date=day, meals=meals, paid=paid)
+            for (flat_id, user_id, day), (meals, paid) in totals.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0002_log_keyset_indexes'),
+        ('flats', '0004_flatmembership_permission_mask'),
+        ('meals', '0005_mealentry_sync'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FlatDailyStats',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('date', models.DateField()),
+                ('meals', models.DecimalField(decimal_places=1, default=0, max_digits=10)),
+                ('paid', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('flat', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='flats.flat')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'flat_daily_stats',
+                'indexes': [models.Index(fields=['flat', 'date'], name='flat_daily__flat_id_939ab3_idx')],
+                'unique_together': {('flat', 'user', 'date')},
+            },
+        ),
+        migrations.RunPython(backfill_daily_stats, migrations.RunPython.noop),
+    ]
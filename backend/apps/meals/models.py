@@ -1,9 +1,11 @@
 """
-Meal models – MealEntry and MonthlySummary with month-lock support.
+Meal models – MealEntry, MealEntryTombstone, MonthlySummary (with
+month-lock support), MemberMonthBalance and FlatDailyStats.
 """
 from django.conf import settings
 from django.db import models
 from apps.core.models import TimeStampedModel
+from apps.core.querysets import MonthWindowQuerySet
 
 
 class MealEntry(TimeStampedModel):
@@ -26,22 +28,54 @@ class MealEntry(TimeStampedModel):
         help_text="Supports half meals: 0, 0.5, 1, 1.5, 2, 3…",
     )
 
+    objects = MonthWindowQuerySet.as_manager()
+
     class Meta:
         db_table = "meal_entries"
         unique_together = ("flat", "user", "date")
         indexes = [
             models.Index(fields=["flat", "date"]),
             models.Index(fields=["flat", "user", "date"]),
+            models.Index(fields=["flat", "updated_at"]),
         ]
 
     def __str__(self):
         return f"{self.user.full_name} | {self.date} | {self.meal_count}"
 
 
+class MealEntryTombstone(TimeStampedModel):
+    """
+    Record of a deleted MealEntry, so delta-sync clients polling
+    /meals/grid/changes/ can drop the cell. Written by a post_delete
+    signal (covers cascades); pruned by `recalculate_summaries`.
+
+    No database constraints: rows are written while a cascade (user or
+    flat deletion) is still in progress.
+    """
+
+    flat = models.ForeignKey(
+        "flats.Flat", on_delete=models.DO_NOTHING, db_constraint=False, related_name="+"
+    )
+    user_id = models.UUIDField()
+    date = models.DateField()
+
+    objects = MonthWindowQuerySet.as_manager()
+
+    class Meta:
+        db_table = "meal_entry_tombstones"
+        indexes = [
+            models.Index(fields=["flat", "created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} | {self.date} (deleted)"
+
+
 class MonthlySummary(TimeStampedModel):
     """
     Cached monthly calculation per flat.
-    Recalculated on every meal/expense update for the relevant month.
+    Updated on every meal/expense update for the relevant month.
+    Locked months carry an immutable `snapshot` that reads are served from.
     """
 
     flat = models.ForeignKey(
@@ -63,6 +97,15 @@ class MonthlySummary(TimeStampedModel):
         related_name="locked_summaries",
     )
     locked_at = models.DateTimeField(null=True, blank=True)
+    version = models.PositiveIntegerField(
+        default=0,
+        help_text="Bumped by every meal, expense, member-status and lock mutation (ETag)",
+    )
+    snapshot = models.JSONField(
+        null=True,
+        blank=True,
+        help_text="Frozen grid payload (entries, summary, balances, members) of a locked month",
+    )
 
     class Meta:
         db_table = "monthly_summaries"
@@ -73,3 +116,72 @@ class MonthlySummary(TimeStampedModel):
 
     def __str__(self):
         return f"{self.flat.name} | {self.year}-{self.month:02d} | Rate: {self.meal_rate}"
+
+
+class MemberMonthBalance(TimeStampedModel):
+    """
+    Materialized per-member breakdown of a flat-month.
+    Kept up to date by the calculation engine on every meal / expense
+    write, so balance reads are a single indexed range scan.
+    """
+
+    flat = models.ForeignKey(
+        "flats.Flat", on_delete=models.CASCADE, related_name="member_balances"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="month_balances",
+    )
+    year = models.PositiveIntegerField()
+    month = models.PositiveIntegerField()  # 1-12
+
+    meals = models.DecimalField(max_digits=10, decimal_places=1, default=0)
+    paid = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    cost = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    balance = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0,
+        help_text="paid − cost: positive = receives, negative = owes",
+    )
+
+    class Meta:
+        db_table = "member_month_balances"
+        unique_together = ("flat", "user", "year", "month")
+        indexes = [
+            models.Index(fields=["flat", "year", "month"]),
+        ]
+
+    def __str__(self):
+        return f"{self.user.full_name} | {self.year}-{self.month:02d} | Balance: {self.balance}"
+
+
+class FlatDailyStats(TimeStampedModel):
+    """
+    Materialized per-member, per-day totals (meals eaten, amount paid).
+    Kept up to date by the calculation engine on every meal / expense
+    write, so analytics charts scan days × members instead of raw rows.
+    """
+
+    flat = models.ForeignKey(
+        "flats.Flat", on_delete=models.CASCADE, related_name="daily_stats"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="daily_stats",
+    )
+    date = models.DateField()
+    meals = models.DecimalField(max_digits=10, decimal_places=1, default=0)
+    paid = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    objects = MonthWindowQuerySet.as_manager()
+
+    class Meta:
+        db_table = "flat_daily_stats"
+        unique_together = ("flat", "user", "date")
+        indexes = [
+            models.Index(fields=["flat", "date"]),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} | {self.date} | meals {self.meals} | paid {self.paid}"
@@ -0,0 +1,92 @@
+"""
+Real-time grid push – publishes meal / expense changes of a flat-month
+to the configured broker (apps.core.broker) for the SSE stream at
+/meals/grid/stream/, and issues the stream tickets EventSource clients
+authenticate with (it cannot send an Authorization header, and access
+tokens must not end up in proxy / access logs as a query parameter).
+"""
+import json
+import logging
+import uuid
+from typing import Iterable, Optional
+
+from django.core import signing
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.utils.encoders import JSONEncoder
+
+from apps.core.broker import get_broker
+from apps.flats.models import Flat
+from .calculation_engine import MonthSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+def month_channel(flat_id, year: int, month: int) -> str:
+    return f"grid:{flat_id}:{year}-{month:02d}"
+
+
+STREAM_TICKET_SALT = "meals.grid-stream"
+STREAM_TICKET_MAX_AGE = 60  # seconds
+
+
+def issue_stream_ticket(membership, year: int, month: int) -> str:
+    """
+    Signed ticket that opens this membership's stream of one flat-month,
+    once, within STREAM_TICKET_MAX_AGE seconds.  Useless for anything else.
+    """
+    payload = {"mb": str(membership.pk), "y": year, "m": month, "n": uuid.uuid4().hex}
+    return signing.dumps(payload, salt=STREAM_TICKET_SALT)
+
+
+def redeem_stream_ticket(ticket: str, year: int, month: int) -> Optional[str]:
+    """Membership id of a valid, unused ticket for this month; else None."""
+    try:
+        payload = signing.loads(ticket, salt=STREAM_TICKET_SALT, max_age=STREAM_TICKET_MAX_AGE)
+    except signing.BadSignature:  # includes SignatureExpired
+        return None
+    if (payload.get("y"), payload.get("m")) != (year, month):
+        return None
+    if not cache.add(f"stream-ticket:{payload['n']}", 1, STREAM_TICKET_MAX_AGE):
+        return None  # already used
+    return payload["mb"]
+
+
+def publish_month_change(
+    flat: Flat,
+    year: int,
+    month: int,
+    cells: Iterable[dict] = (),
+    snapshot: Optional[MonthSnapshot] = None,
+) -> None:
+    """
+    Once the current transaction commits, push the changed cells and the
+    recalculated summary / balances of a flat-month to its subscribers.
+
+    Event payload:
+        { type: "cells" | "summary", year, month, version,
+          cells: [{ user_id, date, meal_count }], summary, balances }
+
+    `version` is the month version (see the ETag / delta-sync endpoints);
+    a client that sees a gap re-syncs via /meals/grid/changes/.
+    Broker failures are logged and never fail the write.
+    """
+    cells = list(cells)
+
+    def _send():
+        snap = snapshot or MonthSnapshot(flat, year, month)
+        event = {
+            "type": "cells" if cells else "summary",
+            "year": year,
+            "month": month,
+            "version": snap.summary.version,
+            "cells": cells,
+            "summary": snap.summary_data(),
+            "balances": snap.balances(),
+        }
+        try:
+            get_broker().publish(month_channel(flat.id, year, month), json.dumps(event, cls=JSONEncoder))
+        except Exception:
+            logger.exception("Realtime publish failed for %s %s-%02d", flat.id, year, month)
+
+    transaction.on_commit(_send)
@@ -0,0 +1,14 @@
+"""
+Meal renderers.
+"""
+from rest_framework.renderers import JSONRenderer
+
+
+class MatrixJSONRenderer(JSONRenderer):
+    """
+    Plain JSON, selected with `?format=matrix`.
+    Views check `request.accepted_renderer.format` to return the dense
+    matrix layout of the meal grid instead of per-entry objects.
+    """
+
+    format = "matrix"
@@ -1,5 +1,5 @@
 """
-Meal serializers – cell update (PATCH), grid read, summary.
+Meal serializers – cell / batch update (PATCH), grid read, summary.
 """
 from rest_framework import serializers
 from .models import MealEntry, MonthlySummary
@@ -16,6 +16,26 @@ class MealCellUpdateSerializer(serializers.Serializer):
     meal_count = serializers.DecimalField(max_digits=4, decimal_places=1, min_value=0)
 
 
+class MealCellBatchUpdateSerializer(serializers.Serializer):
+    """
+    Batch auto-save payload (e.g. filling a whole day at once).
+    Frontend sends: { cells: [{ user_id, date, meal_count }, …] }
+    """
+
+    cells = MealCellUpdateSerializer(many=True, allow_empty=False, max_length=500)
+
+    def validate_cells(self, cells):
+        seen = set()
+        for cell in cells:
+            key = (cell["user_id"], cell["date"])
+            if key in seen:
+                raise serializers.ValidationError(
+                    f"Duplicate cell for user {cell['user_id']} on {cell['date']}."
+                )
+            seen.add(key)
+        return cells
+
+
 class MealEntrySerializer(serializers.ModelSerializer):
     user_name = serializers.CharField(source="user.full_name", read_only=True)
 
@@ -42,6 +62,39 @@ class MonthYearSerializer(serializers.Serializer):
     month = serializers.IntegerField(min_value=1, max_value=12)
 
 
+class GridChangesSerializer(MonthYearSerializer):
+    """Query params for delta sync: month plus the cursor of the last poll."""
+
+    since = serializers.CharField(required=False, allow_blank=True)
+
+    def validate_since(self, value):
+        from .calculation_engine import decode_sync_cursor
+
+        if value:
+            try:
+                decode_sync_cursor(value)
+            except (ValueError, OverflowError):
+                raise serializers.ValidationError("Invalid sync cursor.")
+        return value
+
+
+class GridStreamSerializer(MonthYearSerializer):
+    """
+    Query params for the grid event stream.  EventSource cannot send
+    headers, so instead of `Authorization` / `X-Flat-ID` it may pass a
+    ticket from POST /meals/grid/stream/ticket/.
+    """
+
+    ticket = serializers.CharField(required=False)
+
+
+class MemberHistorySerializer(serializers.Serializer):
+    """Query params for a member's cross-month balance history."""
+
+    user_id = serializers.UUIDField(required=False)
+    months = serializers.IntegerField(min_value=1, max_value=120, default=12)
+
+
 class LockMonthSerializer(serializers.Serializer):
     year = serializers.IntegerField(min_value=2020, max_value=2099)
     month = serializers.IntegerField(min_value=1, max_value=12)
@@ -0,0 +1,17 @@
+"""
+Meal signals – tombstones for deleted meal entries (delta sync).
+"""
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .calculation_engine import bump_month_version
+from .models import MealEntry, MealEntryTombstone
+
+
+@receiver(post_delete, sender=MealEntry)
+def record_meal_tombstone(sender, instance, **kwargs):
+    MealEntryTombstone.objects.create(
+        flat_id=instance.flat_id, user_id=instance.user_id, date=instance.date
+    )
+    # Let ETag / delta-sync clients see the removal
+    bump_month_version(instance.flat_id, instance.date.year, instance.date.month)
@@ -0,0 +1,76 @@
+"""
+Month read-model cache (apps.meals.cache).  It is bypassed inside atomic
+blocks, so these tests run outside one (TransactionTestCase): a second
+read of the same version costs no queries, and a write bumps the version
+so the next read misses.
+"""
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TransactionTestCase
+
+from apps.core.tests.utils import api_client, make_flat
+from apps.meals.cache import cache_stats
+from apps.meals.calculation_engine import MonthSnapshot, apply_month_delta, get_or_build_summary
+from apps.meals.tests.test_month_reads import REVALIDATE_QUERIES, SUMMARY, SUMMARY_QUERIES, populate
+
+
+class MonthCacheTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.flat, self.memberships = make_flat(members=3)
+        populate(self.flat, self.memberships, days=3)
+
+    def read(self):
+        snapshot = MonthSnapshot(self.flat, 2026, 2, summary=get_or_build_summary(self.flat, 2026, 2))
+        return snapshot.summary, snapshot.balances(), snapshot.member_data()
+
+    def test_second_read_is_free(self):
+        summary, balances, members = self.read()
+        self.assertEqual(cache_stats()["misses"], 2)
+
+        snapshot = MonthSnapshot(self.flat, 2026, 2, summary=summary)
+        with self.assertNumQueries(0):
+            self.assertEqual(snapshot.balances(), balances)
+            self.assertEqual(snapshot.member_data(), members)
+        self.assertEqual(cache_stats(), {"hits": 2, "misses": 2, "hit_rate": 0.5})
+
+        out = StringIO()
+        call_command("month_cache_stats", "--reset", stdout=out)
+        self.assertIn("hits: 2  misses: 2  hit rate: 50.0%", out.getvalue())
+        self.assertEqual(cache_stats()["hits"], 0)
+
+    def test_write_bumps_the_version_and_forces_a_miss(self):
+        before, balances, _ = self.read()
+        user = self.memberships[1].user
+        apply_month_delta(self.flat, 2026, 2, meal_deltas={user.id: Decimal("2")})
+
+        after, new_balances, _ = self.read()
+        self.assertEqual(after.version, before.version + 1)
+        self.assertEqual(cache_stats()["misses"], 4)  # both read models rebuilt
+        self.assertNotEqual(new_balances, balances)
+        mine = next(b for b in new_balances if str(b["user_id"]) == str(user.id))
+        self.assertEqual(mine["total_meals"], Decimal("6.5"))
+
+    def test_summary_endpoint_hits_the_cache(self):
+        client = api_client(self.memberships[0].user, self.flat)
+        with self.assertNumQueries(SUMMARY_QUERIES + 1):  # + cold flat context
+            response = client.get(SUMMARY)
+        # Only the user, version and summary reads remain: balances and
+        # members come from the cache
+        with self.assertNumQueries(SUMMARY_QUERIES - 2):
+            self.assertEqual(client.get(SUMMARY, HTTP_IF_NONE_MATCH='"stale"').data, response.data)
+        with self.assertNumQueries(REVALIDATE_QUERIES):
+            self.assertEqual(client.get(SUMMARY, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304)
+
+        misses = cache_stats()["misses"]
+        client.patch(
+            "/api/v1/meals/cell/",
+            {"user_id": str(self.memberships[0].user.id), "date": str(date(2026, 2, 20)), "meal_count": "1"},
+            format="json",
+        )
+        self.assertNotEqual(client.get(SUMMARY).data, response.data)
+        self.assertEqual(cache_stats()["misses"], misses + 1)  # balances of the new version, built once
@@ -0,0 +1,132 @@
+"""
+Summary maintenance under concurrent writes.  SQLite has no row locks,
+so the interleavings are replayed deterministically: a "concurrent"
+writer commits at the moment the raw rows have been aggregated if no
+MonthlySummary row lock is held yet, and otherwise waits (as it would
+block on that row) until the locking transaction has committed.
+"""
+from contextlib import contextmanager
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.db import transaction
+from django.db.models import QuerySet
+from django.test import TestCase
+
+from apps.core.tests.utils import api_client, make_flat
+from apps.meals import calculation_engine as engine
+from apps.meals.calculation_engine import (
+    MonthLocked, aggregate_month, apply_month_delta, lock_month, recalculate_month,
+)
+from apps.meals.models import MealEntry, MonthlySummary
+
+DAY = date(2026, 2, 10)
+
+
+class ConcurrentWriter:
+    """Adds meals for `user` on DAY the way the cell view does."""
+
+    def __init__(self, flat, user):
+        self.flat, self.user = flat, user
+        self.pending = []
+        self.errors = []
+
+    def write(self, count=Decimal("2")):
+        try:
+            with transaction.atomic():
+                MealEntry.objects.create(flat=self.flat, user=self.user, date=DAY, meal_count=count)
+                apply_month_delta(self.flat, 2026, 2, meal_deltas={self.user.id: count})
+        except MonthLocked as exc:
+            self.errors.append(exc)
+
+    @contextmanager
+    def during_aggregate(self):
+        """Run one write right after the next aggregate_month() of the engine."""
+        holds_lock = []
+        real_select_for_update = QuerySet.select_for_update
+        real_aggregate = engine.aggregate_month
+
+        def select_for_update(qs, *args, **kwargs):
+            if qs.model is MonthlySummary:
+                holds_lock.append(True)
+            return real_select_for_update(qs, *args, **kwargs)
+
+        def aggregate(*args):
+            result = real_aggregate(*args)
+            if not self.pending and not holds_lock:
+                self.write()  # nothing stops it from committing now
+            else:
+                self.pending.append(self.write)  # blocks on the summary row
+            return result
+
+        with mock.patch.object(QuerySet, "select_for_update", select_for_update), \
+                mock.patch.object(engine, "aggregate_month", aggregate):
+            yield
+        for write in self.pending:
+            write()
+
+
+class MonthLockingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.flat, memberships = make_flat(members=2)
+        cls.user = memberships[1].user
+        MealEntry.objects.create(flat=cls.flat, user=cls.user, date=date(2026, 2, 1), meal_count=Decimal("3"))
+        recalculate_month(cls.flat, 2026, 2)
+
+    def assertSummaryMatchesRows(self):
+        meals, _ = aggregate_month(self.flat, 2026, 2)
+        summary = MonthlySummary.objects.get(flat=self.flat, year=2026, month=2)
+        self.assertEqual(summary.total_meals, sum(meals.values(), Decimal("0")))
+        return summary
+
+    def test_recalculate_keeps_a_write_landing_after_the_aggregate(self):
+        writer = ConcurrentWriter(self.flat, self.user)
+        with writer.during_aggregate():
+            recalculate_month(self.flat, 2026, 2)
+        self.assertEqual(self.assertSummaryMatchesRows().total_meals, Decimal("5"))
+
+    def test_delta_on_a_locked_month_is_refused(self):
+        lock_month(self.flat, 2026, 2, self.user)
+        with self.assertRaises(MonthLocked):
+            apply_month_delta(self.flat, 2026, 2, meal_deltas={self.user.id: Decimal("1")})
+        self.assertEqual(self.assertSummaryMatchesRows().total_meals, Decimal("3"))
+
+    def test_cell_write_that_passed_a_stale_lock_check_is_rolled_back(self):
+        lock_month(self.flat, 2026, 2, self.user)
+        client = api_client(self.user, self.flat)
+        with mock.patch("apps.meals.views.is_month_locked", return_value=False):
+            response = client.patch(
+                "/api/v1/meals/cell/",
+                {"user_id": str(self.user.id), "date": str(DAY), "meal_count": "2"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.data["errors"]["detail"], "Month is locked.")
+        self.assertFalse(MealEntry.objects.filter(flat=self.flat, date=DAY).exists())
+        self.assertEqual(self.assertSummaryMatchesRows().total_meals, Decimal("3"))
+
+    def test_lock_month_with_a_pending_write(self):
+        writer = ConcurrentWriter(self.flat, self.user)
+        with writer.during_aggregate():
+            summary = lock_month(self.flat, 2026, 2, self.user)
+
+        self.assertEqual(len(writer.errors), 1)  # the blocked write found the month locked
+        self.assertFalse(MealEntry.objects.filter(flat=self.flat, date=DAY).exists())
+        live = self.assertSummaryMatchesRows()
+        frozen = summary.snapshot
+        self.assertEqual(Decimal(frozen["summary"]["total_meals"]), live.total_meals)
+        self.assertEqual(
+            sum(Decimal(e["meal_count"]) for e in frozen["entries"]), live.total_meals
+        )
+        self.assertEqual(
+            {b["user_id"]: Decimal(b["total_meals"]) for b in frozen["balances"] if Decimal(b["total_meals"])},
+            {str(self.user.id): live.total_meals},
+        )
+
+    def test_lock_month_includes_a_write_committed_first(self):
+        ConcurrentWriter(self.flat, self.user).write()
+        summary = lock_month(self.flat, 2026, 2, self.user)
+        self.assertEqual(Decimal(summary.snapshot["summary"]["total_meals"]), Decimal("5"))
+        self.assertEqual(self.assertSummaryMatchesRows().total_meals, Decimal("5"))
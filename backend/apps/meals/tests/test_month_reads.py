@@ -0,0 +1,66 @@
+"""
+Query budget of the month read path (MonthSnapshot): the grid and
+summary endpoints cost a fixed number of queries whatever the number of
+members and entries, and a matching If-None-Match costs only the
+version read.
+"""
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase
+
+from apps.core.tests.utils import api_client, make_flat
+from apps.expenses.models import Expense
+from apps.meals.calculation_engine import recalculate_month
+from apps.meals.models import MealEntry
+
+GRID = "/api/v1/meals/grid/?year=2026&month=2"
+SUMMARY = "/api/v1/meals/summary/?year=2026&month=2"
+
+# user (JWT) + month version (ETag) + summary + balances + members
+SUMMARY_QUERIES = 5
+# … + the month's entries
+GRID_QUERIES = 6
+# user + month version, then 304
+REVALIDATE_QUERIES = 2
+
+
+def populate(flat, memberships, days):
+    for membership in memberships:
+        MealEntry.objects.bulk_create(
+            MealEntry(flat=flat, user=membership.user, date=date(2026, 2, d), meal_count=Decimal("1.5"))
+            for d in range(1, days + 1)
+        )
+        Expense.objects.create(flat=flat, paid_by=membership.user, date=date(2026, 2, 1), amount=Decimal("120"))
+    recalculate_month(flat, 2026, 2)
+
+
+class MonthReadQueryCountTests(TestCase):
+    def assertQueryBudget(self, members, days):
+        flat, memberships = make_flat(members=members)
+        populate(flat, memberships, days)
+        client = api_client(memberships[0].user, flat)
+        client.get(SUMMARY)  # warm the per-user flat context
+
+        for url, budget in ((GRID, GRID_QUERIES), (GRID + "&format=matrix", GRID_QUERIES), (SUMMARY, SUMMARY_QUERIES)):
+            with self.subTest(url=url, members=members, days=days):
+                with self.assertNumQueries(budget):
+                    response = client.get(url)
+                self.assertEqual(response.status_code, 200)
+                with self.assertNumQueries(REVALIDATE_QUERIES):
+                    response = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+                self.assertEqual(response.status_code, 304)
+
+    def test_small_month(self):
+        self.assertQueryBudget(members=2, days=3)
+
+    def test_budget_does_not_grow_with_members_or_entries(self):
+        self.assertQueryBudget(members=8, days=28)
+
+    def test_grid_payload(self):
+        flat, memberships = make_flat(members=3)
+        populate(flat, memberships, days=4)
+        response = api_client(memberships[1].user, flat).get(GRID)
+        self.assertEqual(len(response.data["entries"]), 12)
+        self.assertEqual(Decimal(str(response.data["summary"]["total_meals"])), Decimal("18"))
+        self.assertEqual(len(response.data["balances"]), 3)
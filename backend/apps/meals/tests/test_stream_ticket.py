@@ -0,0 +1,76 @@
+"""Grid stream tickets: short-lived, single-use, bound to one flat-month."""
+import time
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.test import TestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.core.tests.utils import api_client, make_flat
+from apps.meals.realtime import STREAM_TICKET_MAX_AGE, issue_stream_ticket, redeem_stream_ticket
+
+TICKET = "/api/v1/meals/grid/stream/ticket/"
+
+
+class StreamTicketTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.flat, (cls.owner, cls.member) = make_flat(members=2)
+
+    def ticket(self, year=2026, month=2):
+        response = api_client(self.member.user, self.flat).post(
+            TICKET, {"year": year, "month": month}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["expires_in"], STREAM_TICKET_MAX_AGE)
+        return response.data["ticket"]
+
+    def test_redeems_once_for_its_month(self):
+        ticket = self.ticket()
+        self.assertIsNone(redeem_stream_ticket(ticket, 2026, 3))
+        self.assertEqual(redeem_stream_ticket(ticket, 2026, 2), str(self.member.pk))
+        self.assertIsNone(redeem_stream_ticket(ticket, 2026, 2))
+
+    def test_rejects_tampered_and_expired_tickets(self):
+        ticket = self.ticket()
+        self.assertIsNone(redeem_stream_ticket(ticket[:-2] + "xx", 2026, 2))
+        later = time.time() + STREAM_TICKET_MAX_AGE + 1
+        with mock.patch("django.core.signing.time.time", return_value=later):
+            self.assertIsNone(redeem_stream_ticket(ticket, 2026, 2))
+
+    def test_requires_view_meals(self):
+        flat, (_, member) = make_flat(members=2, permissions=[])
+        response = api_client(member.user, flat).post(TICKET, {"year": 2026, "month": 2}, format="json")
+        self.assertEqual(response.status_code, 403)
+
+    def test_validates_month(self):
+        response = api_client(self.member.user, self.flat).post(TICKET, {"year": 2026, "month": 13}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+
+class GridStreamTicketAuthTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.flat, (cls.owner, cls.member) = make_flat(members=2)
+
+    async def open_stream(self, query):
+        response = await self.async_client.get(f"/api/v1/meals/grid/stream/?{query}")
+        if response.status_code == 200:
+            stream = aiter(response.streaming_content)
+            first = await anext(stream)
+            await stream.aclose()
+            return response.status_code, first
+        return response.status_code, None
+
+    async def test_ticket_opens_the_stream(self):
+        ticket = await sync_to_async(issue_stream_ticket)(self.member, 2026, 2)
+        status_code, first = await self.open_stream(f"year=2026&month=2&ticket={ticket}")
+        self.assertEqual(status_code, 200)
+        self.assertIn(b"retry:", first)
+        status_code, _ = await self.open_stream(f"year=2026&month=2&ticket={ticket}")
+        self.assertEqual(status_code, 403)  # single use
+
+    async def test_access_token_param_is_not_accepted(self):
+        token = await sync_to_async(lambda: str(RefreshToken.for_user(self.member.user).access_token))()
+        status_code, _ = await self.open_stream(f"year=2026&month=2&token={token}&flat={self.flat.id}")
+        self.assertEqual(status_code, 403)
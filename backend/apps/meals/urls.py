@@ -5,8 +5,13 @@ app_name = "meals"
 
 urlpatterns = [
     path("grid/", views.MealGridView.as_view(), name="meal_grid"),
+    path("grid/changes/", views.MealGridChangesView.as_view(), name="meal_grid_changes"),
+    path("grid/stream/", views.grid_stream, name="meal_grid_stream"),
+    path("grid/stream/ticket/", views.GridStreamTicketView.as_view(), name="meal_grid_stream_ticket"),
     path("cell/", views.MealCellUpdateView.as_view(), name="meal_cell_update"),
+    path("cells/", views.MealCellBatchUpdateView.as_view(), name="meal_cell_batch_update"),
     path("summary/", views.MonthSummaryView.as_view(), name="month_summary"),
+    path("balance-history/", views.MemberBalanceHistoryView.as_view(), name="balance_history"),
     path("lock-month/", views.LockMonthView.as_view(), name="lock_month"),
     path("unlock-month/", views.UnlockMonthView.as_view(), name="unlock_month"),
 ]
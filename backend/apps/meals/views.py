@@ -1,42 +1,99 @@
 """
-Meal views – grid read, cell-level PATCH (auto-save), summary, lock/unlock.
+Meal views – grid read, delta sync, cell-level / batch PATCH (auto-save), summary,
+balance history, lock/unlock.
 """
+import asyncio
+from collections import defaultdict
+from contextlib import aclosing
 from datetime import date as dt_date
+from decimal import Decimal
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils.cache import patch_cache_control
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from rest_framework import status, permissions
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from apps.core.broker import get_broker
 from apps.permissions.guards import HasFlatPermission, flat_permission_required
+from apps.permissions.services import has_permission
 from apps.core.models import ActivityLog
 from apps.flats.models import FlatMembership
-from apps.flats.serializers import FlatMembershipSerializer
 from .models import MealEntry
+from .realtime import (
+    STREAM_TICKET_MAX_AGE,
+    issue_stream_ticket,
+    month_channel,
+    publish_month_change,
+    redeem_stream_ticket,
+)
+from .renderers import MatrixJSONRenderer
 from .serializers import (
     MealCellUpdateSerializer,
+    MealCellBatchUpdateSerializer,
     MealEntrySerializer,
     MonthYearSerializer,
+    GridChangesSerializer,
+    GridStreamSerializer,
+    MemberHistorySerializer,
     LockMonthSerializer,
 )
 from .calculation_engine import (
-    recalculate_month,
-    get_user_balances,
-    get_month_summary,
-    get_grid_members,
+    MonthSnapshot,
+    apply_daily_deltas,
+    apply_month_delta,
+    get_member_history,
+    get_month_changes,
     lock_month,
     unlock_month,
     is_month_locked,
+    month_version,
 )
 
 
+def _month_etag(request, *args, **kwargs):
+    """
+    Strong ETag from the flat-month version counter.
+    Costs one summary-row read – the meal / expense tables are not touched.
+    """
+    params = MonthYearSerializer(data=request.query_params)
+    if request.flat is None or not params.is_valid():
+        return None
+    year, month = params.validated_data["year"], params.validated_data["month"]
+    version = month_version(request.flat, year, month)
+    if version is None:
+        return None
+    return f'"{request.flat.id.hex}-{year}{month:02d}-v{version}-{request.accepted_renderer.format}"'
+
+
+def _revalidate(response):
+    """Let clients cache the body but always revalidate with If-None-Match."""
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+@method_decorator(condition(etag_func=_month_etag), name="get")
 class MealGridView(APIView):
     """
-    GET  /meals/grid/?year=2026&month=2
+    GET  /meals/grid/?year=2026&month=2[&format=matrix]
     Returns all meal entries for the flat in the given month,
-    plus the calculated summary.
+    plus the calculated summary.  Locked months are served from
+    their frozen snapshot.
+
+    `format=matrix` replaces `entries` with a dense member × day array
+    of meal counts built without model instantiation.
+
+    Sends a strong ETag; `If-None-Match` gets a 304 without aggregation.
     """
     permission_classes = [
         permissions.IsAuthenticated,
         flat_permission_required("view_meals"),
     ]
+    renderer_classes = [JSONRenderer, MatrixJSONRenderer]
 
     def get(self, request):
         params = MonthYearSerializer(data=request.query_params)
@@ -44,24 +101,132 @@ class MealGridView(APIView):
         year = params.validated_data["year"]
         month = params.validated_data["month"]
 
-        entries = (
-            MealEntry.objects.filter(
-                flat=request.flat, date__year=year, date__month=month
-            )
-            .select_related("user")
-            .order_by("date", "user__full_name")
+        if request.accepted_renderer.format == MatrixJSONRenderer.format:
+            snapshot = MonthSnapshot.load(request.flat, year, month)
+            return _revalidate(Response({"success": True, **snapshot.matrix_payload()}))
+
+        snapshot = MonthSnapshot.load(request.flat, year, month, with_entries=True)
+        return _revalidate(Response({"success": True, **snapshot.grid_payload()}))
+
+
+class MealGridChangesView(APIView):
+    """
+    GET  /meals/grid/changes/?year=2026&month=2&since=<cursor>
+    Delta sync for open grids: only the cells changed / deleted since
+    the cursor of the previous poll, plus the fresh summary and a new
+    cursor. Omit `since` on the first poll to get the full month.
+    """
+    permission_classes = [
+        permissions.IsAuthenticated,
+        flat_permission_required("view_meals"),
+    ]
+
+    def get(self, request):
+        params = GridChangesSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        d = params.validated_data
+        changes = get_month_changes(request.flat, d["year"], d["month"], d.get("since"))
+        return Response({"success": True, **changes})
+
+
+# Streams end after this long; EventSource reconnects (re-authorising).
+GRID_STREAM_MAX_SECONDS = 600
+GRID_STREAM_HEARTBEAT_SECONDS = 15
+
+
+def _error_response(errors, status_code):
+    """The DRF error envelope, for the plain (non-DRF) streaming view."""
+    return JsonResponse(
+        {"success": False, "errors": errors, "status_code": status_code}, status=status_code
+    )
+
+
+def _stream_membership(request, ticket, year, month):
+    """
+    Membership allowed to watch the grid: the one FlatContextMiddleware
+    resolved from headers, else the one a stream ticket was issued to.
+    """
+    membership = request.membership
+    if membership is None and ticket:
+        membership_id = redeem_stream_ticket(ticket, year, month)
+        if membership_id is None:
+            return None
+        membership = (
+            FlatMembership.objects.select_related("flat")
+            .filter(pk=membership_id, is_active=True)
+            .first()
         )
-        summary = get_month_summary(request.flat, year, month)
-        balances = get_user_balances(request.flat, year, month)
-        grid_members = get_grid_members(request.flat, year, month)
+    if membership is None or not has_permission(membership, "view_meals"):
+        return None
+    return membership
+
+
+async def _grid_events(channel):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + GRID_STREAM_MAX_SECONDS
+    subscription = get_broker().subscribe(channel, timeout=GRID_STREAM_HEARTBEAT_SECONDS)
+    async with aclosing(subscription):
+        await anext(subscription)  # subscribed – nothing published from here on is missed
+        yield "retry: 3000\n\n"
+        async for message in subscription:
+            yield f"event: grid\ndata: {message}\n\n" if message else ": ping\n\n"
+            if loop.time() > deadline:
+                break
+
+
+async def grid_stream(request):
+    """
+    GET  /meals/grid/stream/?year=2026&month=2[&ticket=<stream ticket>]
+    Server-Sent Events for one flat-month: every cell save and expense
+    change is pushed as an `event: grid` with the changed cells and the
+    recalculated summary / balances (see apps.meals.realtime).
+
+    Needs the ASGI server.  Load the grid first, then apply events; on a
+    version gap or reconnect, catch up with /meals/grid/changes/.
+    """
+    if request.method != "GET":
+        return _error_response({"detail": "Method not allowed."}, 405)
+    if not isinstance(request, ASGIRequest):
+        return _error_response({"detail": "Streaming requires the ASGI server."}, 501)
+    params = GridStreamSerializer(data=request.GET)
+    if not params.is_valid():
+        return _error_response(params.errors, 400)
+    d = params.validated_data
+
+    membership = await sync_to_async(_stream_membership)(request, d.get("ticket"), d["year"], d["month"])
+    if membership is None:
+        return _error_response({"detail": "You do not have permission to perform this action."}, 403)
+
+    response = StreamingHttpResponse(
+        _grid_events(month_channel(membership.flat_id, d["year"], d["month"])),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # nginx: do not buffer the stream
+    return response
 
+
+class GridStreamTicketView(APIView):
+    """
+    POST  /meals/grid/stream/ticket/   { year, month }
+    Ticket for EventSource clients: open
+    /meals/grid/stream/?year=&month=&ticket=<ticket> within `expires_in`
+    seconds.  Single use – fetch a new one to reconnect.
+    """
+    permission_classes = [
+        permissions.IsAuthenticated,
+        flat_permission_required("view_meals"),
+    ]
+
+    def post(self, request):
+        params = MonthYearSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+        d = params.validated_data
         return Response(
             {
                 "success": True,
-                "entries": MealEntrySerializer(entries, many=True).data,
-                "summary": summary,
-                "balances": balances,
-                "members": FlatMembershipSerializer(grid_members, many=True).data,
+                "ticket": issue_stream_ticket(request.membership, d["year"], d["month"]),
+                "expires_in": STREAM_TICKET_MAX_AGE,
             }
         )
 
@@ -88,39 +253,163 @@ class MealCellUpdateView(APIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        entry, created = MealEntry.objects.update_or_create(
-            flat=request.flat,
-            user_id=d["user_id"],
-            date=d["date"],
-            defaults={"meal_count": d["meal_count"]},
-        )
+        with transaction.atomic():
+            # get_or_create retries as a locked get when a concurrent save
+            # of the same empty cell inserts it first
+            entry, created = MealEntry.objects.select_for_update().get_or_create(
+                flat=request.flat,
+                user_id=d["user_id"],
+                date=d["date"],
+                defaults={"meal_count": d["meal_count"]},
+            )
+            old_count = Decimal("0") if created else entry.meal_count
+            if not created:
+                entry.meal_count = d["meal_count"]
+                entry.save(update_fields=["meal_count", "updated_at"])
+            # O(1) summary maintenance – only the changed amount is applied
+            summary = apply_month_delta(
+                request.flat, year, month,
+                meal_deltas={d["user_id"]: d["meal_count"] - old_count},
+            )
+            apply_daily_deltas(
+                request.flat, meal_deltas={(d["user_id"], d["date"]): d["meal_count"] - old_count}
+            )
 
+        cell = {"user_id": str(d["user_id"]), "date": str(d["date"]), "meal_count": str(d["meal_count"])}
         ActivityLog.log(
             user=request.user,
             flat=request.flat,
             action=ActivityLog.ActionType.MEAL_ADD if created else ActivityLog.ActionType.MEAL_UPDATE,
             description=f"{'Added' if created else 'Updated'} meal entry for {d['date']} (count: {d['meal_count']})",
-            metadata={"user_id": str(d["user_id"]), "date": str(d["date"]), "meal_count": str(d["meal_count"])},
+            metadata=cell,
             request=request,
         )
 
-        # Recalculate only the affected month
-        summary = get_month_summary(request.flat, year, month)
-        balances = get_user_balances(request.flat, year, month)
+        snapshot = MonthSnapshot(request.flat, year, month, summary=summary)
+        publish_month_change(request.flat, year, month, cells=[cell], snapshot=snapshot)
 
         return Response(
             {
                 "success": True,
                 "entry": MealEntrySerializer(entry).data,
-                "summary": summary,
-                "balances": balances,
+                "summary": snapshot.summary_data(),
+                "balances": snapshot.balances(),
+            }
+        )
+
+
+class MealCellBatchUpdateView(APIView):
+    """
+    PATCH  /meals/cells/
+    Save many cells in one request: { cells: [{ user_id, date, meal_count }, …] }.
+    One bulk upsert, one activity log entry, one recalculation per affected
+    month.  Returns the summary/balances of the first cell's month.
+    """
+    permission_classes = [
+        permissions.IsAuthenticated,
+        flat_permission_required("add_meal"),
+    ]
+
+    def patch(self, request):
+        serializer = MealCellBatchUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        cells = serializer.validated_data["cells"]
+
+        months = {(c["date"].year, c["date"].month) for c in cells}
+        if any(is_month_locked(request.flat, y, m) for y, m in months):
+            return Response(
+                {"success": False, "errors": {"detail": "Month is locked."}},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        user_ids = {c["user_id"] for c in cells}
+        member_ids = set(
+            FlatMembership.objects.filter(flat=request.flat, user_id__in=user_ids)
+            .values_list("user_id", flat=True)
+        )
+        if user_ids - member_ids:
+            return Response(
+                {"success": False, "errors": {"cells": "Every user_id must be a member of this flat."}},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        with transaction.atomic():
+            existing = {
+                (user_id, date): count
+                for user_id, date, count in MealEntry.objects.select_for_update()
+                .filter(
+                    flat=request.flat,
+                    user_id__in=user_ids,
+                    date__in={c["date"] for c in cells},
+                )
+                .values_list("user_id", "date", "meal_count")
+            }
+            MealEntry.objects.bulk_create(
+                [
+                    MealEntry(
+                        flat=request.flat,
+                        user_id=c["user_id"],
+                        date=c["date"],
+                        meal_count=c["meal_count"],
+                    )
+                    for c in cells
+                ],
+                update_conflicts=True,
+                unique_fields=["flat", "user", "date"],
+                update_fields=["meal_count", "updated_at"],
+            )
+
+            deltas = defaultdict(lambda: defaultdict(Decimal))
+            day_deltas = defaultdict(Decimal)
+            for c in cells:
+                old_count = existing.get((c["user_id"], c["date"]), Decimal("0"))
+                deltas[(c["date"].year, c["date"].month)][c["user_id"]] += c["meal_count"] - old_count
+                day_deltas[(c["user_id"], c["date"])] += c["meal_count"] - old_count
+            summaries = {
+                (year, month): apply_month_delta(request.flat, year, month, meal_deltas=meal_deltas)
+                for (year, month), meal_deltas in deltas.items()
+            }
+            apply_daily_deltas(request.flat, meal_deltas=day_deltas)
+
+        created = sum(1 for c in cells if (c["user_id"], c["date"]) not in existing)
+        saved = [
+            {"user_id": str(c["user_id"]), "date": str(c["date"]), "meal_count": str(c["meal_count"])}
+            for c in cells
+        ]
+        ActivityLog.log(
+            user=request.user,
+            flat=request.flat,
+            action=ActivityLog.ActionType.MEAL_UPDATE,
+            description=f"Saved {len(cells)} meal entries ({created} new)",
+            metadata={"cells": saved},
+            request=request,
+        )
+
+        year, month = cells[0]["date"].year, cells[0]["date"].month
+        snapshot = MonthSnapshot(request.flat, year, month, summary=summaries[(year, month)])
+        for y, m in summaries:
+            publish_month_change(
+                request.flat, y, m,
+                cells=[cell for c, cell in zip(cells, saved) if (c["date"].year, c["date"].month) == (y, m)],
+                snapshot=snapshot if (y, m) == (year, month) else None,
+            )
+
+        return Response(
+            {
+                "success": True,
+                "saved": len(cells),
+                "created": created,
+                "summary": snapshot.summary_data(),
+                "balances": snapshot.balances(),
             }
         )
 
 
+@method_decorator(condition(etag_func=_month_etag), name="get")
 class MonthSummaryView(APIView):
     """
     GET  /meals/summary/?year=2026&month=2
+    Sends a strong ETag; `If-None-Match` gets a 304 without aggregation.
     """
 
     def get(self, request):
@@ -129,10 +418,29 @@ class MonthSummaryView(APIView):
         year = params.validated_data["year"]
         month = params.validated_data["month"]
 
-        summary = get_month_summary(request.flat, year, month)
-        balances = get_user_balances(request.flat, year, month)
+        snapshot = MonthSnapshot.load(request.flat, year, month)
+
+        return _revalidate(Response(
+            {"success": True, "summary": snapshot.summary_data(), "balances": snapshot.balances()}
+        ))
+
 
-        return Response({"success": True, "summary": summary, "balances": balances})
+class MemberBalanceHistoryView(APIView):
+    """
+    GET  /meals/balance-history/?user_id=<uuid>&months=12
+    A member's month-by-month balances (defaults to the current user).
+    """
+    permission_classes = [
+        permissions.IsAuthenticated,
+        flat_permission_required("view_meals"),
+    ]
+
+    def get(self, request):
+        params = MemberHistorySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        user_id = params.validated_data.get("user_id") or request.user.id
+        history = get_member_history(request.flat, user_id, params.validated_data["months"])
+        return Response({"success": True, "user_id": str(user_id), "history": history})
 
 
 class LockMonthView(APIView):
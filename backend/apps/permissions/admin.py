@@ -1,5 +1,7 @@
 from django.contrib import admin
+from apps.flats.models import FlatMembership
 from .models import AppPermission, MemberPermission
+from .services import bump_permission_version
 
 
 @admin.register(AppPermission)
@@ -11,3 +13,28 @@ class AppPermissionAdmin(admin.ModelAdmin):
 @admin.register(MemberPermission)
 class MemberPermissionAdmin(admin.ModelAdmin):
     list_display = ("membership", "permission", "granted_by", "created_at")
+
+    # permission_mask is what checks read: every row change recomputes the
+    # affected memberships' masks and drops their cached permissions /
+    # flat contexts (flat-scoped tokens are re-issued on refresh).
+    def save_model(self, request, obj, form, change):
+        previous = (
+            MemberPermission.objects.filter(pk=obj.pk).values_list("membership_id", flat=True).first()
+            if change else None
+        )
+        super().save_model(request, obj, form, change)
+        _bump_memberships({obj.membership_id, previous})
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        _bump_memberships({obj.membership_id})
+
+    def delete_queryset(self, request, queryset):
+        membership_ids = set(queryset.values_list("membership_id", flat=True))
+        super().delete_queryset(request, queryset)
+        _bump_memberships(membership_ids)
+
+
+def _bump_memberships(membership_ids):
+    for membership in FlatMembership.objects.filter(pk__in=membership_ids - {None}):
+        bump_permission_version(membership)
@@ -1,9 +1,12 @@
 """
 DRF permission guard classes.
 Used in views: permission_classes = [IsAuthenticated, HasFlatPermission("add_meal")]
+
+Checks run against the membership's codename set, loaded once per request
+and memoized on `request.membership` (see services.get_permission_set).
 """
 from rest_framework.permissions import BasePermission
-from apps.permissions.services import has_permission as check_perm
+from apps.permissions.services import get_permission_set, has_permission as check_perm
 
 
 class IsOwner(BasePermission):
@@ -49,9 +52,9 @@ class HasAnyFlatPermission(BasePermission):
     def has_permission(self, request, view):
         if not request.membership:
             return False
-        return any(
-            check_perm(request.membership, c) for c in self.codenames
-        )
+        if request.membership.is_owner:
+            return True
+        return not get_permission_set(request.membership).isdisjoint(self.codenames)
 
 
 def flat_permission_required(codename: str):
@@ -0,0 +1,56 @@
+"""
+Management command to verify / repair FlatMembership.permission_mask
+against the relational source of truth (MemberPermission rows).  Masks are
+kept up to date by the permission services; run this after bulk edits,
+restores or manual SQL, or periodically with --verify.
+
+Run: python manage.py repair_permission_masks [--flat <uuid>] [--verify]
+"""
+from collections import defaultdict
+from django.core.management.base import BaseCommand
+from apps.flats.models import FlatMembership
+from apps.permissions.models import MemberPermission
+from apps.permissions.services import assign_permission_bits, bump_permission_version
+
+
+class Command(BaseCommand):
+    help = "Verify or rebuild membership permission bitmasks from MemberPermission rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--flat", help="Only this flat (UUID).")
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Only report drifted masks, do not rewrite them.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["verify"]:
+            assign_permission_bits()
+
+        memberships = FlatMembership.objects.only("id", "permission_mask")
+        grants = MemberPermission.objects.filter(permission__bit__isnull=False)
+        if options["flat"]:
+            memberships = memberships.filter(flat_id=options["flat"])
+            grants = grants.filter(membership__flat_id=options["flat"])
+
+        expected = defaultdict(int)
+        for membership_id, bit in grants.values_list("membership_id", "permission__bit"):
+            expected[membership_id] |= 1 << bit
+
+        checked = drifted = 0
+        for membership in memberships.iterator():
+            checked += 1
+            if membership.permission_mask == expected[membership.id]:
+                continue
+            drifted += 1
+            self.stdout.write(
+                f"{membership.id}: mask {membership.permission_mask} → {expected[membership.id]}"
+            )
+            if not options["verify"]:
+                bump_permission_version(membership)
+
+        action = "found" if options["verify"] else "repaired"
+        self.stdout.write(
+            self.style.SUCCESS(f"Checked {checked} memberships, {action} {drifted} drifted.")
+        )
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:28
+
+from django.db import migrations, models
+
+
+def assign_bits(apps, schema_editor):
+    AppPermission = apps.get_model("permissions", "AppPermission")
+    for bit, perm in enumerate(AppPermission.objects.order_by("id")):
+        perm.bit = bit
+        perm.save(update_fields=["bit"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('permissions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apppermission',
+            name='bit',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='Position in FlatMembership.permission_mask – assigned once, never reused', null=True, unique=True),
+        ),
+        migrations.RunPython(assign_bits, migrations.RunPython.noop),
+    ]
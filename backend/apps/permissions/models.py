@@ -4,6 +4,9 @@ Dynamic Permission System – scalable, per-membership custom permissions.
 Architecture:
     AppPermission  →  master list of all possible permissions (seeded)
     MemberPermission  →  M2M: which membership has which permission
+    FlatMembership.permission_mask  →  denormalized bitmask of the above,
+        one stable `AppPermission.bit` per codename (repair with
+        `python manage.py repair_permission_masks`)
 
 Owner always bypasses checks (has implicit ALL).
 """
@@ -24,6 +27,12 @@ class AppPermission(models.Model):
         db_index=True,
         help_text="Logical module: meals, expenses, analytics, members, flat",
     )
+    bit = models.PositiveSmallIntegerField(
+        unique=True,
+        null=True,
+        blank=True,
+        help_text="Position in FlatMembership.permission_mask – assigned once, never reused",
+    )
 
     class Meta:
         db_table = "app_permissions"
@@ -67,6 +76,9 @@ class MemberPermission(TimeStampedModel):
         return f"{self.membership} → {self.permission.codename}"
 
 
+# Highest bit a signed 64-bit permission_mask can hold
+MAX_PERMISSION_BIT = 62
+
 # ---------------------------------------------------------------------------
 # Seed data – all available permissions
 # ---------------------------------------------------------------------------
@@ -1,10 +1,24 @@
 """
 Permission service layer – assign / revoke / check permissions.
+
+Checks are a bitwise AND on FlatMembership.permission_mask when it is
+populated; otherwise codename sets are cached in the Django cache under
+a per-membership version token.  Every write path calls
+bump_permission_version(), which recomputes the mask and swaps the token
+after commit instead of deleting keys.
 """
-from typing import List, Set
-from django.db import transaction
+import uuid
+from typing import Dict, FrozenSet, List, Set
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Max
+from apps.flats.middleware import bump_membership_version
 from apps.flats.models import FlatMembership
-from .models import AppPermission, MemberPermission, PERMISSION_SEED
+from .models import AppPermission, MemberPermission, PERMISSION_SEED, MAX_PERMISSION_BIT
+
+
+PERMISSION_CACHE_TIMEOUT = 60 * 60 * 24
+_ALL_PERMISSIONS = "all"  # version slot of the owners' set (every codename)
 
 
 def seed_permissions():
@@ -14,6 +28,20 @@ def seed_permissions():
             codename=codename,
             defaults={"label": label, "module": module},
         )
+    assign_permission_bits()
+    _bump_version(_ALL_PERMISSIONS)
+
+
+def assign_permission_bits():
+    """Give each AppPermission without a bit the next free one (never reused)."""
+    highest = AppPermission.objects.aggregate(highest=Max("bit"))["highest"]
+    next_bit = 0 if highest is None else highest + 1
+    for perm in AppPermission.objects.filter(bit__isnull=True).order_by("id"):
+        if next_bit > MAX_PERMISSION_BIT:
+            raise ValueError(f"No free permission bit left for '{perm.codename}'.")
+        perm.bit = next_bit
+        perm.save(update_fields=["bit"])
+        next_bit += 1
 
 
 def assign_all_permissions(membership: FlatMembership, granted_by=None):
@@ -26,6 +54,7 @@ def assign_all_permissions(membership: FlatMembership, granted_by=None):
                 permission=perm,
                 defaults={"granted_by": granted_by or membership.user},
             )
+    bump_permission_version(membership)
 
 
 def set_permissions(
@@ -62,23 +91,134 @@ def set_permissions(
                 for pid in to_create
             ]
         )
+    bump_permission_version(membership)
 
 
 def get_permission_codenames(membership: FlatMembership) -> Set[str]:
     """Return set of permission codenames for a membership."""
+    return set(get_permission_set(membership))
+
+
+def get_permission_set(membership: FlatMembership) -> FrozenSet[str]:
+    """
+    The membership's codenames, memoized on the instance.  Decoded from
+    `permission_mask` when populated, else loaded with one query (or from
+    the cache).  `request.membership` lives for one request, so after the
+    first guard every permission check is a frozenset lookup.
+    """
+    perms = membership.__dict__.get("_permission_set")
+    if perms is None:
+        if membership.permission_mask is not None and not membership.is_owner:
+            perms = _decode_mask(membership.permission_mask)
+        else:
+            perms = _cached_permission_set(membership)
+        membership._permission_set = perms
+    return perms
+
+
+# -------------------------------------------------------------------
+#  Bitmask (FlatMembership.permission_mask)
+# -------------------------------------------------------------------
+
+_permission_bits: Dict[str, int] = {}
+
+
+def permission_bits(reload: bool = False) -> Dict[str, int]:
+    """codename → bit, loaded once per process (bits never change)."""
+    if reload or not _permission_bits:
+        _permission_bits.update(
+            AppPermission.objects.filter(bit__isnull=False).values_list("codename", "bit")
+        )
+    return _permission_bits
+
+
+def _decode_mask(mask: int) -> FrozenSet[str]:
+    bits = permission_bits()
+    if mask >> (max(bits.values(), default=-1) + 1):
+        bits = permission_bits(reload=True)  # a permission was seeded since
+    return frozenset(c for c, bit in bits.items() if mask >> bit & 1)
+
+
+def compute_permission_mask(membership_id) -> int:
+    """Mask from the relational source of truth (MemberPermission rows)."""
+    mask = 0
+    for bit in MemberPermission.objects.filter(membership_id=membership_id).values_list(
+        "permission__bit", flat=True
+    ):
+        mask |= 1 << bit
+    return mask
+
+
+def refresh_permission_mask(membership: FlatMembership) -> None:
+    membership.permission_mask = compute_permission_mask(membership.pk)
+    FlatMembership.objects.filter(pk=membership.pk).update(
+        permission_mask=membership.permission_mask
+    )
+
+
+def _cached_permission_set(membership: FlatMembership) -> FrozenSet[str]:
+    """
+    Cross-request cache of the codename set, keyed by the membership's
+    current version token.  Bypassed inside transactions, which may hold
+    uncommitted permission rows.
+    """
     if membership.is_owner:
-        return set(AppPermission.objects.values_list("codename", flat=True))
-    return set(
-        MemberPermission.objects.filter(membership=membership).values_list(
+        slot = _ALL_PERMISSIONS
+        qs = AppPermission.objects.values_list("codename", flat=True)
+    else:
+        slot = membership.pk
+        qs = MemberPermission.objects.filter(membership=membership).values_list(
             "permission__codename", flat=True
         )
-    )
+    if connection.in_atomic_block:
+        return frozenset(qs)
+
+    key = f"perms:{slot}:{permission_version(slot)}"
+    perms = cache.get(key)
+    if perms is None:
+        perms = frozenset(qs)
+        cache.set(key, perms, PERMISSION_CACHE_TIMEOUT)
+    return perms
+
+
+def permission_version(slot) -> str:
+    """
+    Current version token of a membership's permission set (created on
+    first use).  Random rather than a counter, so a token lost to cache
+    eviction is never reissued for different permissions.
+    """
+    key = f"perm-version:{slot}"
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_permission_version(membership: FlatMembership) -> None:
+    """
+    Invalidate a membership's cached permissions: after set / assign,
+    invite joins and deactivation.  Recomputes its bitmask and drops the
+    member's cached flat context too.
+    """
+    membership.__dict__.pop("_permission_set", None)
+    refresh_permission_mask(membership)
+    _bump_version(membership.pk)
+    bump_membership_version(membership.user_id)  # cached flat context holds the mask
+
+
+def _bump_version(slot) -> None:
+    # After commit: a reader between the write and the commit still sees
+    # the old rows, and must not cache them under the new token.
+    key = f"perm-version:{slot}"
+    transaction.on_commit(lambda: cache.set(key, uuid.uuid4().hex, timeout=None))
 
 
 def has_permission(membership: FlatMembership, codename: str) -> bool:
     """Check if membership has a specific permission."""
     if membership.is_owner:
         return True
-    return MemberPermission.objects.filter(
-        membership=membership, permission__codename=codename
-    ).exists()
+    bit = permission_bits().get(codename)
+    if membership.permission_mask is not None and bit is not None:
+        return bool(membership.permission_mask & (1 << bit))
+    return codename in get_permission_set(membership)
@@ -0,0 +1,86 @@
+"""
+FlatMembership.permission_mask must always equal the MemberPermission
+rows it is derived from – through the services and through the admin.
+"""
+from django.core.cache import cache
+from django.test import TestCase
+
+from apps.accounts.models import User
+from apps.core.tests.utils import api_client, make_flat
+from apps.flats.models import FlatMembership
+from apps.permissions.models import AppPermission, MemberPermission
+from apps.permissions.services import (
+    assign_all_permissions,
+    compute_permission_mask,
+    has_permission,
+    set_permissions,
+)
+
+ADMIN = "/admin/permissions/memberpermission/"
+CELL = "/api/v1/meals/cell/"
+
+
+class PermissionMaskTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.flat, (cls.owner, cls.member) = make_flat(members=2)
+        cls.admin = User.objects.create_superuser(email="admin@example.com", password="pw123456!")
+
+    def setUp(self):
+        cache.clear()
+
+    def assertMaskMatchesRows(self, membership):
+        membership.refresh_from_db()
+        rows = set(
+            MemberPermission.objects.filter(membership=membership).values_list(
+                "permission__codename", flat=True
+            )
+        )
+        self.assertEqual(membership.permission_mask, compute_permission_mask(membership.pk))
+        for perm in AppPermission.objects.all():
+            with self.subTest(codename=perm.codename):
+                self.assertEqual(bool(membership.permission_mask >> perm.bit & 1), perm.codename in rows)
+                fresh = FlatMembership.objects.get(pk=membership.pk)
+                self.assertEqual(has_permission(fresh, perm.codename), perm.codename in rows)
+
+    def test_services_keep_the_mask(self):
+        self.assertMaskMatchesRows(self.member)
+        set_permissions(self.member, ["view_meals", "edit_expense"])
+        self.assertMaskMatchesRows(self.member)
+        assign_all_permissions(self.member)
+        self.assertMaskMatchesRows(self.member)
+        set_permissions(self.member, [])
+        self.assertMaskMatchesRows(self.member)
+
+    def test_admin_add_and_delete_update_the_mask(self):
+        self.client.force_login(self.admin)
+        edit_expense = AppPermission.objects.get(codename="edit_expense")
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                f"{ADMIN}add/", {"membership": self.member.pk, "permission": edit_expense.pk}
+            )
+        self.assertEqual(response.status_code, 302)
+        self.assertMaskMatchesRows(self.member)
+
+        row = MemberPermission.objects.get(membership=self.member, permission__codename="add_meal")
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f"{ADMIN}{row.pk}/delete/", {"post": "yes"})
+        self.assertEqual(response.status_code, 302)
+        self.assertMaskMatchesRows(self.member)
+
+        # The cached flat context picked the change up too
+        response = api_client(self.member.user, self.flat).patch(
+            CELL, {"user_id": str(self.member.user_id), "date": "2026-02-01", "meal_count": "1"}, format="json"
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_admin_bulk_delete_updates_the_mask(self):
+        self.client.force_login(self.admin)
+        ids = list(MemberPermission.objects.filter(membership=self.member).values_list("pk", flat=True))
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                ADMIN, {"action": "delete_selected", "_selected_action": ids, "post": "yes"}
+            )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(MemberPermission.objects.filter(membership=self.member).count(), 0)
+        self.assertMaskMatchesRows(self.member)
@@ -0,0 +1,69 @@
+"""
+Permission resolution costs at most one permission query per request:
+none when FlatMembership.permission_mask is populated, one (memoized on
+request.membership) for a legacy membership without a mask.
+"""
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.tests.utils import api_client, make_flat
+from apps.flats.middleware import bump_membership_version
+from apps.flats.models import FlatMembership
+from apps.permissions.services import has_permission
+
+EXPENSES = "/api/v1/expenses/?year=2026&month=2"
+MINE = "/api/v1/permissions/mine/"
+PERMISSION_TABLES = ('"member_permissions"', '"app_permissions"')
+
+
+def permission_queries(context):
+    return [q["sql"] for q in context.captured_queries if any(t in q["sql"] for t in PERMISSION_TABLES)]
+
+
+class PermissionQueryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.flat, (cls.owner, cls.member) = make_flat(members=2)
+
+    def setUp(self):
+        cache.clear()  # flat contexts / versions cached by earlier tests
+
+    def get(self, client, url):
+        client.get(url)  # warm the cached flat context
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return context
+
+    def drop_mask(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            FlatMembership.objects.filter(pk=self.member.pk).update(permission_mask=None)
+            bump_membership_version(self.member.user_id)
+
+    def test_masked_member_needs_no_permission_query(self):
+        client = api_client(self.member.user, self.flat)
+        with self.assertNumQueries(3):  # user + flat context (cold) + expenses
+            client.get(EXPENSES)
+        for url in (EXPENSES, MINE):
+            with self.subTest(url=url):
+                self.assertEqual(permission_queries(self.get(client, url)), [])
+
+    def test_legacy_member_loads_permissions_once(self):
+        self.drop_mask()
+        client = api_client(self.member.user, self.flat)
+        for url in (EXPENSES, MINE):  # MINE: guard + the codename list
+            with self.subTest(url=url):
+                self.assertLessEqual(len(permission_queries(self.get(client, url))), 1)
+
+    def test_owner_checks_are_free(self):
+        client = api_client(self.owner.user, self.flat)
+        self.assertEqual(permission_queries(self.get(client, EXPENSES)), [])
+
+    def test_repeated_checks_are_memoized(self):
+        membership = FlatMembership.objects.get(pk=self.member.pk)
+        membership.permission_mask = None
+        with self.assertNumQueries(1):
+            for codename in ("view_meals", "add_meal", "edit_expense", "view_meals", "manage_members"):
+                has_permission(membership, codename)
@@ -128,6 +128,34 @@ else:
         }
     }
 
+# ---------------------------------------------------------------------------
+# Activity log writer – "sync" (one INSERT per entry, inside the request's
+# transaction) or opt-in "buffered" (bulk inserts off the request path; a
+# killed worker loses its pending records)
+# ---------------------------------------------------------------------------
+ACTIVITY_LOG_MODE = config("ACTIVITY_LOG_MODE", default="sync")
+ACTIVITY_LOG_BATCH_SIZE = config("ACTIVITY_LOG_BATCH_SIZE", default=100, cast=int)
+ACTIVITY_LOG_FLUSH_INTERVAL = config("ACTIVITY_LOG_FLUSH_INTERVAL", default=2.0, cast=float)
+
+# Log retention – rows older than LOG_RETENTION_DAYS are moved to gzip
+# NDJSON files under LOG_ARCHIVE_DIR by `manage.py archive_logs`
+LOG_RETENTION_DAYS = config("LOG_RETENTION_DAYS", default=90, cast=int)
+LOG_ARCHIVE_DIR = config("LOG_ARCHIVE_DIR", default=str(BASE_DIR / "log_archive"))
+LOG_ARCHIVE_BATCH_SIZE = config("LOG_ARCHIVE_BATCH_SIZE", default=1000, cast=int)
+
+# Operator analytics – `manage.py platform_report` writes its .npz / CSV
+# files here, aggregating PLATFORM_REPORT_CHUNK_SIZE flats per round
+PLATFORM_REPORT_DIR = config("PLATFORM_REPORT_DIR", default=str(BASE_DIR / "reports"))
+PLATFORM_REPORT_CHUNK_SIZE = config("PLATFORM_REPORT_CHUNK_SIZE", default=500, cast=int)
+
+# ---------------------------------------------------------------------------
+# Real-time push – pub/sub broker behind the meal grid stream (ASGI only)
+# ---------------------------------------------------------------------------
+REALTIME_BROKER = config(
+    "REALTIME_BROKER",
+    default="apps.core.broker.RedisBroker" if REDIS_URL else "apps.core.broker.InMemoryBroker",
+)
+
 # ---------------------------------------------------------------------------
 # Auth
 # ---------------------------------------------------------------------------
@@ -143,7 +171,7 @@ AUTH_PASSWORD_VALIDATORS = [
 # ---------------------------------------------------------------------------
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.accounts.authentication.MiddlewareJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_FILTER_BACKENDS": (
@@ -178,8 +206,20 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
     "AUTH_HEADER_TYPES": ("Bearer",),
+    "TOKEN_OBTAIN_SERIALIZER": "apps.accounts.serializers.UserClaimsTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "apps.accounts.serializers.FlatClaimsTokenRefreshSerializer",
 }
 
+# Opt-in: build request.user from token claims backed by a per-process
+# LRU (size / TTL seconds) instead of a users-table read per request.
+JWT_STATELESS_USERS = config("JWT_STATELESS_USERS", default=False, cast=bool)
+JWT_USER_CACHE_SIZE = config("JWT_USER_CACHE_SIZE", default=1024, cast=int)
+JWT_USER_CACHE_TTL = config("JWT_USER_CACHE_TTL", default=60, cast=int)
+
+# Opt-in: scope login tokens to a flat (role, permission bitmask, context
+# version) and let FlatContextMiddleware trust those claims while current.
+JWT_FLAT_CLAIMS = config("JWT_FLAT_CLAIMS", default=False, cast=bool)
+
 # ---------------------------------------------------------------------------
 # CORS
 # ---------------------------------------------------------------------------
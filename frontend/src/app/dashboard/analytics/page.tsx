@@ -48,25 +48,14 @@ export default function AnalyticsPage() {
   const [year, setYear] = useState(now.getFullYear());
   const [month, setMonth] = useState(now.getMonth() + 1);
 
-  const { data: mealPerUser } = useQuery({
-    queryKey: ["analytics-mealPerUser", year, month],
-    queryFn: () => analyticsApi.mealPerUser(year, month).then((r) => r.data.data),
-  });
-
-  const { data: expenseShare } = useQuery({
-    queryKey: ["analytics-expenseShare", year, month],
-    queryFn: () => analyticsApi.expenseShare(year, month).then((r) => r.data.data),
-  });
-
-  const { data: dailyMeals } = useQuery({
-    queryKey: ["analytics-dailyMeals", year, month],
-    queryFn: () => analyticsApi.dailyMeals(year, month).then((r) => r.data.data),
-  });
-
-  const { data: monthlyComparison } = useQuery({
-    queryKey: ["analytics-monthlyComparison", year],
-    queryFn: () => analyticsApi.monthlyComparison(year).then((r) => r.data.data),
+  const { data: dashboard } = useQuery({
+    queryKey: ["analytics-dashboard", year, month],
+    queryFn: () => analyticsApi.dashboard(year, month).then((r) => r.data.data),
   });
+  const mealPerUser = dashboard?.meal_per_user;
+  const expenseShare = dashboard?.expense_share;
+  const dailyMeals = dashboard?.daily_meals;
+  const monthlyComparison = dashboard?.monthly_comparison;
 
   const prevMonth = () => {
     if (month === 1) { setYear(year - 1); setMonth(12); } else setMonth(month - 1);
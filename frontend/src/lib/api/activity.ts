@@ -4,6 +4,13 @@
 import api from "../axios";
 
 export const activityApi = {
-  getLogs: (params?: { user_id?: string; action?: string }) =>
+  getLogs: (params?: {
+    user_id?: string;
+    action?: string;
+    date_from?: string;
+    date_to?: string;
+    cursor?: string;
+    page_size?: number;
+  }) =>
     api.get("/core/activity-logs/", { params }),
 };
@@ -2,9 +2,21 @@
  * Analytics API calls.
  */
 import api from "../axios";
-import type { ChartDataPoint, DailyMealPoint, MonthlyComparisonPoint } from "../types";
+import type {
+  AnalyticsDashboard,
+  ChartDataPoint,
+  DailyMealPoint,
+  MonthlyComparisonPoint,
+  TrendPoint,
+} from "../types";
 
 export const analyticsApi = {
+  dashboard: (year: number, month: number) =>
+    api.get<{ success: boolean; data: AnalyticsDashboard }>(
+      "/analytics/dashboard/",
+      { params: { year, month } }
+    ),
+
   mealPerUser: (year: number, month: number) =>
     api.get<{ success: boolean; data: ChartDataPoint[] }>(
       "/analytics/meal-per-user/",
@@ -28,4 +40,10 @@ export const analyticsApi = {
       "/analytics/monthly-comparison/",
       { params: { year } }
     ),
+
+  trends: (params?: { months?: number; window?: number; end?: string }) =>
+    api.get<{ success: boolean; data: TrendPoint[] }>(
+      "/analytics/trends/",
+      { params }
+    ),
 };
@@ -165,6 +165,26 @@ export interface MonthlyComparisonPoint {
   meal_rate: number;
 }
 
+export interface TrendPoint {
+  year: number;
+  month: number;
+  total_meals: number;
+  total_expense: number;
+  meal_rate: number;
+  members: number;
+  meals_per_member: number;
+  avg_meal_rate: number | null;
+  avg_expense: number | null;
+  avg_meals_per_member: number | null;
+}
+
+export interface AnalyticsDashboard {
+  meal_per_user: ChartDataPoint[];
+  expense_share: ChartDataPoint[];
+  daily_meals: DailyMealPoint[];
+  monthly_comparison: MonthlyComparisonPoint[];
+}
+
 // ----- API envelope -----
 export interface ApiResponse<T = unknown> {
   success: boolean;